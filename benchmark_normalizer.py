@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+파일명 정리 마이크로 벤치마크
+합성 파일명 목록에 대해 예전 방식(키워드/패턴마다 re.sub)과 컴파일된 단일 정규식(FilenameNormalizer)의
+처리 시간을 비교하고, 두 방식의 결과가 다른 파일 수를 함께 출력합니다.
+
+사용법:
+    python benchmark_normalizer.py                      # 100k 파일명
+    python benchmark_normalizer.py --files 1000000 --repeat 5 --nfkc
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+# src 모듈을 import하기 위해 경로 추가
+sys.path.append(str(Path(__file__).parent / "src"))
+
+from generate_synthetic_dataset import ARTIST_POOL
+from modules.filename_normalizer import DEFAULT_REMOVE_KEYWORDS, DEFAULT_REMOVE_PATTERNS, FilenameNormalizer
+
+
+TEMPLATES = [
+    "[MIRRORED] {artist}({artist_ko}) - {title} dance cover{copy}.mp4",
+    "{artist} - {title} dance cover{copy}.mp4",
+    "[MV] {artist} _ {title} (Official Music Video){copy}.mp4",
+    "{title} - {artist} 가사 lyrics{copy}.mp4",
+    "{artist}_{title}_choreography{copy}.mov",
+    "{artist_ko}{artist} {title} (Feat. {other}) 커버 댄스{copy}.mp4",
+]
+
+
+def make_corpus(count: int, seed: int = 42) -> List[str]:
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(count):
+        artist, artist_ko = rng.choice(ARTIST_POOL)
+        corpus.append(rng.choice(TEMPLATES).format(
+            artist=artist, artist_ko=artist_ko, other=rng.choice(ARTIST_POOL)[0],
+            title=f"Song {rng.randint(1, 500):03d}", copy=" (1)" if rng.random() < 0.05 else "",
+        ))
+    return corpus
+
+
+def legacy_normalize(filename: str) -> str:
+    """예전 clean_filename 방식 (패턴/키워드마다 컴파일 없이 re.sub)"""
+    name = Path(filename).stem
+    for pattern in DEFAULT_REMOVE_PATTERNS:
+        name = re.sub(pattern, '', name, flags=re.IGNORECASE)
+    for kw in DEFAULT_REMOVE_KEYWORDS:
+        name = re.sub(r'\b' + re.escape(kw) + r'\b', '', name, flags=re.IGNORECASE)
+    return re.sub(r'[_\-\s]+', ' ', name).strip()
+
+
+def _best_of(repeat: int, func) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark filename normalization: per-keyword re.sub vs compiled alternation")
+    parser.add_argument("--files", type=int, default=100000, help="Number of synthetic filenames")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per measurement (best is reported)")
+    parser.add_argument("--nfkc", action="store_true", help="Also measure with Unicode NFKC normalization")
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.files)
+    normalizers = [('compiled', FilenameNormalizer())]
+    if args.nfkc:
+        normalizers.append(('compiled+nfkc', FilenameNormalizer(unicode_nfkc=True)))
+
+    legacy_s = _best_of(args.repeat, lambda: [legacy_normalize(name) for name in corpus])
+    print(f"{'method':<16}{'total_s':>10}{'us/file':>10}{'speedup':>10}{'diff':>8}")
+    print(f"{'legacy re.sub':<16}{legacy_s:>10.3f}{legacy_s / len(corpus) * 1e6:>10.2f}{1.0:>10.1f}{0:>8}")
+
+    expected = [legacy_normalize(name) for name in corpus]
+    for label, normalizer in normalizers:
+        elapsed = _best_of(args.repeat, lambda: [normalizer.normalize(name) for name in corpus])
+        # 결과가 예전 방식과 다른 파일 수 (대괄호 안 키워드 등 경계 사례)
+        diff = sum(1 for name, old in zip(corpus, expected) if normalizer.normalize(name) != old)
+        print(f"{label:<16}{elapsed:>10.3f}{elapsed / len(corpus) * 1e6:>10.2f}{legacy_s / elapsed:>10.1f}{diff:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+상태 파일 로드 시간 벤치마크
+합성 추출 결과(smart_extraction_results.json 형식)를 레코드 수별로 만들고
+json.load와 바이너리 스냅샷(pickle/msgpack) 로드 시간을 비교합니다.
+
+사용법:
+    python benchmark_state_load.py                          # 10k / 100k / 1M 레코드
+    python benchmark_state_load.py --records 10000,100000 --repeat 5
+"""
+
+import argparse
+import json
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+# src 모듈을 import하기 위해 경로 추가
+sys.path.append(str(Path(__file__).parent / "src"))
+
+from generate_synthetic_dataset import make_folder_records
+from modules import state_codec
+from modules.state_codec import load_state, read_snapshot, save_state, snapshot_path, write_snapshot
+
+
+def make_results(records: int, files_per_folder: int = 100, seed: int = 42) -> Dict[str, List[Dict]]:
+    rng = random.Random(seed)
+    results = {}
+    for index in range(0, records, files_per_folder):
+        folder = f"folder_{index // files_per_folder:06d}"
+        results[folder] = make_folder_records(rng, folder, min(files_per_folder, records - index), 0.9)
+    return results
+
+
+def _best_of(repeat: int, func) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def benchmark(records: int, repeat: int, workdir: Path) -> List[Dict]:
+    """레코드 수 하나에 대해 코덱별 로드 시간 측정"""
+    path = workdir / f"extraction_{records}.json"
+    data = make_results(records)
+    save_state(path, data, codec='pickle')
+
+    rows = [{
+        'records': records, 'codec': 'json', 'size_mb': path.stat().st_size / 1e6,
+        'load_s': _best_of(repeat, lambda: json.loads(path.read_bytes())),
+    }]
+
+    codecs = ['pickle'] + (['msgpack'] if state_codec.msgpack else [])
+    for name in codecs:
+        write_snapshot(path, data, codec=name)
+        rows.append({
+            'records': records, 'codec': name, 'size_mb': snapshot_path(path).stat().st_size / 1e6,
+            # 체크섬/신선도 검사를 포함한 실제 로드 경로
+            'load_s': _best_of(repeat, lambda: read_snapshot(path)),
+        })
+
+    # load_state가 스냅샷을 실제로 사용하는지 확인
+    assert load_state(path) == data
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark state file load time: JSON vs binary snapshot")
+    parser.add_argument("--records", default="10000,100000,1000000", help="Comma separated record counts")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per measurement (best is reported)")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="state_bench_"))
+    results = []
+    try:
+        print(f"{'records':>10} {'codec':>8} {'size MB':>9} {'load s':>9} {'speedup':>8}")
+        for records in [int(value) for value in args.records.split(',') if value]:
+            rows = benchmark(records, args.repeat, workdir)
+            json_time = rows[0]['load_s']
+            for row in rows:
+                row['speedup'] = json_time / row['load_s'] if row['load_s'] else 0.0
+                print(f"{row['records']:>10} {row['codec']:>8} {row['size_mb']:>9.1f} {row['load_s']:>9.3f} {row['speedup']:>7.1f}x")
+            results.extend(rows)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+오프라인 업로드 벤치마크
+mock_hanlim_site.py 모의 사이트를 띄우고 headless Chrome으로 WebAutomator를 실행하여
+분당 업로드 수와 단계별 지연 시간을 측정합니다.
+
+사용법:
+    python benchmark_uploads.py --uploads 20 --accounts 2
+    python benchmark_uploads.py --uploads 20 --faults faults.json
+"""
+
+import json
+import logging
+import re
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# src 모듈을 import하기 위해 경로 추가
+sys.path.append(str(Path(__file__).parent / "src"))
+
+from modules.config_manager import ConfigManager
+from modules.web_automator import WebAutomator
+from mock_hanlim_site import base_url_of, load_fault_spec, start_mock_site
+
+
+STEP_PATTERN = re.compile(r'^(?:Recovery )?Step (\d+):')
+RECOVERY_PREFIX = '🔄 Attempting recovery'
+
+
+class StepTimer(logging.Handler):
+    """WebAutomator 로그의 'Step N:' 메시지 시각으로 단계별 소요 시간 측정"""
+
+    def __init__(self):
+        super().__init__(level=logging.DEBUG)
+        self.durations: Dict[str, List[float]] = defaultdict(list)
+        self._current: Optional[str] = None
+        self._started_at = 0.0
+        self.recoveries = 0
+
+    def start(self, name: str = 'start'):
+        self._current = name
+        self._started_at = time.perf_counter()
+
+    def stop(self):
+        self._close_current(time.perf_counter())
+        self._current = None
+
+    def _close_current(self, now: float):
+        if self._current is not None:
+            self.durations[self._current].append(now - self._started_at)
+
+    def emit(self, record: logging.LogRecord):
+        if self._current is None:
+            return
+        message = record.getMessage()
+        if message.startswith(RECOVERY_PREFIX):
+            self.recoveries += 1
+        match = STEP_PATTERN.match(message)
+        if not match:
+            return
+        step = f'step {match.group(1)}'
+        if step != self._current:
+            now = time.perf_counter()
+            self._close_current(now)
+            self._current = step
+            self._started_at = now
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """평균/중앙값/p95 계산"""
+    if not samples:
+        return {'count': 0}
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return {
+        'count': len(samples),
+        'mean': round(statistics.fmean(samples), 3),
+        'p50': round(statistics.median(samples), 3),
+        'p95': round(p95, 3),
+    }
+
+
+def make_sample_videos(target_dir: Path, count: int, size_kb: int) -> List[Path]:
+    """벤치마크용 더미 비디오 파일 생성"""
+    target_dir.mkdir(parents=True, exist_ok=True)
+    payload = b'\0' * (size_kb * 1024)
+    videos = []
+    for i in range(count):
+        path = target_dir / f'[MIRRORED] BENCH(벤치) - Song {i:04d} dance cover.mp4'
+        path.write_bytes(payload)
+        videos.append(path)
+    return videos
+
+
+def make_config(config_path: str, base_url: str, headless: bool,
+                overrides: Optional[Dict[str, Dict]] = None) -> ConfigManager:
+    """기존 설정을 읽어 모의 사이트용으로 덮어쓴 ConfigManager 반환"""
+    config = ConfigManager(config_path)
+    for section, values in (overrides or {}).items():
+        config.data.setdefault(section, {}).update(values)
+    web = config.data.setdefault('web_automation', {})
+    web['base_url'] = base_url
+    web['headless'] = headless
+    return config
+
+
+def run_benchmark(uploads: int, accounts: int, config_path: str = 'config/config.json',
+                  headless: bool = True, file_size_kb: int = 256, site=None,
+                  overrides: Optional[Dict[str, Dict]] = None, faults: Optional[Dict] = None) -> Dict:
+    """모의 사이트를 대상으로 업로드를 반복 실행하고 측정 결과 반환"""
+    server = site
+    if server is None:
+        server, _ = start_mock_site(faults=faults)
+    base_url = base_url_of(server)
+
+    config = make_config(config_path, base_url, headless, overrides)
+    timer = StepTimer()
+    logging.getLogger('WebAutomator').addHandler(timer)
+
+    work_dir = Path(tempfile.mkdtemp(prefix='choom-bench-'))
+    videos = make_sample_videos(work_dir, uploads, file_size_kb)
+    per_account = max(1, -(-uploads // max(1, accounts)))
+
+    automator = WebAutomator(config)
+    login_times: List[float] = []
+    upload_times: List[float] = []
+    failed_times: List[float] = []
+    succeeded = failed = login_failures = relogins = 0
+    started = time.perf_counter()
+
+    def login(email: str) -> bool:
+        nonlocal login_failures
+        t0 = time.perf_counter()
+        try:
+            automator.login_with_account(email, 'bench-password')
+        except Exception:
+            login_failures += 1
+            return False
+        login_times.append(time.perf_counter() - t0)
+        return True
+
+    try:
+        for account_index in range(accounts):
+            batch = videos[account_index * per_account:(account_index + 1) * per_account]
+            if not batch:
+                break
+            email = f'bench{account_index + 1}@example.com'
+            if not login(email):
+                failed += len(batch)
+                continue
+
+            for video in batch:
+                t0 = time.perf_counter()
+                timer.start()
+                try:
+                    ok = automator.upload_video(video, 'BENCH', video.stem.split(' - ')[1], 'benchmark upload')
+                except Exception:
+                    ok = False
+                timer.stop()
+                elapsed_upload = time.perf_counter() - t0
+                upload_times.append(elapsed_upload)
+                if ok:
+                    succeeded += 1
+                    continue
+
+                failed += 1
+                failed_times.append(elapsed_upload)
+                # 세션이 끊겼으면 재로그인 (강제 로그아웃 장애)
+                try:
+                    automator._handle_alert_if_present()
+                    session_lost = '/signin' in automator.driver.current_url
+                except Exception:
+                    session_lost = True
+                if session_lost:
+                    relogins += 1
+                    login(email)
+
+            automator.logout()
+    finally:
+        elapsed = time.perf_counter() - started
+        logging.getLogger('WebAutomator').removeHandler(timer)
+        automator.close()
+        stats = server.site_state.stats()
+        if site is None:
+            server.shutdown()
+
+    return {
+        'base_url': base_url,
+        'uploads_attempted': succeeded + failed,
+        'uploads_succeeded': succeeded,
+        'uploads_failed': failed,
+        'posts_on_site': stats['posts'],
+        'elapsed_seconds': round(elapsed, 2),
+        'uploads_per_minute': round(succeeded / elapsed * 60, 2) if elapsed > 0 else 0.0,
+        'login_failures': login_failures,
+        'relogins': relogins,
+        'recovery_attempts': timer.recoveries,
+        'seconds_lost_to_failures': round(sum(failed_times), 2),
+        'login': summarize(login_times),
+        'upload': summarize(upload_times),
+        'steps': {name: summarize(samples) for name, samples in sorted(timer.durations.items())},
+    }
+
+
+def print_report(report: Dict):
+    """측정 결과 출력"""
+    print("\n⚡ Offline Upload Benchmark")
+    print("=" * 50)
+    print(f"🌐 Site: {report['base_url']}")
+    print(f"📤 Uploads: {report['uploads_succeeded']}/{report['uploads_attempted']} succeeded "
+          f"({report['posts_on_site']} posts on site)")
+    print(f"⏱️ Elapsed: {report['elapsed_seconds']}s")
+    print(f"🚀 Throughput: {report['uploads_per_minute']} uploads/min")
+    print(f"🔑 Login: {report['login']}")
+    print(f"🩹 Recovery: {report['recovery_attempts']} attempts, {report['relogins']} re-logins, "
+          f"{report['seconds_lost_to_failures']}s spent in failed uploads")
+    print(f"📦 Upload: {report['upload']}")
+    print("\n📊 PER-STEP LATENCY (seconds)")
+    print("-" * 30)
+    for name, stats in report['steps'].items():
+        print(f"  {name:>8}: {stats}")
+
+
+def main():
+    """메인 함수"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark WebAutomator against the offline mock site')
+    parser.add_argument('--uploads', type=int, default=10, help='Number of uploads (default: 10)')
+    parser.add_argument('--accounts', type=int, default=1, help='Number of accounts (default: 1)')
+    parser.add_argument('--config', default='config/config.json', help='Base config file')
+    parser.add_argument('--file-size-kb', type=int, default=256, help='Dummy video size in KB (default: 256)')
+    parser.add_argument('--headful', action='store_true', help='Show the browser window')
+    parser.add_argument('--faults', help='Fault injection spec for the mock site (JSON file)')
+    parser.add_argument('--output', help='Write the report as JSON to this path')
+    args = parser.parse_args()
+
+    faults = load_fault_spec(args.faults) if args.faults else None
+    report = run_benchmark(args.uploads, args.accounts, args.config,
+                           headless=not args.headful, file_size_kb=args.file_size_kb, faults=faults)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Report saved: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
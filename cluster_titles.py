@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+폴더마다 철자가 조금씩 다른 같은 곡(대소문자, "Siren(사이렌)", "(1)" 사본, 오타 등)을 묶어
+추출 결과의 각 항목에 대표 ID(song_id)와 대표 표기(canonical_artist, canonical_title)를 기록하는 배치 작업
+
+사용법:
+    python cluster_titles.py                    # 묶이는 곡만 보고 (저장 안 함)
+    python cluster_titles.py --apply            # 추출 결과(JSON 또는 상태 DB)에 기록
+    python cluster_titles.py --threshold 95 --workers 4
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# src 모듈을 import하기 위해 경로 추가
+sys.path.append(str(Path(__file__).parent / "src"))
+
+from modules.config_manager import ConfigManager
+from modules.extraction_shards import RESULTS_FILE, load_extraction_results, update_extraction_folders
+from modules.gazetteer import load_artist_mapping
+from modules.state_store import open_state_store
+from modules.title_clustering import TitleClusterer, apply_song_ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Group near-duplicate (artist, title) pairs and assign canonical song IDs")
+    parser.add_argument("--threshold", type=float, help="Minimum rapidfuzz ratio to merge two titles "
+                                                        "(default: title_extraction.cluster_threshold)")
+    parser.add_argument("--workers", type=int, default=-1, help="Threads for process.cdist (-1: all cores)")
+    parser.add_argument("--apply", action="store_true", help="Write song_id/canonical fields back (default: report only)")
+    parser.add_argument("--show", type=int, default=20, help="Number of merged songs to print")
+    args = parser.parse_args()
+
+    config = ConfigManager()
+    store = open_state_store(config)
+    threshold = args.threshold or config.get('title_extraction', 'cluster_threshold', 92)
+    artist_mapping = load_artist_mapping(config.get('title_extraction', 'artist_mapping_path', 'config/artist_mapping.json'))
+
+    try:
+        results = store.load_extraction_results() if store else load_extraction_results(RESULTS_FILE)
+        if not results:
+            print("❌ 추출 결과가 없습니다.")
+            return
+
+        clusterer = TitleClusterer(threshold, artist_mapping, args.workers)
+        assignments = clusterer.cluster(results)
+        stats = clusterer.stats
+        print(f"📊 {stats['records']}개 항목 → {stats['songs']}곡 (아티스트 블록 {stats['blocks']}개, "
+              f"철자가 여러 개인 곡 {len(clusterer.merges)}개)")
+        for canonical, spellings in clusterer.merges[:args.show]:
+            print(f"  🔗 {canonical}: {' / '.join(spellings)}")
+
+        if not args.apply:
+            print("👉 --apply로 실행하면 song_id와 대표 표기를 추출 결과에 기록합니다.")
+            return
+
+        if store:
+            changed = apply_song_ids(results, assignments)
+            for folder in changed:
+                store.replace_folder(folder, results[folder])
+        else:
+            # 분석하는 동안 다른 프로세스(main.py의 실패 파일 삭제 등)가 바꾼 내용을 덮어쓰지 않도록
+            # 바뀔 폴더마다 샤드 잠금(단일 JSON이면 파일 잠금) 안에서 다시 읽고 기록
+            changed = update_extraction_folders(
+                apply_song_ids(results, assignments),
+                lambda folder, records: bool(apply_song_ids({folder: records}, assignments)),
+                RESULTS_FILE, sharded=config.get('general', 'extraction_storage', 'sharded') == 'sharded')
+        print(f"💾 {len(changed)}개 폴더에 song_id 기록 완료")
+    finally:
+        if store:
+            store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+smart_title_extractor.py 테스트용 OpenAI API 모의 서버 (chat completions + Files + Batch API)
+실제 API 없이 --batch 흐름(입력 파일 업로드 → 배치 생성 → 폴링 → 결과 파일 다운로드)을 확인할 수 있습니다.
+
+사용법:
+    python fake_openai_server.py --port 8766 --batch-delay 5 --error-rate 0.1
+    OPENAI_BASE_URL=http://127.0.0.1:8766/v1 OPENAI_API_KEY=test python smart_title_extractor.py --batch --poll-interval 1
+
+응답 규칙: 프롬프트의 "N. 원본: ..., 정리됨: ..." 목록에서 원본 파일명의 괄호/키워드/일련번호를 지운 뒤
+" - "가 정확히 한 번 있으면 "아티스트 - 제목"으로 나눠 high, 아니면 정리된 이름을 제목으로 low로 응답합니다.
+(정리된 이름은 하이픈이 공백으로 바뀌어 있어 구분자로 쓸 수 없음)
+--error-rate 비율의 배치 요청은 500 오류로 error 파일에 기록됩니다.
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from email.parser import BytesParser
+from email.policy import default as default_policy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+
+ITEM_LINE = re.compile(r"^(\d+)\. 원본: (.*), 정리됨: (.*)$", re.MULTILINE)
+# 파일명 끝의 복사본 번호 "(1)"와 일련번호 (rule_extractor와 같은 규칙)
+COPY_SUFFIX = re.compile(r"(?:\s*\(\d+\))?(?:\s+\d+)?$")
+NOISE = re.compile(r"\[.*?\]|\(.*?\)|\b(?:dance cover|dance|cover|mirrored|official|mv)\b", re.IGNORECASE)
+
+
+def split_original(original: str) -> Optional[Tuple[str, str]]:
+    """원본 파일명 → (아티스트, 제목) - " - " 구분자가 정확히 한 번 있을 때만"""
+    stem = os.path.splitext(original.strip())[0]
+    name = re.sub(r"\s+", " ", NOISE.sub(" ", COPY_SUFFIX.sub("", stem))).strip()
+    parts = [part.strip() for part in name.split(" - ")]
+    if len(parts) == 2 and all(parts):
+        return parts[0], parts[1]
+    return None
+
+
+def fake_completion(body: Dict) -> Dict:
+    """chat.completions 요청 본문 → 파일명 목록을 나눠 만든 구조화 응답"""
+    prompt = body['messages'][-1]['content']
+    results = []
+    for index, original, cleaned in ITEM_LINE.findall(prompt):
+        split = split_original(original)
+        if split:
+            (artist, title), confidence = split, 'high'
+        else:
+            artist, title, confidence = None, cleaned.strip(), 'low'
+        results.append({
+            'index': int(index),
+            'artist': artist,
+            'title': title,
+            'confidence': confidence,
+            'final_format': f"{artist} - {title}" if artist else title,
+        })
+    return {
+        'id': f"chatcmpl-{uuid.uuid4().hex[:24]}",
+        'object': 'chat.completion',
+        'created': int(time.time()),
+        'model': body.get('model', 'fake'),
+        'choices': [{
+            'index': 0,
+            'message': {'role': 'assistant', 'content': json.dumps({'results': results}, ensure_ascii=False)},
+            'finish_reason': 'stop',
+        }],
+        'usage': {'prompt_tokens': len(prompt) // 4, 'completion_tokens': 40 * len(results),
+                  'total_tokens': len(prompt) // 4 + 40 * len(results)},
+    }
+
+
+class FakeOpenAI:
+    """업로드된 파일과 배치 상태 (배치는 생성 후 batch_delay초가 지나면 완료)"""
+
+    def __init__(self, batch_delay: float, error_rate: float, seed: Optional[int]):
+        self.batch_delay = batch_delay
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.files: Dict[str, Dict] = {}
+        self.batches: Dict[str, Dict] = {}
+        self.lock = threading.Lock()
+        self.chat_requests = 0
+
+    def add_file(self, filename: str, purpose: str, content: bytes) -> Dict:
+        file_id = f"file-{uuid.uuid4().hex[:24]}"
+        meta = {'id': file_id, 'object': 'file', 'bytes': len(content), 'created_at': int(time.time()),
+                'filename': filename, 'purpose': purpose, 'status': 'processed'}
+        self.files[file_id] = {'meta': meta, 'content': content}
+        return meta
+
+    def create_batch(self, params: Dict) -> Tuple[int, Dict]:
+        if params.get('input_file_id') not in self.files:
+            return 404, {'error': {'message': 'input file not found', 'type': 'invalid_request_error'}}
+        batch_id = f"batch_{uuid.uuid4().hex[:24]}"
+        lines = self.files[params['input_file_id']]['content'].decode('utf-8').splitlines()
+        batch = {
+            'id': batch_id, 'object': 'batch', 'endpoint': params.get('endpoint'), 'errors': None,
+            'input_file_id': params['input_file_id'], 'completion_window': params.get('completion_window', '24h'),
+            'status': 'in_progress', 'output_file_id': None, 'error_file_id': None,
+            'created_at': int(time.time()), 'in_progress_at': int(time.time()), 'completed_at': None,
+            'request_counts': {'total': len([line for line in lines if line.strip()]), 'completed': 0, 'failed': 0},
+            'metadata': params.get('metadata'),
+        }
+        self.batches[batch_id] = batch
+        return 200, batch
+
+    def get_batch(self, batch_id: str) -> Optional[Dict]:
+        batch = self.batches.get(batch_id)
+        if batch and batch['status'] == 'in_progress' and time.time() - batch['created_at'] >= self.batch_delay:
+            self._complete(batch)
+        return batch
+
+    def _complete(self, batch: Dict):
+        outputs, errors = [], []
+        for line in self.files[batch['input_file_id']]['content'].decode('utf-8').splitlines():
+            if not line.strip():
+                continue
+            request = json.loads(line)
+            entry = {'id': f"batch_req_{uuid.uuid4().hex[:24]}", 'custom_id': request['custom_id'], 'error': None}
+            if self.random.random() < self.error_rate:
+                entry['response'] = {'status_code': 500, 'request_id': uuid.uuid4().hex,
+                                     'body': {'error': {'message': 'injected failure', 'type': 'server_error'}}}
+                errors.append(entry)
+            else:
+                entry['response'] = {'status_code': 200, 'request_id': uuid.uuid4().hex,
+                                     'body': fake_completion(request['body'])}
+                outputs.append(entry)
+
+        def to_file(entries, name):
+            content = ''.join(json.dumps(entry, ensure_ascii=False) + '\n' for entry in entries).encode('utf-8')
+            return self.add_file(name, 'batch_output', content)['id'] if entries else None
+
+        batch['output_file_id'] = to_file(outputs, f"{batch['id']}_output.jsonl")
+        batch['error_file_id'] = to_file(errors, f"{batch['id']}_error.jsonl")
+        batch['request_counts'].update(completed=len(outputs), failed=len(errors))
+        batch['status'] = 'completed'
+        batch['completed_at'] = int(time.time())
+        print(f"📦 {batch['id']} 완료: 성공 {len(outputs)}개, 실패 {len(errors)}개")
+
+
+def make_handler(state: FakeOpenAI):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, status: int, payload: Dict):
+            data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _read_body(self) -> bytes:
+            return self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+        def _not_found(self):
+            self._send_json(404, {'error': {'message': f'unknown path {self.path}', 'type': 'invalid_request_error'}})
+
+        def do_POST(self):
+            path = self.path.split('?')[0]
+            body = self._read_body()
+            with state.lock:
+                if path == '/v1/chat/completions':
+                    state.chat_requests += 1
+                    self._send_json(200, fake_completion(json.loads(body)))
+                elif path == '/v1/files':
+                    message = BytesParser(policy=default_policy).parsebytes(
+                        b'Content-Type: ' + self.headers['Content-Type'].encode() + b'\r\n\r\n' + body)
+                    fields, upload = {}, None
+                    for part in message.iter_parts():
+                        name = part.get_param('name', header='content-disposition')
+                        if part.get_filename():
+                            upload = (part.get_filename(), part.get_payload(decode=True))
+                        else:
+                            fields[name] = part.get_content()
+                    if upload is None:
+                        self._send_json(400, {'error': {'message': 'file is required', 'type': 'invalid_request_error'}})
+                        return
+                    self._send_json(200, state.add_file(upload[0], fields.get('purpose', 'batch'), upload[1]))
+                elif path == '/v1/batches':
+                    self._send_json(*state.create_batch(json.loads(body)))
+                else:
+                    self._not_found()
+
+        def do_GET(self):
+            path = self.path.split('?')[0]
+            with state.lock:
+                match = re.fullmatch(r'/v1/batches/([\w-]+)', path)
+                if match:
+                    batch = state.get_batch(match.group(1))
+                    self._send_json(200, batch) if batch else self._not_found()
+                    return
+                match = re.fullmatch(r'/v1/files/([\w-]+)/content', path)
+                if match and match.group(1) in state.files:
+                    content = state.files[match.group(1)]['content']
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'application/octet-stream')
+                    self.send_header('Content-Length', str(len(content)))
+                    self.end_headers()
+                    self.wfile.write(content)
+                    return
+                self._not_found()
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local fake of the OpenAI chat completions, Files and Batch APIs")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--batch-delay", type=float, default=5.0, help="Seconds until a submitted batch completes")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of batch requests that fail with 500")
+    parser.add_argument("--seed", type=int, help="Random seed for injected failures")
+    args = parser.parse_args()
+
+    state = FakeOpenAI(args.batch_delay, args.error_rate, args.seed)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(state))
+    print(f"🤖 Fake OpenAI API: http://{args.host}:{args.port}/v1 (batch delay {args.batch_delay}s, "
+          f"error rate {args.error_rate})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
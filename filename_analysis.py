@@ -1,34 +1,22 @@
 import json
 import re
+import sys
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+# src 모듈을 import하기 위해 경로 추가
+sys.path.append(str(Path(__file__).parent / "src"))
+
+from modules.filename_normalizer import get_normalizer
+
 def analyze_filename(filename: str) -> Dict[str, str]:
     """파일명에서 아티스트와 제목을 추출하고 before/after 결과를 반환"""
     
     # Before: 원본 파일명
     before = filename
     
-    # 파일명 정규화 과정
-    name = Path(filename).stem
-    
-    # 패턴 제거 (괄호, 대괄호 등)
-    remove_patterns = [
-        r'\[.*?\]',    # [MIRRORED], [MV] 등
-        r'\(.*?\)'     # (한글명), (1) 등
-    ]
-    
-    for pattern in remove_patterns:
-        name = re.sub(pattern, '', name, flags=re.IGNORECASE)
-    
-    # 키워드 제거
-    remove_keywords = ["Official", "MV", "가사", "lyrics", "커버", "댄스", "cover", "MIRRORED", "dance", "Feat", "feat"]
-    
-    for kw in remove_keywords:
-        name = re.sub(r'\b' + re.escape(kw) + r'\b', '', name, flags=re.IGNORECASE)
-    
-    # 연속된 공백, 언더스코어, 하이픈을 하나의 공백으로 변환
-    name = re.sub(r'[_\-\s]+', ' ', name).strip()
+    # 파일명 정규화 과정 (설정의 remove_patterns/remove_keywords를 컴파일한 공유 정리기)
+    name = get_normalizer().normalize(filename)
     
     # 제목 추출 패턴들
     patterns = [
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+오케스트레이션 벤치마크용 합성 데이터셋 생성 스크립트
+accounts.json, smart_extraction_results.json, config/config.json과 (선택적으로) 자리표시용 비디오 파일을
+지정한 디렉토리에 생성합니다. 생성된 디렉토리에서 main.py --simulate로 실행할 수 있습니다.
+--no-files는 상태 파일만 만듭니다 (비디오 폴더가 비어 있으므로 main.py --simulate로 업로드할 파일이 없음 -
+상태 로드/인덱스 벤치마크용).
+
+사용법:
+    python generate_synthetic_dataset.py --output bench_data --accounts 1000 --files-per-folder 100
+"""
+
+import json
+import random
+from pathlib import Path
+from typing import Dict, List
+
+
+ARTIST_POOL = [
+    ("IVE", "아이브"), ("LE SSERAFIM", "르세라핌"), ("aespa", "에스파"), ("RIIZE", "라이즈"),
+    ("STAYC", "스테이씨"), ("ILLIT", "아일릿"), ("NMIXX", "엔믹스"), ("TWS", "투어스"),
+    ("KATSEYE", "캣츠아이"), ("izna", "이즈나"), ("BOYNEXTDOOR", "보이넥스트도어"), ("KISS OF LIFE", "키스오브라이프"),
+]
+
+
+def make_folder_records(rng: random.Random, folder: str, count: int, high_ratio: float) -> List[Dict]:
+    """폴더 하나 분량의 추출 결과 레코드 생성"""
+    records = []
+    for i in range(count):
+        artist, artist_ko = rng.choice(ARTIST_POOL)
+        title = f"Song {rng.randint(1, 500):03d}"
+        suffix = " (1)" if rng.random() < 0.05 else ""
+        filename = f"[MIRRORED] {artist}({artist_ko}) - {title} dance cover{suffix} {i:05d}.mp4"
+        confidence = "high" if rng.random() < high_ratio else rng.choice(["medium", "low"])
+        records.append({
+            "folder": folder,
+            "original_filename": filename,
+            "cleaned_filename": f"{artist} {title}",
+            "artist": artist,
+            "title": title,
+            "confidence": confidence,
+            "final_format": f"{artist} - {title}",
+        })
+    return records
+
+
+def generate_dataset(output: Path, accounts: int, files_per_folder: int, high_ratio: float = 0.9,
+                     create_files: bool = True, seed: int = 42,
+                     base_config: Path = Path(__file__).parent / "config" / "config.json") -> Dict[str, int]:
+    """합성 데이터셋 생성 후 통계 반환"""
+    rng = random.Random(seed)
+    output.mkdir(parents=True, exist_ok=True)
+    videos_dir = output / "videos"
+    (output / "logs").mkdir(exist_ok=True)
+    (output / "config").mkdir(exist_ok=True)
+
+    emails = [f"synthetic{i:05d}@example.com" for i in range(1, accounts + 1)]
+    mappings = []
+    extraction_results: Dict[str, List[Dict]] = {}
+    total_files = 0
+
+    for account_id, email in enumerate(emails, 1):
+        folder = f"folder_{account_id:05d}"
+        records = make_folder_records(rng, folder, files_per_folder, high_ratio)
+        extraction_results[folder] = records
+        total_files += len(records)
+        mappings.append({
+            "id": account_id,
+            "email": email,
+            "password": "synthetic-password",
+            "folder": folder,
+            "uploaded_count": 0,
+        })
+
+        if create_files:
+            folder_path = videos_dir / folder
+            folder_path.mkdir(parents=True, exist_ok=True)
+            for record in records:
+                # 내용 기반 중복 제거에 걸리지 않도록 파일마다 다른 내용 기록
+                (folder_path / record["original_filename"]).write_text(record["original_filename"], encoding='utf-8')
+
+    with (output / "accounts.json").open('w', encoding='utf-8') as f:
+        json.dump({"emails": emails, "password": ["synthetic-password"], "mappings": mappings},
+                  f, ensure_ascii=False, indent=2)
+
+    with (output / "smart_extraction_results.json").open('w', encoding='utf-8') as f:
+        json.dump(extraction_results, f, ensure_ascii=False, indent=2)
+
+    # 기본 설정을 복사하되 대기 시간은 모두 0, 시뮬레이터는 sleep 없이 동작
+    config = {}
+    if base_config.exists():
+        with base_config.open('r', encoding='utf-8') as f:
+            config = json.load(f)
+    general = config.setdefault("general", {})
+    general["video_folder_path"] = str(videos_dir.resolve())
+    general["upload_delay_seconds"] = 0
+    general["logout_delay_seconds"] = 0
+    config["simulation"] = {"seed": seed, "time_scale": 0, "upload_failure_rate": 0.02}
+
+    with (output / "config" / "config.json").open('w', encoding='utf-8') as f:
+        json.dump(config, f, ensure_ascii=False, indent=2)
+
+    return {"accounts": accounts, "folders": len(extraction_results), "files": total_files}
+
+
+def main():
+    """메인 함수"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Generate a synthetic accounts/extraction dataset')
+    parser.add_argument('--output', default='bench_data', help='Output directory (default: bench_data)')
+    parser.add_argument('--accounts', type=int, default=100, help='Number of accounts (default: 100)')
+    parser.add_argument('--files-per-folder', type=int, default=50, help='Files per folder (default: 50)')
+    parser.add_argument('--high-ratio', type=float, default=0.9, help='Share of high confidence records (default: 0.9)')
+    parser.add_argument('--no-files', action='store_true', help='Only build state files (no placeholder videos, so main.py --simulate has nothing to upload)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+    args = parser.parse_args()
+
+    stats = generate_dataset(Path(args.output), args.accounts, args.files_per_folder,
+                             args.high_ratio, not args.no_files, args.seed)
+    print(f"✅ Synthetic dataset written to {args.output}")
+    print(f"   👥 Accounts: {stats['accounts']}")
+    print(f"   📁 Folders: {stats['folders']}")
+    print(f"   📄 Files: {stats['files']}")
+    if args.no_files:
+        print("⚠️ --no-files: no placeholder videos were created, so main.py --simulate will have nothing to upload")
+        return
+    print(f"\n▶️ Run: cd {args.output} && python {Path(__file__).parent.resolve() / 'src' / 'main.py'} --simulate")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+기존 JSON 상태 파일을 SQLite 상태 저장소로 가져오는 일회성 마이그레이션 스크립트
+accounts.json, logs/uploaded_files.json(+ .jsonl 저널), smart_extraction_results.json을 읽어
+하나의 DB 파일에 저장합니다. --export로 DB 내용을 다시 JSON 파일로 내보낼 수 있습니다.
+
+사용법:
+    python import_state_to_sqlite.py                 # config의 general.state_db_path로 가져오기
+    python import_state_to_sqlite.py --db choom_state.db
+    python import_state_to_sqlite.py --export        # DB → JSON 파일
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# src 모듈을 import하기 위해 경로 추가
+sys.path.append(str(Path(__file__).parent / "src"))
+
+from modules.config_manager import ConfigManager
+from modules.extraction_shards import load_extraction_results, results_exist, save_extraction_results
+from modules.state_store import StateStore
+from modules.upload_journal import UploadJournal
+
+
+ACCOUNTS_FILE = Path("accounts.json")
+UPLOADS_FILE = Path("logs/uploaded_files.json")
+UPLOADS_JOURNAL = Path("logs/uploaded_files.jsonl")
+FAILURES_FILE = Path("logs/upload_failures.json")
+FAILURES_JOURNAL = Path("logs/upload_failures.jsonl")
+EXTRACTION_FILE = Path("smart_extraction_results.json")
+
+
+def _load_json(path: Path):
+    if not path.exists():
+        print(f"⏭️ {path} 없음, 건너뜀")
+        return None
+    with path.open('r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def import_json_state(store: StateStore) -> dict:
+    """JSON 파일들을 읽어 상태 저장소에 기록"""
+    accounts = _load_json(ACCOUNTS_FILE)
+    extraction_results = None
+    if results_exist(EXTRACTION_FILE):
+        # 폴더별 샤드로 저장된 경우에도 합친 결과를 가져옴
+        extraction_results = load_extraction_results(EXTRACTION_FILE)
+    else:
+        print(f"⏭️ {EXTRACTION_FILE} 없음, 건너뜀")
+    uploads = None
+    if UPLOADS_FILE.exists() or UPLOADS_JOURNAL.exists():
+        # 압축되지 않은 저널 기록까지 포함하여 재구성
+        uploads = UploadJournal(UPLOADS_FILE, UPLOADS_JOURNAL).load()
+    counts = store.import_json(accounts, uploads, extraction_results)
+    
+    counts['failures'] = 0
+    if FAILURES_FILE.exists() or FAILURES_JOURNAL.exists():
+        for email, files in UploadJournal(FAILURES_FILE, FAILURES_JOURNAL).load().items():
+            for filename, entry in files.items():
+                store.record_failure(email, filename, entry)
+                counts['failures'] += 1
+    return counts
+
+
+def export_json_state(store: StateStore):
+    """상태 저장소 내용을 기존 JSON 파일 형식으로 내보내기"""
+    outputs = {
+        ACCOUNTS_FILE: store.load_accounts(),
+        UPLOADS_FILE: store.load_uploads(),
+        FAILURES_FILE: store.load_failures(),
+    }
+    # 추출 결과는 샤드 디렉토리가 있으면 샤드로, 없으면 단일 JSON으로
+    save_extraction_results(store.load_extraction_results(), EXTRACTION_FILE, sharded=False)
+    print(f"💾 {EXTRACTION_FILE} 저장 완료")
+    for path, data in outputs.items():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open('w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        print(f"💾 {path} 저장 완료")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import JSON state files into the SQLite state store")
+    parser.add_argument("--db", help="SQLite DB path (default: general.state_db_path)")
+    parser.add_argument("--export", action="store_true", help="Export the DB back to JSON files instead")
+    args = parser.parse_args()
+
+    db_path = args.db or ConfigManager().get('general', 'state_db_path', 'choom_state.db')
+    store = StateStore(db_path)
+    try:
+        if args.export:
+            export_json_state(store)
+            return
+        counts = import_json_state(store)
+        print(f"✅ {db_path}로 가져오기 완료: 계정 {counts['accounts']}개, "
+              f"업로드 기록 {counts['uploads']}개, 실패 기록 {counts['failures']}개, 추출 결과 {counts['extraction_records']}개")
+        print("👉 config.json의 general.state_backend를 \"sqlite\"로 설정하면 DB를 사용합니다.")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,535 @@
+#!/usr/bin/env python3
+"""
+오프라인 벤치마크용 Hanlim World 업로드 사이트 모의 서버
+WebAutomator가 의존하는 DOM 구조(로그인 입력창, 검색 컨테이너, 검색 결과,
+다음 버튼, 갤러리 배너, 파일 입력, 설명 입력창, 하단 네비게이션)를 그대로 재현합니다.
+
+사용법:
+    python mock_hanlim_site.py --port 8765
+    python mock_hanlim_site.py --port 8765 --faults faults.json   # 장애 주입
+    # config.json의 web_automation.base_url을 http://127.0.0.1:8765 로 설정
+
+장애 주입 설정 예시 (faults.json):
+    {
+      "seed": 42,
+      "latency_ms": {
+        "/api/search": {"dist": "lognormal", "mean": 800, "sigma": 0.6},
+        "default": {"dist": "uniform", "min": 0, "max": 50}
+      },
+      "error_rate": {"/api/media": 0.05, "default": 0.0},
+      "logout_rate": 0.01,
+      "button_delay_ms": 1500,
+      "alert_rate": 0.05,
+      "stale_rate": 0.1
+    }
+"""
+
+import html
+import json
+import random
+import secrets
+import sys
+import threading
+import time
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+# 지연 분포 샘플러는 SimulatedAutomator와 공유 (src 모듈을 import하기 위해 경로 추가)
+sys.path.append(str(Path(__file__).parent / "src"))
+
+from modules.latency import sample_ms
+
+
+SIGNIN_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Sign in</title>
+<style>
+  .modal { position: fixed; inset: 0; background: rgba(0,0,0,.4); display: flex; align-items: center; justify-content: center; }
+  .modal-body { background: #fff; padding: 16px; }
+</style></head>
+<body>
+<div class="modal" id="notice-modal"><div class="modal-body">
+  <p>Notice</p><button class="_confirmBtn_pmxd4_106" onclick="document.getElementById('notice-modal').remove()">OK</button>
+</div></div>
+<form id="signin-form">
+  <input type="email" name="email" placeholder="email">
+  <input type="password" name="password" placeholder="password">
+  <button type="submit" class="signin-button">Sign in</button>
+</form>
+<script>
+document.getElementById('signin-form').addEventListener('submit', async function (e) {
+  e.preventDefault();
+  const res = await fetch('/api/login', {
+    method: 'POST',
+    headers: {'Content-Type': 'application/json'},
+    body: JSON.stringify({email: this.email.value, password: this.password.value})
+  });
+  if (res.ok) { location.href = '/'; } else { alert('Login failed'); }
+});
+</script>
+</body></html>
+"""
+
+APP_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Hanlim World (mock)</title>
+<style>
+  body { margin: 0; padding-bottom: 80px; }
+  .spacer { height: 1400px; }
+  .new-bottom-nav { position: fixed; bottom: 0; left: 0; right: 0; display: flex; background: #eee; }
+  .new-bottom-nav > div { flex: 1; padding: 12px; text-align: center; }
+  .account-panel { position: fixed; top: 0; left: 0; right: 0; background: #fff; padding: 12px; }
+</style></head>
+<body>
+<div id="app"></div>
+<div class="new-bottom-nav">
+  <div onclick="renderHome()">home</div>
+  <div>explore</div>
+  <div>alerts</div>
+  <div><img alt="nav-icon-4" src="data:image/gif;base64,R0lGODlhAQABAAAAACw=" width="24" height="24" onclick="openAccount()"></div>
+</div>
+<script>
+const FAULTS = __FAULTS__;
+let state = {song: null, mediaId: null};
+
+function el(html) { const d = document.createElement('div'); d.innerHTML = html; return d; }
+function app() { return document.getElementById('app'); }
+function later(fn) {
+  // 늦게 렌더링되는 버튼 재현
+  const ms = FAULTS.button_delay_ms || 0;
+  if (ms > 0) { setTimeout(fn, ms); } else { fn(); }
+}
+function maybeAlert(step) {
+  if (FAULTS.alert_rate && Math.random() < FAULTS.alert_rate) { alert('Unexpected notice (' + step + ')'); }
+}
+function maybeRerender(selector) {
+  // 렌더링 직후 요소를 교체하여 stale element 재현
+  if (FAULTS.stale_rate && Math.random() < FAULTS.stale_rate) {
+    setTimeout(function () {
+      const node = document.querySelector(selector);
+      if (node) { node.replaceWith(node.cloneNode(true)); }
+    }, FAULTS.stale_after_ms || 300);
+  }
+}
+async function api(path, options) {
+  const res = await fetch(path, options);
+  if (res.status === 401) { location.href = '/signin'; throw new Error('session expired'); }
+  if (!res.ok) { throw new Error('HTTP ' + res.status); }
+  return res.json();
+}
+
+function renderHome() {
+  state = {song: null, mediaId: null};
+  app().innerHTML = '<h3>home</h3><button class="upload-button" onclick="renderSearch()">upload</button>';
+}
+
+function renderSearch() {
+  maybeAlert('search');
+  app().innerHTML =
+    '<div class="upload-step-1-search-container">' +
+    '<input type="text" placeholder="search">' +
+    '<img alt="검색" src="data:image/gif;base64,R0lGODlhAQABAAAAACw=" width="24" height="24" onclick="doSearch()">' +
+    '</div><div id="results"></div><div class="spacer"></div><div id="step1-next"></div>';
+  maybeRerender('.upload-step-1-search-container input');
+}
+
+async function doSearch() {
+  const q = document.querySelector('.upload-step-1-search-container input').value;
+  const data = await api('/api/search?q=' + encodeURIComponent(q));
+  const box = document.getElementById('results');
+  box.innerHTML = '';
+  data.results.forEach(function (song) {
+    const item = el('<div class="search-result-item">' + song.artist + ' - ' + song.title + '</div>').firstChild;
+    item.addEventListener('click', function () { selectSong(song); });
+    box.appendChild(item);
+  });
+}
+
+function selectSong(song) {
+  state.song = song;
+  later(function () {
+    document.getElementById('step1-next').innerHTML = '<button class="next-step-button" onclick="renderMedia()">next</button>';
+  });
+}
+
+function renderMedia() {
+  maybeAlert('media');
+  app().innerHTML =
+    '<div class="gallery-banner">import from gallery</div>' +
+    '<input type="file" accept="video/*" style="display:none" onchange="uploadMedia(this.files[0])">' +
+    '<div id="media-status"></div>' +
+    '<button class="next-step-button" disabled onclick="renderDescription()">next</button>';
+}
+
+async function uploadMedia(file) {
+  document.getElementById('media-status').innerHTML = '<div class="uploading">uploading</div>';
+  const data = await api('/api/media?name=' + encodeURIComponent(file.name), {method: 'POST', body: file});
+  state.mediaId = data.media_id;
+  document.getElementById('media-status').innerHTML = '';
+  later(function () { document.querySelector('.next-step-button').disabled = false; });
+}
+
+function renderDescription() {
+  app().innerHTML =
+    '<textarea class="description"></textarea>' +
+    '<div id="step3-submit"></div>';
+  later(function () {
+    document.getElementById('step3-submit').innerHTML = '<button class="next-step-button" onclick="submitPost()">upload</button>';
+    maybeRerender('#step3-submit .next-step-button');
+  });
+}
+
+async function submitPost() {
+  const description = document.querySelector('textarea').value;
+  await api('/api/posts', {
+    method: 'POST',
+    headers: {'Content-Type': 'application/json'},
+    body: JSON.stringify({song_id: state.song ? state.song.id : null, media_id: state.mediaId, description: description})
+  });
+  renderHome();
+}
+
+function openAccount() {
+  const panel = el(
+    '<div class="account-panel">' +
+    '<div class="account-box">account</div>' +
+    '<div class="account-menu">' +
+    '<div class="account__options" onclick="location.href=\\'/profile\\'">profile</div>' +
+    '<div class="account__options" onclick="logout()">logout</div>' +
+    '</div></div>').firstChild;
+  document.body.appendChild(panel);
+}
+
+async function logout() {
+  await fetch('/api/logout', {method: 'POST'});
+  location.href = '/signin';
+}
+
+renderHome();
+</script>
+</body></html>
+"""
+
+
+class FaultInjector:
+    """엔드포인트별 지연/5xx/강제 로그아웃 및 클라이언트 측 장애 설정"""
+
+    CLIENT_KEYS = ('button_delay_ms', 'alert_rate', 'stale_rate', 'stale_after_ms')
+
+    def __init__(self, spec: Optional[Dict] = None):
+        self.spec = spec or {}
+        self.random = random.Random(self.spec.get('seed'))
+        self.lock = threading.Lock()
+
+    def _lookup(self, table, path: str, default=None):
+        """경로별 설정 조회 (정확히 일치 → 접두사 일치 → default)"""
+        if not isinstance(table, dict):
+            return table if table is not None else default
+        if path in table:
+            return table[path]
+        for prefix, value in table.items():
+            if prefix != 'default' and path.startswith(prefix):
+                return value
+        return table.get('default', default)
+
+    def _chance(self, rate) -> bool:
+        if not rate:
+            return False
+        with self.lock:
+            return self.random.random() < rate
+
+    def delay_seconds(self, path: str) -> float:
+        dist = self._lookup(self.spec.get('latency_ms'), path)
+        if not dist:
+            return 0.0
+        with self.lock:
+            return sample_ms(self.random, dist) / 1000.0
+
+    def should_fail(self, path: str) -> bool:
+        return self._chance(self._lookup(self.spec.get('error_rate'), path, 0.0))
+
+    def should_drop_session(self, path: str) -> bool:
+        return self._chance(self._lookup(self.spec.get('logout_rate'), path, 0.0))
+
+    def client_faults(self) -> Dict:
+        return {key: self.spec[key] for key in self.CLIENT_KEYS if key in self.spec}
+
+
+class MockSiteState:
+    """모의 사이트의 세션/게시물 상태 (스레드 안전)"""
+
+    def __init__(self, songs: Optional[List[Dict]] = None):
+        self.lock = threading.Lock()
+        self.sessions: Dict[str, str] = {}
+        self.media: Dict[str, Dict] = {}
+        self.posts: Dict[str, List[Dict]] = {}
+        self.songs = songs or []
+        self.counters: Dict[str, int] = {}
+
+    def count(self, key: str):
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + 1
+
+    def create_session(self, email: str) -> str:
+        token = secrets.token_hex(16)
+        with self.lock:
+            self.sessions[token] = email
+        return token
+
+    def drop_session(self, token: str):
+        with self.lock:
+            self.sessions.pop(token, None)
+
+    def session_email(self, token: Optional[str]) -> Optional[str]:
+        if not token:
+            return None
+        with self.lock:
+            return self.sessions.get(token)
+
+    def search(self, query: str) -> List[Dict]:
+        """검색어와 일치하는 곡 반환 (등록된 곡이 없으면 검색어 자체를 곡으로 간주)"""
+        query_lower = query.strip().lower()
+        matched = [s for s in self.songs if query_lower in f"{s['artist']} {s['title']}".lower()]
+        if matched:
+            return matched[:10]
+        return [{'id': f'q-{abs(hash(query_lower)) % 10**8}', 'artist': '', 'title': query.strip()}]
+
+    def add_media(self, email: str, name: str, size: int) -> str:
+        media_id = secrets.token_hex(8)
+        with self.lock:
+            self.media[media_id] = {'email': email, 'name': name, 'size': size}
+        return media_id
+
+    def add_post(self, email: str, payload: Dict) -> Dict:
+        with self.lock:
+            media = self.media.get(payload.get('media_id') or '', {})
+            post = {
+                'post_id': len(self.posts.get(email, [])) + 1,
+                'song_id': payload.get('song_id'),
+                'description': payload.get('description', ''),
+                'media_name': media.get('name'),
+                'media_size': media.get('size', 0),
+            }
+            self.posts.setdefault(email, []).append(post)
+            return post
+
+    def get_posts(self, email: str) -> List[Dict]:
+        with self.lock:
+            return list(self.posts.get(email, []))
+
+    def stats(self) -> Dict:
+        with self.lock:
+            return {
+                'sessions': len(self.sessions),
+                'posts': sum(len(p) for p in self.posts.values()),
+                'counters': dict(self.counters),
+            }
+
+
+class MockHanlimHandler(BaseHTTPRequestHandler):
+    """모의 사이트 요청 처리기"""
+
+    server_version = 'MockHanlim/1.0'
+
+    @property
+    def site(self) -> MockSiteState:
+        return self.server.site_state
+
+    def log_message(self, format, *args):
+        # 벤치마크 출력이 지저분해지지 않도록 접근 로그는 생략
+        pass
+
+    def _session_token(self) -> Optional[str]:
+        cookie = SimpleCookie(self.headers.get('Cookie', ''))
+        morsel = cookie.get('session')
+        return morsel.value if morsel else None
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: Optional[Dict] = None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, data, headers: Optional[Dict] = None):
+        self._send(status, json.dumps(data, ensure_ascii=False).encode('utf-8'),
+                   'application/json; charset=utf-8', headers)
+
+    def _send_html(self, html: str):
+        self._send(200, html.encode('utf-8'), 'text/html; charset=utf-8')
+
+    def _redirect(self, location: str):
+        self.send_response(302)
+        self.send_header('Location', location)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def _inject_faults(self, path: str, token: Optional[str]) -> bool:
+        """지연/강제 로그아웃/5xx 주입. 요청 처리를 중단해야 하면 True"""
+        if path == '/api/stats':
+            return False
+        faults: FaultInjector = self.server.faults
+        delay = faults.delay_seconds(path)
+        if delay > 0:
+            time.sleep(delay)
+        if token and path != '/api/logout' and faults.should_drop_session(path):
+            self.site.drop_session(token)
+            self.site.count('fault: session dropped')
+        if faults.should_fail(path):
+            self.site.count('fault: 5xx')
+            self._send_json(503, {'error': 'injected failure'})
+            return True
+        return False
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get('Content-Length', 0) or 0)
+        return self.rfile.read(length) if length else b''
+
+
+    def _profile_html(self, email: str) -> str:
+        items = ''.join(
+            f'<div class="post-item" data-post-id="{p["post_id"]}">'
+            f'<p class="post-description">{html.escape(p["description"])}</p></div>'
+            for p in self.site.get_posts(email)
+        )
+        return (
+            '<!DOCTYPE html><html><head><meta charset="utf-8"><title>profile</title></head>'
+            f'<body><h3 class="profile-email">{html.escape(email)}</h3><div class="post-list">{items}</div></body></html>'
+        )
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        path = parsed.path
+        token = self._session_token()
+        self.site.count(f'GET {path}')
+        if self._inject_faults(path, token):
+            return
+        email = self.site.session_email(token)
+
+        if path == '/signin':
+            self._send_html(SIGNIN_HTML)
+        elif path in ('/', '/upload'):
+            if not email:
+                self._redirect('/signin')
+            else:
+                self._send_html(APP_HTML.replace('__FAULTS__', json.dumps(self.server.faults.client_faults())))
+        elif path == '/profile':
+            if not email:
+                self._redirect('/signin')
+            else:
+                self._send_html(self._profile_html(email))
+        elif path == '/api/search':
+            if not email:
+                self._send_json(401, {'error': 'unauthorized'})
+                return
+            query = parse_qs(parsed.query).get('q', [''])[0]
+            self._send_json(200, {'results': self.site.search(query)})
+        elif path == '/api/posts':
+            if not email:
+                self._send_json(401, {'error': 'unauthorized'})
+                return
+            self._send_json(200, {'posts': self.site.get_posts(email)})
+        elif path == '/api/stats':
+            self._send_json(200, self.site.stats())
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        parsed = urlparse(self.path)
+        path = parsed.path
+        token = self._session_token()
+        self.site.count(f'POST {path}')
+        body = self._read_body()
+        if self._inject_faults(path, token):
+            return
+        email = self.site.session_email(token)
+
+        if path == '/api/login':
+            try:
+                payload = json.loads(body or b'{}')
+            except ValueError:
+                payload = {}
+            if not payload.get('email') or not payload.get('password'):
+                self._send_json(400, {'error': 'email and password required'})
+                return
+            new_token = self.site.create_session(payload['email'])
+            self._send_json(200, {'ok': True},
+                            headers={'Set-Cookie': f'session={new_token}; Path=/; HttpOnly'})
+        elif path == '/api/logout':
+            if token:
+                self.site.drop_session(token)
+            self._send_json(200, {'ok': True},
+                            headers={'Set-Cookie': 'session=; Path=/; Max-Age=0'})
+        elif path == '/api/media':
+            if not email:
+                self._send_json(401, {'error': 'unauthorized'})
+                return
+            name = parse_qs(parsed.query).get('name', [''])[0]
+            media_id = self.site.add_media(email, name, len(body))
+            self._send_json(200, {'media_id': media_id})
+        elif path == '/api/posts':
+            if not email:
+                self._send_json(401, {'error': 'unauthorized'})
+                return
+            try:
+                payload = json.loads(body or b'{}')
+            except ValueError:
+                self._send_json(400, {'error': 'invalid json'})
+                return
+            self._send_json(200, self.site.add_post(email, payload))
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+
+def start_mock_site(host: str = '127.0.0.1', port: int = 0, songs: Optional[List[Dict]] = None,
+                    faults: Optional[Dict] = None) -> Tuple[ThreadingHTTPServer, threading.Thread]:
+    """모의 사이트를 백그라운드 스레드로 실행 (port=0이면 빈 포트 자동 할당)"""
+    server = ThreadingHTTPServer((host, port), MockHanlimHandler)
+    server.daemon_threads = True
+    server.site_state = MockSiteState(songs)
+    server.faults = FaultInjector(faults)
+    thread = threading.Thread(target=server.serve_forever, name='mock-hanlim-site', daemon=True)
+    thread.start()
+    return server, thread
+
+
+def load_fault_spec(path: str) -> Dict:
+    """장애 주입 설정 파일 로드"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def base_url_of(server: ThreadingHTTPServer) -> str:
+    """서버의 base_url 반환"""
+    host, port = server.server_address[:2]
+    return f'http://{host}:{port}'
+
+
+def main():
+    """메인 함수"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Offline mock of the Hanlim World upload site')
+    parser.add_argument('--host', default='127.0.0.1', help='Bind address (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='Port (default: 8765)')
+    parser.add_argument('--faults', help='Fault injection spec (JSON file)')
+    args = parser.parse_args()
+
+    faults = load_fault_spec(args.faults) if args.faults else None
+    server, thread = start_mock_site(args.host, args.port, faults=faults)
+    print(f"🧪 Mock Hanlim site running at {base_url_of(server)}")
+    if faults:
+        print(f"💥 Fault injection enabled: {args.faults}")
+    print("   Set web_automation.base_url in config.json to this address")
+    try:
+        thread.join()
+    except KeyboardInterrupt:
+        print("\n⛔ Stopping mock site")
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
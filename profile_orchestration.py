@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+main.py 오케스트레이션 프로파일러
+generate_synthetic_dataset.py로 만든 데이터셋 디렉토리에서 시뮬레이터로 main()을 실행하고
+cProfile 결과와 처리 속도를 출력합니다.
+
+사용법:
+    python generate_synthetic_dataset.py --output bench_data --accounts 1000
+    python profile_orchestration.py --data bench_data --top 30
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import time
+from pathlib import Path
+
+
+SRC_DIR = Path(__file__).resolve().parent / "src"
+
+
+def profile_main(data_dir: Path, account_range=None, top: int = 25, sort: str = 'cumulative'):
+    """데이터셋 디렉토리에서 main(simulate=True)을 프로파일링"""
+    # logger 모듈이 import 시점의 작업 디렉토리에 logs/를 만들므로 먼저 이동
+    os.chdir(data_dir)
+    sys.path.insert(0, str(SRC_DIR))
+    import main as main_module
+
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    profiler.enable()
+    success = main_module.main(account_range, simulate=True)
+    profiler.disable()
+    elapsed = time.perf_counter() - started
+
+    tracker_file = Path("logs/uploaded_files.json")
+    tracked = 0
+    if tracker_file.exists():
+        with tracker_file.open('r', encoding='utf-8') as f:
+            tracked = sum(len(files) for files in json.load(f).values())
+
+    buffer = io.StringIO()
+    pstats.Stats(profiler, stream=buffer).sort_stats(sort).print_stats(top)
+
+    print("\n⏱️ ORCHESTRATION PROFILE")
+    print("=" * 50)
+    print(f"✅ main() result: {success}")
+    print(f"⏱️ Wall time: {elapsed:.2f}s")
+    print(f"📄 Tracked files: {tracked}")
+    if tracked:
+        print(f"⚡ Orchestration overhead: {elapsed / tracked * 1000:.2f} ms/file")
+    print(buffer.getvalue())
+
+
+def main():
+    """메인 함수"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Profile main.py orchestration with the simulated automator')
+    parser.add_argument('--data', default='bench_data', help='Dataset directory (default: bench_data)')
+    parser.add_argument('--account-range', help='Account ID range (e.g., "1-10")')
+    parser.add_argument('--top', type=int, default=25, help='Number of functions to show (default: 25)')
+    parser.add_argument('--sort', default='cumulative', help='pstats sort key (default: cumulative)')
+    args = parser.parse_args()
+
+    data_dir = Path(args.data).resolve()
+    if not (data_dir / "accounts.json").exists():
+        print(f"❌ accounts.json not found in {data_dir} (run generate_synthetic_dataset.py first)")
+        sys.exit(1)
+
+    profile_main(data_dir, args.account_range, args.top, args.sort)
+
+
+if __name__ == '__main__':
+    main()
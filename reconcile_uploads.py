@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+계정에 실제로 게시된 영상과 업로드 기록(logs/uploaded_files.json, accounts.json의 uploaded_count)을 대조하는 스크립트
+계정마다 한 번 로그인해 게시물 목록을 한 번에 가져온 뒤 차이를 보고하고, --apply이면 기록을 일괄 수정합니다.
+
+사용법:
+    python reconcile_uploads.py                         # 전체 계정 대조 (보고만)
+    python reconcile_uploads.py --account-range 1-10 --apply
+    python reconcile_uploads.py --source api            # 프로필 페이지 대신 게시물 API 사용
+    python reconcile_uploads.py --simulate              # 시뮬레이터 게시물(logs/simulated_posts.json)과 대조
+
+--apply는 게시물 목록을 실제 사이트에서 확인한 뒤(web_automation.posts_source_verified: true)에만 허용되며,
+목록이 비어 있거나 계정 기록의 일부(general.reconcile_max_remove_ratio)보다 많이 지우게 되면 --force 없이는 적용하지 않습니다.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from time import sleep
+
+# src 모듈을 import하기 위해 경로 추가
+sys.path.append(str(Path(__file__).parent / "src"))
+
+from modules.config_manager import ConfigManager
+from modules.smart_file_manager import SmartFileManager
+from modules.account_manager import AccountManager, MultiAccountUploadTracker
+from modules.failure_ledger import FailureLedger
+from modules.state_store import open_state_store
+from modules.upload_reconciler import UploadReconciler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconcile upload records with the posts actually on each account")
+    parser.add_argument("--account-range", help='Account ID range (e.g., "1-10")')
+    parser.add_argument("--apply", action="store_true", help="Fix upload records and uploaded_count (default: report only)")
+    parser.add_argument("--source", choices=["profile", "api"], default="profile", help="Where to read the post list from")
+    parser.add_argument("--simulate", action="store_true", help="Use the simulated automator (no browser)")
+    parser.add_argument("--force", action="store_true",
+                        help="Apply even if more than --max-remove-ratio of an account's records would be removed")
+    parser.add_argument("--max-remove-ratio", type=float,
+                        help="Largest share of an account's records --apply may remove (default: config)")
+    args = parser.parse_args()
+
+    config = ConfigManager()
+    if args.apply and not args.simulate and not config.get('web_automation', 'posts_source_verified', False):
+        print("❌ --apply는 게시물 목록이 실제 사이트에서 확인된 뒤에만 사용할 수 있습니다.")
+        print("   보고 결과를 사이트와 직접 비교한 뒤 config의 web_automation.posts_source_verified를 true로 설정하세요.")
+        sys.exit(1)
+    max_remove_ratio = args.max_remove_ratio
+    if max_remove_ratio is None:
+        max_remove_ratio = config.get('general', 'reconcile_max_remove_ratio', 0.2)
+
+    store = open_state_store(config)
+    smart_file_manager = SmartFileManager(config, store)
+    tracker = MultiAccountUploadTracker(store)
+    account_manager = AccountManager(store, tracker)
+    failure_ledger = FailureLedger(store, config.get('general', 'max_upload_attempts', 3))
+    reconciler = UploadReconciler(tracker, account_manager, smart_file_manager, failure_ledger)
+
+    if args.simulate:
+        from modules.simulated_automator import SimulatedAutomator
+        automator = SimulatedAutomator(config)
+    else:
+        from modules.web_automator import WebAutomator
+        automator = WebAutomator(config)
+    logout_delay = config.get('general', 'logout_delay_seconds', 2)
+
+    reports = []
+    try:
+        for mapping in account_manager.get_mappings_in_range(args.account_range):
+            email, folder = mapping['email'], mapping.get('folder')
+            if not folder:
+                continue
+            try:
+                automator.login_with_account(email, mapping['password'])
+                posts = automator.list_posted_videos(args.source)
+                automator.logout()
+                sleep(logout_delay)
+            except Exception as e:
+                print(f"❌ {email}: 게시물 목록을 가져오지 못함 ({str(e)})")
+                continue
+            reports.append(reconciler.reconcile(email, folder, posts, apply=args.apply,
+                                                force=args.force, max_remove_ratio=max_remove_ratio))
+    finally:
+        automator.close()
+        account_manager.flush()
+        tracker.close()
+        failure_ledger.close()
+        if store:
+            store.close()
+
+    mismatched = [r for r in reports if r['missing_on_site'] or r['untracked_posts']]
+    print(f"\n📊 대조 결과: {len(reports)}개 계정 중 {len(mismatched)}개 불일치")
+    for report in mismatched:
+        print(f"  {report['email']}: 게시물 {report['posted']}개 / 기록 {report['tracked']}개")
+        for filename in report['missing_on_site']:
+            print(f"    - 사이트에 없음: {filename}")
+        if report['recovered']:
+            print(f"    + 기록에 추가할 파일: {', '.join(report['recovered'])}")
+        if report['unmatched_posts']:
+            print(f"    ? 파일과 짝지을 수 없는 게시물: {report['unmatched_posts']}개")
+        if report['refused']:
+            print(f"    🛑 적용하지 않음: {report['refused']}")
+    if mismatched and not args.apply:
+        print("👉 --apply로 실행하면 업로드 기록과 uploaded_count를 수정합니다.")
+
+
+if __name__ == "__main__":
+    main()
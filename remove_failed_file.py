@@ -11,6 +11,7 @@ sys.path.append(str(Path(__file__).parent / "src"))
 
 from modules.config_manager import ConfigManager
 from modules.smart_file_manager import SmartFileManager
+from modules.state_store import open_state_store
 from modules.logger import setup_logger
 
 def list_files_in_folder(smart_manager, folder_name):
@@ -35,7 +36,7 @@ def list_files_in_folder(smart_manager, folder_name):
 def main():
     """메인 함수"""
     config = ConfigManager()
-    smart_manager = SmartFileManager(config)
+    smart_manager = SmartFileManager(config, open_state_store(config))
     logger = setup_logger('remove_failed', 'INFO')
     
     print("🗑️ Failed File Removal Tool")
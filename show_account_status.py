@@ -10,10 +10,12 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent / "src"))
 
 from modules.account_manager import AccountManager
+from modules.config_manager import ConfigManager
+from modules.state_store import open_state_store
 
 def show_account_status():
     """계정별 업로드 상태 표시"""
-    account_manager = AccountManager()
+    account_manager = AccountManager(open_state_store(ConfigManager()))
     max_uploads = 50
     
     print("👥 Account Upload Status")
@@ -4,24 +4,35 @@ Smart Extraction Results 통계 출력 스크립트
 각 폴더별 파일 개수와 confidence 분포를 마크다운 형식으로 출력
 """
 
-import json
+import sys
 from collections import Counter
 from pathlib import Path
 
+# src 모듈을 import하기 위해 경로 추가
+sys.path.append(str(Path(__file__).parent / "src"))
+
+from modules.config_manager import ConfigManager
+from modules.extraction_shards import RESULTS_FILE, load_extraction_results, results_exist
+from modules.state_store import open_state_store
+
 def show_confidence_stats():
-    """confidence별 파일 통계를 마크다운 형식으로 표시"""
-    results_file = Path("smart_extraction_results.json")
-    
-    if not results_file.exists():
+    """confidence별 파일 통계를 마크다운 형식으로 표시 (state_backend가 sqlite이면 상태 DB 기준)"""
+    store = open_state_store(ConfigManager())
+    if not store and not results_exist(RESULTS_FILE):
         print("❌ smart_extraction_results.json 파일을 찾을 수 없습니다.")
         return
     
     try:
-        with open(results_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = store.load_extraction_results() if store else load_extraction_results(RESULTS_FILE)
     except Exception as e:
         print(f"❌ 파일 로드 실패: {str(e)}")
         return
+    finally:
+        if store:
+            store.close()
+    if not data:
+        print("❌ 추출 결과가 없습니다.")
+        return
     
     print('# Smart Extraction Results Statistics\n')
     
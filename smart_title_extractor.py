@@ -1,52 +1,301 @@
+import argparse
+import asyncio
 import json
 import os
-import re
+import sys
+import time
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import openai
+from openai.types.chat import ChatCompletion
 from dotenv import load_dotenv
 
+# src 모듈을 import하기 위해 경로 추가
+sys.path.append(str(Path(__file__).parent / "src"))
+
+from modules.extraction_shards import (RESULTS_FILE, load_extraction_results, results_exist,
+                                       save_extraction_folder, save_extraction_results, shard_dir_for)
+from modules.filename_normalizer import get_normalizer
+from modules.gazetteer import Gazetteer
+from modules.llm_cache import LLMCache, cache_key
+from modules.openai_batch import (BATCH_DIR, BatchJob, read_batch_output, submit_batch, wait_for_batch,
+                                  write_batch_inputs)
+from modules.rate_limit import call_with_retry
+from modules.rule_extractor import RuleExtractor
+from modules.state_codec import save_state
+from modules.video_scanner import VideoScanner
+
 # .env 파일에서 환경변수 로드
 load_dotenv()
 
+OPENAI_MODEL = "gpt-4o-mini"
+# 프롬프트를 바꾸면 올려서 이전 프롬프트로 캐시된 응답을 쓰지 않도록 함
+EXTRACTION_PROMPT_VERSION = 2
+VALIDATION_PROMPT_VERSION = 1
+
+
+# 파일 1개당 응답 토큰 추정치 (index, 필드 이름, confidence 등 고정 부분)
+OUTPUT_TOKENS_PER_ITEM = 40
+
+EXTRACTION_SCHEMA = {
+    "name": "extraction_results",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "results": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "index": {"type": "integer"},
+                        "artist": {"type": ["string", "null"]},
+                        "title": {"type": ["string", "null"]},
+                        "confidence": {"type": "string", "enum": ["high", "medium", "low"]},
+                        "final_format": {"type": ["string", "null"]},
+                    },
+                    "required": ["index", "artist", "title", "confidence", "final_format"],
+                    "additionalProperties": False,
+                },
+            },
+        },
+        "required": ["results"],
+        "additionalProperties": False,
+    },
+}
+
+
+class ExtractionResponseError(Exception):
+    """응답이 잘렸거나 형식이 맞지 않음 (청크를 나눠 다시 요청)"""
+
+
+def estimate_tokens(text: str) -> int:
+    """대략적인 토큰 수 (ASCII는 4글자당 1토큰, 한글/이모지 등은 글자당 1토큰)"""
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return ascii_chars // 4 + (len(text) - ascii_chars) + 1
+
+
+def _halves(items: List) -> List[List]:
+    middle = (len(items) + 1) // 2
+    return [half for half in (items[:middle], items[middle:]) if half]
+
+
+def _extraction_key(cleaned_name: str) -> str:
+    return cache_key('extract', OPENAI_MODEL, EXTRACTION_PROMPT_VERSION, cleaned_name)
+
+
 class SmartTitleExtractor:
-    def __init__(self, openai_api_key: str):
-        """OpenAI API를 사용하는 스마트 제목 추출기"""
+    def __init__(self, openai_api_key: str, store=None, cache: Optional[LLMCache] = None,
+                 rules: Optional[RuleExtractor] = None, gazetteer: Optional[Gazetteer] = None, concurrency: int = 8, max_retries: int = 5, retry_base_delay: float = 1.0,
+                 retry_max_delay: float = 60.0, chunk_input_tokens: int = 3000, chunk_output_tokens: int = 3000,
+                 max_files_per_request: int = 40, sharded_output: bool = True, scanner: Optional[VideoScanner] = None):
+        """OpenAI API를 사용하는 스마트 제목 추출기
+        (store: 선택적 SQLite 상태 저장소, cache: LLM 응답 캐시, rules/gazetteer: LLM 전에 적용할 로컬 추출 단계,
+        scanner: 폴더별 비디오 파일 목록 스캐너 - 없으면 캐시 없이 매번 나열)"""
+        self.openai_api_key = openai_api_key
         self.client = openai.OpenAI(api_key=openai_api_key)
-        
-    def clean_filename(self, filename: str) -> str:
-        """파일명 기본 정리"""
-        name = Path(filename).stem
-        
-        # 패턴 제거 (괄호, 대괄호 등)
-        remove_patterns = [
-            r'\[.*?\]',    # [MIRRORED], [MV] 등
-            r'\([^)]*\)',  # 모든 괄호 내용
-        ]
-        
-        for pattern in remove_patterns:
-            name = re.sub(pattern, '', name, flags=re.IGNORECASE)
-        
-        # 키워드 제거
-        remove_keywords = [
-            "dance", "cover", "MIRRORED", "feat", "featuring", 
-            "official", "mv", "music video", "choreography", "choreo"
-        ]
-        
-        for kw in remove_keywords:
-            name = re.sub(r'\b' + re.escape(kw) + r'\b', '', name, flags=re.IGNORECASE)
-        
-        # 연속된 공백, 언더스코어, 하이픈을 하나의 공백으로 변환
-        name = re.sub(r'[_\-\s]+', ' ', name).strip()
-        
-        return name
+        self.store = store
+        self.cache = cache
+        self.rules = rules
+        self.gazetteer = gazetteer
+        # 로컬 추출 단계 효과 확인용 카운터 (규칙/사전으로 처리한 파일, 그 덕분에 보내지 않은 요청, 실제 보낸 요청, 배치로 보낸 요청)
+        self.stats = {'files': 0, 'rule_hits': 0, 'gazetteer_hits': 0, 'requests_saved': 0, 'api_requests': 0,
+                      'batch_requests': 0}
+        # 비동기 모드 설정 (요청 제한/일시적 오류는 직접 재시도하므로 SDK 재시도는 끔)
+        self.concurrency = max(1, concurrency)
+        # 요청 1회당 토큰 예산 (큰 폴더도 응답이 잘리지 않도록 청크로 분할)
+        self.chunk_input_tokens = chunk_input_tokens
+        self.chunk_output_tokens = chunk_output_tokens
+        self.max_files_per_request = max_files_per_request
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        # 폴더마다 해당 폴더의 샤드 파일만 저장 (False면 smart_extraction_results.json 전체를 다시 씀)
+        self.sharded_output = sharded_output
+        self.scanner = scanner or VideoScanner(cache_file=None)
+        self._async_client = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        
+    @staticmethod
+    def clean_filename(filename: str) -> str:
+        """파일명 기본 정리 (설정의 remove_patterns/remove_keywords를 컴파일한 공유 정리기 사용)"""
+        return get_normalizer().normalize(filename)
     
     def extract_with_openai(self, filenames: List[str]) -> List[Dict]:
-        """OpenAI API를 사용하여 배치로 아티스트와 제목 추출"""
-        
-        # 파일명 정리
+        """OpenAI API를 사용하여 배치로 아티스트와 제목 추출 (규칙으로 추출되거나 캐시에 있으면 API 호출 생략)"""
+        cleaned_names, ruled, responses, pending = self._plan_extraction(filenames)
+        error = self._extract_pending(responses, list(pending.items()))
+        return self._assemble_results(filenames, cleaned_names, ruled, responses, error)
+    
+    def _extract_pending(self, responses: Dict[str, Dict], items: List[Tuple[str, str]]) -> Optional[str]:
+        """(정리된 이름, 원본 파일명) 목록을 청크로 나눠 차례로 요청하고 responses에 저장 → 마지막 오류 메시지"""
+        errors = []
+        for chunk in self._chunk_items(items):
+            try:
+                self._store_responses(responses, self._extract_items(chunk))
+            except Exception as e:
+                print(f"OpenAI API 오류: {str(e)}")
+                errors.append(str(e))
+        return errors[-1] if errors else None
+    
+    async def extract_with_openai_async(self, filenames: List[str]) -> List[Dict]:
+        """extract_with_openai의 비동기 버전 (청크를 동시에 요청, 동시 요청 수는 semaphore로 제한)"""
+        cleaned_names, ruled, responses, pending = self._plan_extraction(filenames)
+        errors = []
+        chunks = self._chunk_items(list(pending.items()))
+        for paired in await asyncio.gather(*(self._extract_items_async(chunk) for chunk in chunks),
+                                           return_exceptions=True):
+            if isinstance(paired, Exception):
+                print(f"OpenAI API 오류: {str(paired)}")
+                errors.append(str(paired))
+            else:
+                self._store_responses(responses, paired)
+        return self._assemble_results(filenames, cleaned_names, ruled, responses, errors[-1] if errors else None)
+    
+    def _plan_extraction(self, filenames: List[str]) -> Tuple[List[str], Dict[str, Dict], Dict[str, Dict], Dict[str, str]]:
+        """파일명 정리 → 규칙 추출 → 캐시 조회
+        → (정리된 이름 목록, 규칙 결과 {원본 파일명: 결과}, 캐시된 응답, API로 요청할 {정리된 이름: 원본 파일명})"""
         cleaned_names = [self.clean_filename(f) for f in filenames]
+        self.stats['files'] += len(filenames)
+        
+        # 규칙 또는 알려진 아티스트/제목 사전으로 확실하게 추출되는 파일은 LLM에 보내지 않음
+        ruled = {}
+        for stage, extractor in (('rule', self.rules), ('gazetteer', self.gazetteer)):
+            if extractor is None:
+                continue
+            hits = 0
+            for filename in filenames:
+                if filename not in ruled:
+                    result = extractor.match(filename)
+                    if result:
+                        ruled[filename] = result
+                        hits += 1
+            self.stats[f'{stage}_hits'] += hits
+        if ruled:
+            self.stats['requests_saved'] += len(self._split_chunks([(self.clean_filename(f), f) for f in ruled]))
+            print(f"  ⚡ 로컬 추출 {len(ruled)}개 / {len(filenames)}개 (LLM 요청 제외)")
+        remaining = [(f, cleaned) for f, cleaned in zip(filenames, cleaned_names) if f not in ruled]
+        
+        # 캐시 조회 - 다른 폴더의 같은 이름, "(1)" 사본은 정리된 이름이 같으므로 한 번만 요청
+        responses = {}
+        if self.cache and remaining:
+            responses = self.cache.get_many('extract', OPENAI_MODEL, EXTRACTION_PROMPT_VERSION,
+                                            [cleaned for _, cleaned in remaining])
+        pending = {}
+        for filename, cleaned in remaining:
+            if _extraction_key(cleaned) not in responses and cleaned not in pending:
+                pending[cleaned] = filename
+        
+        if not pending:
+            print(f"  💾 규칙/캐시로 {len(filenames)}개 모두 처리, API 요청 없음")
+        elif self.cache:
+            print(f"  💾 캐시/중복 재사용 {len(remaining) - len(pending)}개, API 요청 {len(pending)}개")
+        return cleaned_names, ruled, responses, pending
+    
+    def _store_responses(self, responses: Dict[str, Dict], paired: List[Tuple[str, Dict]]):
+        responses.update({_extraction_key(cleaned): response for cleaned, response in paired})
+        if self.cache:
+            self.cache.put_many('extract', OPENAI_MODEL, EXTRACTION_PROMPT_VERSION, paired)
+    
+    def _assemble_results(self, filenames: List[str], cleaned_names: List[str], ruled: Dict[str, Dict],
+                          responses: Dict[str, Dict], error: Optional[str]) -> List[Dict]:
+        results = []
+        for filename, cleaned in zip(filenames, cleaned_names):
+            response = ruled.get(filename) or responses.get(_extraction_key(cleaned))
+            if response is None:
+                # 오류 시 기본 처리 (실패한 청크의 파일만 해당)
+                results.append({
+                    "folder": "",
+                    "original_filename": filename,
+                    "cleaned_filename": cleaned,
+                    "artist": None,
+                    "title": cleaned,
+                    "confidence": "low",
+                    "final_format": cleaned,
+                    "error": error or "missing from OpenAI response"
+                })
+                continue
+            # folder 정보는 나중에 설정
+            results.append({"folder": "", "original_filename": filename, "cleaned_filename": cleaned, **response})
+        return results
+    
+    def _chunk_items(self, items: List[Tuple[str, str]]) -> List[List[Tuple[str, str]]]:
+        """(정리된 이름, 원본 파일명) 목록을 요청당 토큰 예산에 맞게 분할"""
+        chunks = self._split_chunks(items)
+        if len(chunks) > 1:
+            print(f"  ✂️ {len(items)}개 파일을 {len(chunks)}개 요청으로 분할")
+        return chunks
+    
+    def _split_chunks(self, items: List[Tuple[str, str]]) -> List[List[Tuple[str, str]]]:
+        chunks, current, input_tokens, output_tokens = [], [], 0, 0
+        for item in items:
+            cleaned, filename = item
+            item_input = estimate_tokens(filename) + estimate_tokens(cleaned) + 8
+            item_output = 2 * estimate_tokens(cleaned) + OUTPUT_TOKENS_PER_ITEM
+            if current and (len(current) >= self.max_files_per_request
+                            or input_tokens + item_input > self.chunk_input_tokens
+                            or output_tokens + item_output > self.chunk_output_tokens):
+                chunks.append(current)
+                current, input_tokens, output_tokens = [], 0, 0
+            current.append(item)
+            input_tokens += item_input
+            output_tokens += item_output
+        if current:
+            chunks.append(current)
+        return chunks
+    
+    def _extract_items(self, items: List[Tuple[str, str]]) -> List[Tuple[str, Dict]]:
+        """청크 1개 요청 - 응답이 잘리거나 일부 항목이 빠지면 빠진 항목만 반으로 나눠 다시 요청"""
+        try:
+            self.stats['api_requests'] += 1
+            response = self.client.chat.completions.create(**self._extraction_request(items))
+            paired, missing = self._parse_extraction(response, items)
+        except ExtractionResponseError as e:
+            paired, missing = [], items
+            print(f"  ⚠️ {len(items)}개 파일 응답 오류: {str(e)}")
+        if missing and (len(missing) > 1 or len(items) > 1):
+            for half in _halves(missing):
+                paired.extend(self._extract_items(half))
+        return paired
+    
+    async def _extract_items_async(self, items: List[Tuple[str, str]]) -> List[Tuple[str, Dict]]:
+        """_extract_items의 비동기 버전 (429/5xx는 retry-after와 지터를 반영해 재시도)"""
+        if self._async_client is None:
+            self._async_client = openai.AsyncOpenAI(api_key=self.openai_api_key, max_retries=0)
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        request = self._extraction_request(items)
+        
+        async def create():
+            async with self._semaphore:
+                self.stats['api_requests'] += 1
+                return await self._async_client.chat.completions.create(**request)
         
+        try:
+            response = await call_with_retry(create, self.max_retries, self.retry_base_delay, self.retry_max_delay,
+                                             label=f'extraction of {len(items)} files')
+            paired, missing = self._parse_extraction(response, items)
+        except ExtractionResponseError as e:
+            paired, missing = [], items
+            print(f"  ⚠️ {len(items)}개 파일 응답 오류: {str(e)}")
+        if missing and (len(missing) > 1 or len(items) > 1):
+            for retried in await asyncio.gather(*(self._extract_items_async(half) for half in _halves(missing))):
+                paired.extend(retried)
+        return paired
+    
+    def _extraction_request(self, items: List[Tuple[str, str]]) -> Dict:
+        """chat.completions.create 인자 (JSON schema 구조화 응답, 출력 토큰 상한 지정)"""
+        output_budget = sum(2 * estimate_tokens(cleaned) + OUTPUT_TOKENS_PER_ITEM for cleaned, _ in items)
+        return {
+            "model": OPENAI_MODEL,
+            "messages": self._build_extraction_messages([filename for _, filename in items],
+                                                        [cleaned for cleaned, _ in items]),
+            "temperature": 0.1,
+            "max_tokens": max(256, int(output_budget * 1.5)),
+            "response_format": {"type": "json_schema", "json_schema": EXTRACTION_SCHEMA},
+        }
+    
+    def _build_extraction_messages(self, filenames: List[str], cleaned_names: List[str]) -> List[Dict]:
         # OpenAI 프롬프트 생성
         prompt = f"""다음은 K-pop 댄스 커버 영상의 파일명들입니다. 각 파일명에서 아티스트명과 노래 제목을 추출해주세요.
 
@@ -57,9 +306,8 @@ class SmartTitleExtractor:
 4. 파일명에 명확하게 들어가 있지 않으면 null로 설정
 
 추출 예시 :
-    "folder": "EXRAL PRODUCTION",
-    "original_filename": "🇮🇩 Kpop In Public GIDLE - DUMDi DUMBDi  #XRPD #RandomPlayDance #Shorts.mp4",
-    "cleaned_filename": "🇮🇩 Kpop In Public GIDLE DUMDi DUMBDi #XRPD #RandomPlayDance #Shorts",
+    원본: "🇮🇩 Kpop In Public GIDLE - DUMDi DUMBDi  #XRPD #RandomPlayDance #Shorts.mp4"
+    정리됨: "🇮🇩 Kpop In Public GIDLE DUMDi DUMBDi #XRPD #RandomPlayDance #Shorts"
     "artist": "GIDLE",
     "title": "DUMDi DUMBDi",
     "confidence": "high",
@@ -72,161 +320,271 @@ class SmartTitleExtractor:
 파일명 목록:
 {chr(10).join([f"{i+1}. 원본: {orig}, 정리됨: {clean}" for i, (orig, clean) in enumerate(zip(filenames, cleaned_names))])}
 
-각 파일명에 대해 다음 JSON 형식으로 응답해주세요:
+각 파일명에 대해 목록의 번호를 index로 하여 results 배열에 하나씩 응답해주세요:
 {{
-  "original_filename": "원본 파일명 그대로",
-  "cleaned_filename": "정리된 파일명",
+  "index": 파일명 목록의 번호,
   "artist": "아티스트명 또는 null",
   "title": "노래 제목",
   "confidence": "high/medium/low",
   "final_format": "아티스트 - 제목 형태"
-}}
-
-전체 응답은 JSON 배열 형태로 해주세요."""
+}}"""
 
+        return [
+            {"role": "system", "content": "당신은 K-pop 전문가입니다. 파일명에서 아티스트와 노래 제목을 정확하게 추출하는 전문가입니다."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def _parse_extraction(self, response, items: List[Tuple[str, str]]) -> Tuple[List[Tuple[str, Dict]], List[Tuple[str, str]]]:
+        """구조화 응답을 번호(index) 기준으로 요청 항목과 짝지음 → (성공한 항목, 빠진 항목)"""
+        choice = response.choices[0]
+        if getattr(choice, 'finish_reason', None) == 'length':
+            raise ExtractionResponseError("response truncated at max_tokens")
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "당신은 K-pop 전문가입니다. 파일명에서 아티스트와 노래 제목을 정확하게 추출하는 전문가입니다."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1
-            )
-            
-            # JSON 응답 파싱
-            content = response.choices[0].message.content
-            
-            # JSON 블록 추출 (```json ... ``` 형태인 경우)
-            if "```json" in content:
-                start = content.find("```json") + 7
-                end = content.find("```", start)
-                content = content[start:end].strip()
-            elif "```" in content:
-                start = content.find("```") + 3
-                end = content.find("```", start)
-                content = content[start:end].strip()
-            
-            results = json.loads(content)
-            
-            # OpenAI가 완전한 형태로 응답했으므로 그대로 사용
-            final_results = []
-            for result in results:
-                # folder 정보만 추가
-                result["folder"] = ""  # 나중에 설정
-                final_results.append(result)
-            
-            return final_results
-            
-        except Exception as e:
-            print(f"OpenAI API 오류: {str(e)}")
-            # 오류 시 기본 처리
-            results = []
-            for i, filename in enumerate(filenames):
-                results.append({
-                    "folder": "",
-                    "original_filename": filename,
-                    "cleaned_filename": cleaned_names[i],
-                    "artist": None,
-                    "title": cleaned_names[i],
-                    "confidence": "low",
-                    "final_format": cleaned_names[i],
-                    "error": str(e)
-                })
-            return results
+            results = json.loads(choice.message.content)["results"]
+        except (TypeError, ValueError, KeyError) as e:
+            raise ExtractionResponseError(f"invalid JSON response: {str(e)}")
+        
+        by_index = {}
+        for entry in results:
+            index = entry.get("index") if isinstance(entry, dict) else None
+            # 범위를 벗어나거나 중복된 번호, 제목이 없는 항목은 버리고 다시 요청
+            if not isinstance(index, int) or not 1 <= index <= len(items) or index in by_index:
+                continue
+            if entry.get("confidence") not in ("high", "medium", "low"):
+                continue
+            by_index[index] = {field: entry.get(field) for field in ("artist", "title", "confidence", "final_format")}
+        
+        paired = [(cleaned, by_index[i]) for i, (cleaned, _) in enumerate(items, 1) if i in by_index]
+        missing = [item for i, item in enumerate(items, 1) if i not in by_index]
+        return paired, missing
+
+    def print_rule_stats(self):
+        """로컬 추출 단계(규칙/사전) 적중률과 생략한 API 요청 수 출력"""
+        if (self.rules is None and self.gazetteer is None) or not self.stats['files']:
+            return
+        local_hits = self.stats['rule_hits'] + self.stats['gazetteer_hits']
+        hit_rate = local_hits / self.stats['files'] * 100
+        print(f"⚡ 로컬 추출: {local_hits}/{self.stats['files']}개 ({hit_rate:.1f}%), "
+              f"API 요청 {self.stats['api_requests']}회 (로컬 추출로 약 {self.stats['requests_saved']}회 절약)")
+        if self.stats['batch_requests']:
+            print(f"  - Batch API 요청: {self.stats['batch_requests']}개")
+        if self.rules:
+            for name, count in self.rules.stats['by_pattern'].items():
+                print(f"  - 규칙 {name}: {count}개")
+        if self.gazetteer is not None:
+            print(f"  - 아티스트/제목 사전: {self.stats['gazetteer_hits']}개")
 
     def _load_existing_results(self) -> Dict[str, List[Dict]]:
         """기존 smart_extraction_results.json 로드"""
-        results_file = Path("smart_extraction_results.json")
+        if self.store:
+            existing_results = self.store.load_extraction_results()
+            print(f"📋 기존 결과 로드 (state store): {len(existing_results)}개 폴더")
+            return existing_results
         
-        if not results_file.exists():
+        if not results_exist(RESULTS_FILE):
             print("📄 기존 결과 파일이 없습니다. 새로 시작합니다.")
             return {}
         
         try:
-            with results_file.open('r', encoding='utf-8') as f:
-                existing_results = json.load(f)
-                print(f"📋 기존 결과 로드: {len(existing_results)}개 폴더")
-                return existing_results
+            existing_results = load_extraction_results(RESULTS_FILE)
+            print(f"📋 기존 결과 로드: {len(existing_results)}개 폴더")
+            return existing_results
         except Exception as e:
             print(f"⚠️ 기존 결과 파일 로드 실패: {str(e)}")
             return {}
 
     def process_choom_folders(self, choom_base_path: str) -> Dict[str, List[Dict]]:
         """choom 폴더 내 모든 하위 폴더를 순회하며 파일명 처리"""
+        # 기존 결과 로드
+        all_results = self._load_existing_results()
+        self._learn_gazetteer(all_results)
+        
+        for folder_name, filenames_to_process, is_incremental in self._folders_to_process(choom_base_path, all_results):
+            # OpenAI로 배치 처리
+            print(f"  🤖 OpenAI API로 분석 중...")
+            results = self.extract_with_openai(filenames_to_process)
+            self._merge_folder_results(all_results, folder_name, results, is_incremental)
+        
+        return all_results
+    
+    async def process_choom_folders_async(self, choom_base_path: str) -> Dict[str, List[Dict]]:
+        """process_choom_folders의 비동기 버전 - 여러 폴더를 동시에 요청하고 끝나는 순서대로 결과에 병합"""
+        all_results = self._load_existing_results()
+        self._learn_gazetteer(all_results)
+        plans = list(self._folders_to_process(choom_base_path, all_results))
+        if not plans:
+            return all_results
+        print(f"\n🤖 {len(plans)}개 폴더를 최대 {self.concurrency}개 동시 요청으로 분석 중...")
+        
+        async def extract(plan):
+            return plan, await self.extract_with_openai_async(plan[1])
+        
+        for task in asyncio.as_completed([extract(plan) for plan in plans]):
+            (folder_name, _, is_incremental), results = await task
+            self._merge_folder_results(all_results, folder_name, results, is_incremental)
+        
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+        return all_results
+    
+    def process_choom_folders_batch(self, choom_base_path: str, batch_dir: Path = BATCH_DIR,
+                                    poll_interval: float = 60.0) -> Dict[str, List[Dict]]:
+        """process_choom_folders의 Batch API 버전 - 모든 폴더의 요청을 JSONL 배치로 한 번에 제출하고 끝날 때까지 폴링
         
+        제출한 배치는 batch_dir/extraction_batch.json에 기록되므로, 기다리는 중 중단해도 다시 실행하면 새로 제출하지 않고
+        같은 배치를 이어서 기다립니다. 배치에서 실패했거나 빠진 항목(그 사이 새로 추가된 파일 포함)만 일반 요청으로 처리합니다.
+        """
+        all_results = self._load_existing_results()
+        self._learn_gazetteer(all_results)
+        plans = [(folder_name, filenames, is_incremental, self._plan_extraction(filenames))
+                 for folder_name, filenames, is_incremental in self._folders_to_process(choom_base_path, all_results)]
+        
+        manifest_path = Path(batch_dir) / 'extraction_batch.json'
+        job = BatchJob.load(manifest_path)
+        if job and (job.model, job.prompt_version) != (OPENAI_MODEL, EXTRACTION_PROMPT_VERSION):
+            print(f"⚠️ 이전 배치는 다른 모델/프롬프트 버전으로 제출되어 사용하지 않습니다: {manifest_path}")
+            job.remove()
+            job = None
+        if job:
+            print(f"\n📦 제출된 배치 {len(job.batches)}개를 이어서 기다립니다 ({manifest_path})")
+        else:
+            # 여러 폴더에 같은 정리된 이름이 있으면 한 번만 요청
+            pending = {}
+            for _, _, _, (_, _, _, folder_pending) in plans:
+                for cleaned, filename in folder_pending.items():
+                    pending.setdefault(cleaned, filename)
+            job = self._submit_extraction_batch(pending, Path(batch_dir), manifest_path) if pending else None
+        
+        # 배치 결과와 일반 요청으로 받은 결과 (여러 폴더에 같은 이름이 있어도 한 번만 요청)
+        fetched = self._collect_batch_responses(job, poll_interval) if job else {}
+        for folder_name, filenames, is_incremental, (cleaned_names, ruled, responses, pending) in plans:
+            leftover = [(cleaned, filename) for cleaned, filename in pending.items()
+                        if _extraction_key(cleaned) not in fetched]
+            error = None
+            if leftover:
+                print(f"  🤖 {folder_name}: 배치에 결과가 없는 {len(leftover)}개 파일을 일반 요청으로 분석 중...")
+                error = self._extract_pending(fetched, leftover)
+            for cleaned in pending:
+                key = _extraction_key(cleaned)
+                if key in fetched:
+                    responses[key] = fetched[key]
+            results = self._assemble_results(filenames, cleaned_names, ruled, responses, error)
+            self._merge_folder_results(all_results, folder_name, results, is_incremental)
+        
+        if job:
+            job.remove()
+        return all_results
+    
+    def _submit_extraction_batch(self, pending: Dict[str, str], batch_dir: Path, manifest_path: Path) -> BatchJob:
+        """대기 중인 요청을 청크로 나눠 JSONL 입력 파일로 쓰고 Batch API에 제출 (제출 즉시 manifest 저장)"""
+        chunks = self._chunk_items(list(pending.items()))
+        requests = {f"extract-{index}": self._extraction_request(chunk) for index, chunk in enumerate(chunks, 1)}
+        items = {f"extract-{index}": chunk for index, chunk in enumerate(chunks, 1)}
+        prefix = f"extraction-{time.strftime('%Y%m%d-%H%M%S')}"
+        job = BatchJob(manifest_path, OPENAI_MODEL, EXTRACTION_PROMPT_VERSION)
+        for input_file, custom_ids in write_batch_inputs(batch_dir, prefix, requests):
+            batch = submit_batch(self.client, input_file, metadata={'purpose': 'title_extraction'})
+            job.batches.append({
+                'batch_id': batch.id,
+                'input_file': str(input_file),
+                'requests': {custom_id: [list(item) for item in items[custom_id]] for custom_id in custom_ids},
+            })
+            job.save()
+        self.stats['batch_requests'] += len(requests)
+        print(f"\n📦 {len(pending)}개 파일을 {len(requests)}개 요청, 배치 {len(job.batches)}개로 제출했습니다 ({manifest_path})")
+        return job
+    
+    def _collect_batch_responses(self, job: BatchJob, poll_interval: float) -> Dict[str, Dict]:
+        """모든 배치가 끝날 때까지 기다린 뒤 custom_id별 응답을 요청 항목과 짝지어 {캐시 키: 결과}로 반환 (캐시에도 저장)"""
+        items = dict(job.request_items())
+        responses: Dict[str, Dict] = {}
+        for entry in job.batches:
+            batch = wait_for_batch(self.client, entry['batch_id'], poll_interval)
+            if batch.status != 'completed':
+                print(f"  ⚠️ 배치 {entry['batch_id']} 상태: {batch.status} (받은 결과만 사용)")
+            for custom_id, body in read_batch_output(self.client, batch).items():
+                if custom_id not in items:
+                    continue
+                try:
+                    paired, _ = self._parse_extraction(ChatCompletion.model_validate(body), items[custom_id])
+                except (ExtractionResponseError, ValueError) as e:
+                    print(f"  ⚠️ 배치 응답 {custom_id} 오류: {str(e)}")
+                    continue
+                self._store_responses(responses, paired)
+        print(f"  ✅ 배치 결과 {len(responses)}개 / {sum(len(chunk) for chunk in items.values())}개 파일")
+        return responses
+    
+    def _folders_to_process(self, choom_base_path: str, all_results: Dict[str, List[Dict]]):
+        """처리할 폴더와 파일 목록 (folder_name, filenames, is_incremental) 생성"""
         choom_path = Path(choom_base_path)
         if not choom_path.exists():
             raise FileNotFoundError(f"choom 폴더를 찾을 수 없습니다: {choom_base_path}")
         
-        # 기존 결과 로드
-        all_results = self._load_existing_results()
-        
-        # 모든 하위 폴더 찾기
-        for folder_path in choom_path.iterdir():
-            if folder_path.is_dir():
-                folder_name = folder_path.name
-                
-                # 비디오 파일 찾기
-                video_extensions = ['.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv']
-                video_files = []
-                
-                for ext in video_extensions:
-                    video_files.extend(folder_path.glob(f"*{ext}"))
-                    video_files.extend(folder_path.glob(f"*{ext.upper()}"))
+        # 하위 폴더마다 os.scandir 한 번 (바뀌지 않은 폴더는 스캔 캐시의 파일 목록 사용)
+        folders = self.scanner.scan(choom_path)
+        print(f"📂 {len(folders)}개 폴더 스캔 (변경 없는 {self.scanner.stats['cached']}개는 캐시 사용)")
+        for folder_name, current_video_files in folders:
+            if not current_video_files:
+                print(f"  📂 {folder_name}에서 비디오 파일을 찾지 못했습니다.")
+                continue
+            
+            # 이미 처리된 폴더인지 확인하고 누락된 파일이 있는지 체크
+            if folder_name in all_results:
+                existing_files = {item['original_filename'] for item in all_results[folder_name]}
+                missing_files = [f for f in current_video_files if f not in existing_files]
                 
-                if not video_files:
-                    print(f"  📂 {folder_name}에서 비디오 파일을 찾지 못했습니다.")
+                if not missing_files:
+                    print(f"⏭️ 건너뜀: {folder_name} 폴더 (모든 {len(current_video_files)}개 파일 이미 처리됨)")
                     continue
-                
-                current_video_files = [f.name for f in video_files]
-                
-                # 이미 처리된 폴더인지 확인하고 누락된 파일이 있는지 체크
-                if folder_name in all_results:
-                    existing_files = [item['original_filename'] for item in all_results[folder_name]]
-                    missing_files = [f for f in current_video_files if f not in existing_files]
-                    
-                    if not missing_files:
-                        print(f"⏭️ 건너뜀: {folder_name} 폴더 (모든 {len(current_video_files)}개 파일 이미 처리됨)")
-                        continue
-                    else:
-                        print(f"🔄 증분 처리: {folder_name} 폴더 ({len(missing_files)}개 새 파일 발견)")
-                        filenames_to_process = missing_files
-                        is_incremental = True
                 else:
-                    print(f"\n🔄 처리 중: {folder_name} 폴더")
-                    filenames_to_process = current_video_files
-                    is_incremental = False
-                
-                print(f"  📄 {len(filenames_to_process)}개의 비디오 파일 {'증분 ' if is_incremental else ''}처리 예정")
-                
-                # OpenAI로 배치 처리
-                print(f"  🤖 OpenAI API로 분석 중...")
-                results = self.extract_with_openai(filenames_to_process)
-                
-                # 폴더명 추가
-                for result in results:
-                    result["folder"] = folder_name
-                
-                # 증분 업데이트인 경우 기존 결과에 추가, 아니면 새로 설정
-                if is_incremental:
-                    all_results[folder_name].extend(results)
-                    print(f"  ✅ {folder_name} 폴더 증분 처리 완료 (+{len(results)}개)")
-                else:
-                    all_results[folder_name] = results
-                    print(f"  ✅ {folder_name} 폴더 처리 완료 ({len(results)}개)")
-                
-                # 중간 저장 (API 오류 시 복구를 위해)
-                self._save_intermediate_results(all_results)
+                    print(f"🔄 증분 처리: {folder_name} 폴더 ({len(missing_files)}개 새 파일 발견)")
+                    filenames_to_process = missing_files
+                    is_incremental = True
+            else:
+                print(f"\n🔄 처리 중: {folder_name} 폴더")
+                filenames_to_process = current_video_files
+                is_incremental = False
+            
+            print(f"  📄 {len(filenames_to_process)}개의 비디오 파일 {'증분 ' if is_incremental else ''}처리 예정")
+            yield folder_name, filenames_to_process, is_incremental
+    
+    def _merge_folder_results(self, all_results: Dict[str, List[Dict]], folder_name: str, results: List[Dict],
+                              is_incremental: bool):
+        # 폴더명 추가
+        for result in results:
+            result["folder"] = folder_name
+        # 새로 확인된 아티스트/제목은 다음 폴더부터 사전에서 바로 찾음
+        self._learn_gazetteer({folder_name: results})
+        
+        # 증분 업데이트인 경우 기존 결과에 추가, 아니면 새로 설정
+        if is_incremental:
+            all_results[folder_name].extend(results)
+            print(f"  ✅ {folder_name} 폴더 증분 처리 완료 (+{len(results)}개)")
+        else:
+            all_results[folder_name] = results
+            print(f"  ✅ {folder_name} 폴더 처리 완료 ({len(results)}개)")
         
-        return all_results
+        # 중간 저장 (API 오류 시 복구를 위해)
+        self._save_intermediate_results(all_results, folder_name)
     
-    def _save_intermediate_results(self, results: Dict[str, List[Dict]]):
+    def _learn_gazetteer(self, results: Dict[str, List[Dict]]):
+        if self.gazetteer is not None:
+            added = self.gazetteer.add_results(results)
+            if added and len(results) > 1:
+                print(f"📚 아티스트/제목 사전: {added}개 이름 학습")
+    
+    def _save_intermediate_results(self, results: Dict[str, List[Dict]], folder_name: Optional[str] = None):
         """중간 결과 저장 (API 오류 시 복구용)"""
         try:
-            output_file = "smart_extraction_results.json"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(results, f, ensure_ascii=False, indent=2)
+            if self.store and folder_name:
+                # 상태 저장소 사용 시 방금 처리한 폴더만 교체
+                self.store.replace_folder(folder_name, results[folder_name])
+                return
+            if folder_name:
+                save_extraction_folder(folder_name, results[folder_name], results, sharded=self.sharded_output)
+            else:
+                save_extraction_results(results, RESULTS_FILE, sharded=self.sharded_output)
         except Exception as e:
             print(f"⚠️ 중간 결과 저장 실패: {str(e)}")
 
@@ -234,8 +592,9 @@ class SmartTitleExtractor:
 class ExtractionValidator:
     """추출 결과 검증 및 수정 클래스"""
     
-    def __init__(self, openai_api_key: str):
+    def __init__(self, openai_api_key: str, cache: Optional[LLMCache] = None):
         self.client = openai.OpenAI(api_key=openai_api_key)
+        self.cache = cache
     
     def validate_and_correct_mappings(self, results_data: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
         """전체 결과 데이터의 매핑을 검증하고 수정"""
@@ -344,7 +703,31 @@ class ExtractionValidator:
         return False
     
     def _get_corrected_mappings(self, items: List[Dict]) -> List[Dict]:
-        """OpenAI를 통해 올바른 매핑 정보 획득"""
+        """OpenAI를 통해 올바른 매핑 정보 획득 (같은 정리된 파일명/현재 매핑은 캐시된 응답 사용)"""
+        fallback = {'artist': None, 'title': None, 'confidence': 'low'}
+        if not self.cache:
+            return self._request_corrected_mappings(items) or [dict(fallback) for _ in items]
+        
+        values = [[SmartTitleExtractor.clean_filename(item['original_filename']), item.get('artist'), item.get('title')]
+                  for item in items]
+        keys = [cache_key('validate', OPENAI_MODEL, VALIDATION_PROMPT_VERSION, value) for value in values]
+        cached = self.cache.get_many('validate', OPENAI_MODEL, VALIDATION_PROMPT_VERSION, values)
+        
+        pending = {}
+        for item, value, key in zip(items, values, keys):
+            if key not in cached and key not in pending:
+                pending[key] = (item, value)
+        if pending:
+            fresh = self._request_corrected_mappings([item for item, _ in pending.values()])
+            # 순서대로 짝지을 수 있는 정상 응답만 캐시
+            if fresh and len(fresh) == len(pending):
+                self.cache.put_many('validate', OPENAI_MODEL, VALIDATION_PROMPT_VERSION,
+                                    [(value, mapping) for (_, value), mapping in zip(pending.values(), fresh)])
+            cached.update(zip(pending.keys(), fresh or []))
+        return [cached.get(key, dict(fallback)) for key in keys]
+    
+    def _request_corrected_mappings(self, items: List[Dict]) -> Optional[List[Dict]]:
+        """OpenAI 요청 1회 (실패 시 None)"""
         filenames_info = []
         for item in items:
             filenames_info.append({
@@ -374,7 +757,7 @@ class ExtractionValidator:
 
         try:
             response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
+                model=OPENAI_MODEL,
                 messages=[
                     {"role": "system", "content": "당신은 K-pop 전문가입니다. 파일명에서 정확한 아티스트와 노래 제목만 추출해주세요."},
                     {"role": "user", "content": prompt}
@@ -398,41 +781,97 @@ class ExtractionValidator:
             
         except Exception as e:
             print(f"    ⚠️ OpenAI API 오류: {str(e)}")
-            return [{'artist': None, 'title': None, 'confidence': 'low'} for _ in items]
+            return None
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Extract artist/title from video filenames with OpenAI")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="Process folders concurrently with AsyncOpenAI")
+    parser.add_argument("--concurrency", type=int, help="Max concurrent requests in --async mode "
+                                                        "(default: title_extraction.async_concurrency)")
+    parser.add_argument("--batch", action="store_true",
+                        help="Submit all pending requests as one OpenAI Batch API job and wait for it "
+                             "(re-run to resume waiting for a submitted job)")
+    parser.add_argument("--poll-interval", type=float, help="Seconds between batch status checks "
+                                                             "(default: title_extraction.batch_poll_seconds)")
+    args = parser.parse_args()
+    if args.batch and args.use_async:
+        parser.error("--batch and --async cannot be used together")
+    
     # OpenAI API 키 설정
     api_key = os.getenv('OPENAI_API_KEY')
 
     
     # ConfigManager를 통해 choom 폴더 경로 가져오기
+    store = None
+    cache = None
+    extractor_settings = {}
+    batch_dir = BATCH_DIR
+    poll_interval = 60.0
     try:
-        from pathlib import Path
-        import sys
-        sys.path.append(str(Path(__file__).parent / "src"))
         from modules.config_manager import ConfigManager
+        from modules.gazetteer import Gazetteer, load_artist_mapping
+        from modules.llm_cache import open_llm_cache
+        from modules.rule_extractor import load_rule_extractor
+        from modules.state_store import open_state_store
         
         config = ConfigManager()
         choom_path = config.get('general', 'video_folder_path', '/Users/minsung/Documents/choom')
         print(f"📁 사용할 choom 폴더 경로: {choom_path}")
+        store = open_state_store(config)
+        cache = open_llm_cache(config)
+        if config.get('title_extraction', 'rule_extraction', True):
+            extractor_settings['rules'] = load_rule_extractor(
+                config.get('title_extraction', 'rule_patterns_path', 'config/title_patterns.json'),
+                config.get('title_extraction', 'rule_min_confidence', 'high'))
+        if config.get('title_extraction', 'gazetteer', True):
+            extractor_settings['gazetteer'] = Gazetteer(
+                load_artist_mapping(config.get('title_extraction', 'artist_mapping_path', 'config/artist_mapping.json')),
+                config.get('title_extraction', 'gazetteer_min_confidence', 'high'))
+        extractor_settings.update({
+            'concurrency': config.get('title_extraction', 'async_concurrency', 8),
+            'max_retries': config.get('title_extraction', 'max_retries', 5),
+            'retry_base_delay': config.get('title_extraction', 'retry_base_delay', 1.0),
+            'retry_max_delay': config.get('title_extraction', 'retry_max_delay', 60.0),
+            'chunk_input_tokens': config.get('title_extraction', 'chunk_input_tokens', 3000),
+            'chunk_output_tokens': config.get('title_extraction', 'chunk_output_tokens', 3000),
+            'max_files_per_request': config.get('title_extraction', 'max_files_per_request', 40),
+            'sharded_output': config.get('general', 'extraction_storage', 'sharded') == 'sharded',
+            'scanner': VideoScanner(
+                config.get('title_extraction', 'scan_cache_path', 'logs/video_scan_cache.json')
+                if config.get('title_extraction', 'scan_cache', True) else None,
+                config.get('title_extraction', 'scan_workers', 8)),
+        })
+        batch_dir = Path(config.get('title_extraction', 'batch_dir', str(BATCH_DIR)))
+        poll_interval = config.get('title_extraction', 'batch_poll_seconds', 60.0)
     except Exception as e:
         print(f"⚠️ ConfigManager 로드 실패, 환경변수 사용: {e}")
         choom_path = os.getenv('FOLDER_PATH', '/Users/minsung/Documents/choom')
     
     # 스마트 추출기 초기화
-    extractor = SmartTitleExtractor(api_key)
+    if args.concurrency:
+        extractor_settings['concurrency'] = args.concurrency
+    extractor = SmartTitleExtractor(api_key, store, cache, **extractor_settings)
     
     try:
         # 모든 폴더 처리
         print("choom 폴더 내 모든 하위 폴더를 스캔 중...")
-        all_results = extractor.process_choom_folders(choom_path)
-        
-        # 결과 저장
-        output_file = "smart_extraction_results.json"
+        if args.use_async:
+            all_results = asyncio.run(extractor.process_choom_folders_async(choom_path))
+        elif args.batch:
+            all_results = extractor.process_choom_folders_batch(choom_path, batch_dir, args.poll_interval or poll_interval)
+        else:
+            all_results = extractor.process_choom_folders(choom_path)
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(all_results, f, ensure_ascii=False, indent=2)
+        # 결과 저장 (상태 저장소/샤드 사용 시 폴더별로 이미 저장됨)
+        if store:
+            output_file = str(store.db_path)
+        elif shard_dir_for(RESULTS_FILE).is_dir():
+            output_file = str(shard_dir_for(RESULTS_FILE))
+        else:
+            output_file = str(RESULTS_FILE)
+            save_state(output_file, all_results)
         
         # 요약 출력
         print(f"\n🎉 처리 완료!")
@@ -458,6 +897,7 @@ def main():
                 print(f"  📂 {folder_name}: {len(results)}개 파일 (고신뢰도: {high_confidence}개)")
         
         print(f"💾 결과 저장: {output_file}")
+        extractor.print_rule_stats()
         
         # 샘플 결과 출력 (새로 처리된 폴더만)
         if new_folders:
@@ -475,6 +915,9 @@ def main():
         
     except Exception as e:
         print(f"❌ 오류 발생: {str(e)}")
+    finally:
+        if cache:
+            cache.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -5,7 +5,12 @@ import random
 from modules.config_manager import ConfigManager
 from modules.smart_file_manager import SmartFileManager
 from modules.web_automator import WebAutomator
+from modules.simulated_automator import SimulatedAutomator
 from modules.account_manager import AccountManager, MultiAccountUploadTracker
+from modules.state_store import open_state_store
+from modules.fingerprint_index import FingerprintIndex
+from modules.failure_ledger import FailureLedger
+from modules.upload_confirmer import UploadConfirmer
 from modules.logger import setup_logger
 
 
@@ -28,15 +33,171 @@ def generate_dynamic_description(artist: str, title: str) -> str:
     return description
 
 
-def main(account_range=None):
+class AccountSpecificTracker:
+    """WebAutomator가 호출하는 mark_as_uploaded(filename, ...)를 계정별 트래커 기록으로 연결"""
+    
+    def __init__(self, tracker, email, content_hash=None):
+        self.tracker = tracker
+        self.email = email
+        self.content_hash = content_hash
+    
+    def mark_as_uploaded(self, filename, artist="", title=""):
+        self.tracker.mark_as_uploaded(self.email, filename, artist, title, content_hash=self.content_hash)
+
+
+def upload_single_video(automator, tracker, failure_ledger, logger, email, video_path, artist, title, content_hash=None,
+                        confirmer=None, fetch_posts=None) -> str:
+    """
+    파일 하나 업로드 (confirmer가 있으면 게시 확인은 백그라운드에서 진행)
+    Returns: 'uploaded', 'failed', 'restart' (브라우저 재시작이 필요한 심각한 에러)
+    """
+    logger.info(f'📤 Processing {video_path.name}')
+    logger.info(f'🎵 Smart extracted - Artist: {artist}, Title: {title}')
+    
+    # 동적 설명 생성
+    display_artist = artist if artist and artist.lower() != 'null' else title
+    description = generate_dynamic_description(display_artist, title)
+    logger.info(f'📝 Generated description: {description}')
+    
+    # 업로드 실행
+    if artist and artist.lower() != 'null':
+        upload_artist = artist
+        upload_title = title
+    else:
+        upload_artist = ""
+        upload_title = title
+    
+    account_tracker = AccountSpecificTracker(tracker, email, content_hash)
+    try:
+        success = automator.upload_video(video_path, upload_artist, upload_title, description, account_tracker)
+    except Exception as e:
+        logger.error(f'❌ Upload error for {video_path.name}: {str(e)}')
+        # 업로드된 것으로 표시하지 않고 실패 기록에 남겨 재시도 가능 여부 판단
+        failure_ledger.record_failure(email, video_path, upload_artist, upload_title, reason=str(e),
+                                      step=getattr(automator, 'current_step', None), error_type=type(e).__name__)
+        
+        # 심각한 에러인 경우 재시작 (브라우저 크래시 등)
+        if "timeout" in str(e).lower() or "session" in str(e).lower() or "connection" in str(e).lower():
+            logger.error(f'🔄 Critical error detected - triggering restart: {str(e)}')
+            return 'restart'
+        return 'failed'
+    
+    if success:
+        failure_ledger.clear(email, video_path.name)
+        if confirmer and fetch_posts:
+            confirmer.watch(email, video_path, upload_artist, upload_title, description, fetch_posts)
+        return 'uploaded'
+    
+    logger.error(f'❌ Failed to upload {video_path.name} for {email}')
+    failure = getattr(automator, 'last_failure', None) or {}
+    failure_ledger.record_failure(email, video_path, upload_artist, upload_title,
+                                  reason=failure.get('reason', 'upload_video returned False'),
+                                  step=failure.get('step'), error_type=failure.get('error_type'))
+    logger.warning(f'🔄 Upload failed - but continuing with next file')
+    return 'failed'
+
+
+def retry_failed_uploads(automator, tracker, failure_ledger, account_manager, account_mappings, logger,
+                         max_uploads_per_account, delay, logout_delay, confirmer=None, fingerprint_index=None) -> bool:
+    """
+    재시도 가능한 실패(일시적 실패, 시도 횟수 남음)를 계정별로 묶어 한 번의 로그인으로 다시 업로드
+    fingerprint_index가 있으면 재시도 파일도 내용 해시를 기록하고 이미 올린 내용은 중복으로 건너뜀
+    Returns: False면 브라우저 재시작 필요
+    """
+    emails = [mapping['email'] for mapping in account_mappings]
+    eligible = failure_ledger.eligible_failures(emails)
+    if not eligible:
+        logger.info("🔁 No retry-eligible failures")
+        return True
+    
+    logger.info(f"🔁 Retrying {len(eligible)} failed uploads across {len({email for email, _, _ in eligible})} accounts")
+    by_email = {}
+    for email, filename, entry in eligible:
+        by_email.setdefault(email, []).append((filename, entry))
+    
+    for email, failures in by_email.items():
+        if account_manager.get_uploaded_count(email) >= max_uploads_per_account:
+            continue
+        mapping = account_manager.get_account_info(email)
+        try:
+            automator.login_with_account(email, mapping['password'])
+        except Exception as e:
+            logger.error(f"❌ Login failed for {email} during retry pass: {str(e)}")
+            automator.dump_flight_recorder('login_failed')
+            return False
+        fetch_posts = automator.post_list_fetcher() if confirmer else None
+        content_hashes = fingerprint_index.fingerprints([Path(entry['path']) for _, entry in failures]) \
+            if fingerprint_index else {}
+        
+        recovered = 0
+        for filename, entry in failures:
+            if account_manager.get_uploaded_count(email) >= max_uploads_per_account:
+                break
+            video_path = Path(entry['path'])
+            if not video_path.exists():
+                failure_ledger.record_failure(email, video_path, entry.get('artist', ''), entry.get('title', ''),
+                                              reason=f'File not found: {video_path}', step=None,
+                                              error_type='FileNotFoundError')
+                continue
+            if tracker.is_uploaded(email, filename):
+                failure_ledger.clear(email, filename)
+                continue
+            content_hash = content_hashes.get(video_path)
+            if tracker.is_content_uploaded(email, content_hash):
+                logger.info(f'⏭️ Skipping duplicate content for {email}: {filename}')
+                tracker.mark_as_uploaded(email, filename, entry.get('artist', ''), entry.get('title', ''),
+                                         status='duplicate', content_hash=content_hash)
+                failure_ledger.clear(email, filename)
+                continue
+            
+            logger.info(f"🔁 Retry {entry.get('attempts', 0) + 1}/{failure_ledger.max_attempts} for {filename} "
+                        f"(last failure at step {entry.get('step')}: {entry.get('reason')})")
+            result = upload_single_video(automator, tracker, failure_ledger, logger, email, video_path,
+                                         entry.get('artist', ''), entry.get('title', ''), content_hash,
+                                         confirmer=confirmer, fetch_posts=fetch_posts)
+            if result == 'uploaded':
+                recovered += 1
+                account_manager.increment_uploaded_count(email)
+            elif result == 'restart':
+                return False
+            sleep(delay)
+        
+        if confirmer:
+            confirmer.drain(email)
+        account_manager.flush()
+        logger.info(f"🔁 Retry pass for {email}: {recovered}/{len(failures)} recovered")
+        automator.logout()
+        sleep(logout_delay)
+    
+    return True
+
+
+def main(account_range=None, simulate=False, retry_failed_only=False):
     config = ConfigManager()
     logger = setup_logger('main', config.get('general', 'log_level', 'INFO'))
-    smart_file_manager = SmartFileManager(config)
-    automator = WebAutomator(config)
-    account_manager = AccountManager()
-    tracker = MultiAccountUploadTracker()
+    # general.state_backend가 'sqlite'이면 JSON 파일 대신 하나의 SQLite DB 사용
+    store = open_state_store(config)
+    smart_file_manager = SmartFileManager(config, store)
+    # simulate=True이면 브라우저 없이 오케스트레이션 비용만 측정
+    automator = SimulatedAutomator(config) if simulate else WebAutomator(config)
+    tracker = MultiAccountUploadTracker(store)
+    # 계정별 업로드 수는 업로드 기록(tracker)에서 계산
+    account_manager = AccountManager(store, tracker)
+    # 실패는 업로드 기록과 분리하여 원인/단계/시도 횟수를 남기고 일시적 실패만 재시도
+    failure_ledger = FailureLedger(store, config.get('general', 'max_upload_attempts', 3))
 
     delay = config.get('general', 'upload_delay_seconds', 5)
+    logout_delay = config.get('general', 'logout_delay_seconds', 2)
+    # 같은 내용의 파일(예: "xxx.mp4"와 "xxx (1).mp4")은 계정당 한 번만 업로드
+    fingerprint_index = FingerprintIndex() if config.get('general', 'content_dedup', True) else None
+    # 업로드 후 게시물 생성 여부를 백그라운드에서 확인 (메인 루프는 기다리지 않고 다음 파일 진행)
+    confirmer = None
+    if config.get('general', 'confirm_uploads', False):
+        # 확인되지 않은 업로드를 실패로 돌리는 것은 게시물 목록 출처가 실제 사이트에서 검증된 경우(또는 시뮬레이터)만
+        confirmer = UploadConfirmer(tracker, failure_ledger,
+                                    poll_interval=config.get('general', 'confirm_poll_seconds', 3),
+                                    timeout=config.get('general', 'confirm_timeout_seconds', 60),
+                                    allow_failed=simulate or config.get('web_automation', 'posts_source_verified', False))
     max_uploads_per_account = 50  # 계정당 최대 업로드 개수
 
     # 계정 매핑 정보 가져오기 (50개 제한 적용)
@@ -52,8 +213,8 @@ def main(account_range=None):
     logger.info(f"🔢 Maximum uploads per account: {max_uploads_per_account}")
 
     try:
-        # 각 계정별로 순차 처리
-        for mapping in account_mappings:
+        # 각 계정별로 순차 처리 (retry_failed_only이면 재시도 단계만 실행)
+        for mapping in ([] if retry_failed_only else account_mappings):
             email = mapping['email']
             password = mapping['password']
             folder = mapping['folder']
@@ -72,10 +233,12 @@ def main(account_range=None):
                 automator.login_with_account(email, password)
             except Exception as e:
                 logger.error(f"❌ Login failed for {email}: {str(e)}")
+                automator.dump_flight_recorder('login_failed')
                 # 로그인 실패 시에도 즉시 재시작 트리거
                 logger.error(f'🔄 Login failed - triggering restart to retry with fresh browser session')
                 automator.close()
                 return False
+            fetch_posts = automator.post_list_fetcher() if confirmer else None
             
             # 2. 해당 폴더의 비디오 파일들 가져오기 (high confidence만)
             folder_videos = smart_file_manager.get_folder_videos(folder)
@@ -88,7 +251,18 @@ def main(account_range=None):
                 continue
             
             uploaded_count = 0
-            current_account_uploads = mapping.get('uploaded_count', 0)
+            current_account_uploads = account_manager.get_uploaded_count(email)
+            content_hashes = {}
+            if fingerprint_index:
+                # 해시 없이 남은 기존 업로드 기록을 먼저 채움 (계정당 한 번 - 이후 "X (1).mp4" 같은 사본도 중복으로 인식)
+                legacy = set(tracker.missing_content_hashes(email))
+                legacy_paths = [v[0] for v in folder_videos if v[0].name in legacy]
+                if legacy_paths:
+                    backfill = fingerprint_index.fingerprints(legacy_paths)
+                    tracker.backfill_content_hashes(email, {path.name: h for path, h in backfill.items()})
+                # 아직 업로드 대상인 파일만 해시 (변경되지 않은 파일은 캐시 사용)
+                candidates = [v[0] for v in folder_videos if not tracker.is_uploaded(email, v[0].name)]
+                content_hashes = fingerprint_index.fingerprints(candidates)
             
             # 3. 폴더 내 비디오들 업로드 (계정당 최대 50개 제한)
             for video_path, artist, title, final_format in folder_videos:
@@ -101,81 +275,60 @@ def main(account_range=None):
                     logger.info(f'⏭️ Skipping already uploaded file for {email}: {video_path.name}')
                     continue
                 
+                # 같은 내용의 파일이 이미 업로드되었으면 건너뛰기
+                content_hash = content_hashes.get(video_path)
+                if tracker.is_content_uploaded(email, content_hash):
+                    logger.info(f'⏭️ Skipping duplicate content for {email}: {video_path.name}')
+                    tracker.mark_as_uploaded(email, video_path.name, artist or "", title or "",
+                                             status='duplicate', content_hash=content_hash)
+                    continue
+                
+                # 이전 실행에서 실패한 파일은 실행 끝의 재시도 단계에서만 처리
+                if failure_ledger.has_failure(email, video_path.name):
+                    logger.info(f'⏭️ Deferring previously failed file to retry pass: {video_path.name}')
+                    continue
+                
                 # title이 없으면 건너뛰기
                 if not title:
                     logger.warning(f'⚠️ Skipping file with no title: {video_path.name}')
                     continue
-                    
-                logger.info(f'📤 Processing {video_path.name}')
-                logger.info(f'🎵 Smart extracted - Artist: {artist}, Title: {title}')
-                
-                # 동적 설명 생성
-                display_artist = artist if artist and artist.lower() != 'null' else title
-                description = generate_dynamic_description(display_artist, title)
-                logger.info(f'📝 Generated description: {description}')
-                
-                # 업로드 실행
-                if artist and artist.lower() != 'null':
-                    upload_artist = artist
-                    upload_title = title
-                else:
-                    upload_artist = ""
-                    upload_title = title
-                
-                # MultiAccountUploadTracker를 사용하여 업로드
-                class AccountSpecificTracker:
-                    def __init__(self, tracker, email):
-                        self.tracker = tracker
-                        self.email = email
-                    
-                    def mark_as_uploaded(self, filename, artist="", title=""):
-                        self.tracker.mark_as_uploaded(self.email, filename, artist, title)
                 
-                account_tracker = AccountSpecificTracker(tracker, email)
-                try:
-                    success = automator.upload_video(video_path, upload_artist, upload_title, description, account_tracker)
-                    
-                    if success:
-                        uploaded_count += 1
-                        current_account_uploads += 1
-                        # 즉시 accounts.json의 uploaded_count 증가
-                        account_manager.increment_uploaded_count(email)
-                        logger.info(f'✅ Successfully uploaded {video_path.name} for {email} (total: {current_account_uploads})')
-                    else:
-                        logger.error(f'❌ Failed to upload {video_path.name} for {email}')
-                        # 실패한 파일을 실패 기록에 추가하여 다음에 건너뛰도록 함
-                        tracker.mark_as_uploaded(email, video_path.name, upload_artist, upload_title)
-                        logger.info(f'⏭️ Marked failed file as processed to skip in future: {video_path.name}')
-                        
-                        # 업로드 실패가 연속으로 발생하면 재시작 트리거 (브라우저 문제일 가능성)
-                        logger.warning(f'🔄 Upload failed - but continuing with next file')
-                        
-                except Exception as e:
-                    logger.error(f'❌ Upload error for {video_path.name}: {str(e)}')
-                    # Exception 발생한 파일도 실패 기록에 추가하여 다음에 건너뛰도록 함
-                    tracker.mark_as_uploaded(email, video_path.name, upload_artist, upload_title)
-                    logger.info(f'⏭️ Marked error file as processed to skip in future: {video_path.name}')
-                    
-                    # 심각한 에러인 경우 재시작 (브라우저 크래시 등)
-                    if "timeout" in str(e).lower() or "session" in str(e).lower() or "connection" in str(e).lower():
-                        logger.error(f'🔄 Critical error detected - triggering restart: {str(e)}')
-                        automator.close()
-                        return False
+                result = upload_single_video(automator, tracker, failure_ledger, logger, email,
+                                             video_path, artist, title, content_hashes.get(video_path),
+                                             confirmer, fetch_posts)
+                if confirmer:
+                    confirmer.apply_results()
+                if result == 'uploaded':
+                    uploaded_count += 1
+                    # 메모리 카운터만 갱신 (accounts.json은 계정 처리 후 한 번 저장)
+                    current_account_uploads = account_manager.increment_uploaded_count(email)
+                    logger.info(f'✅ Successfully uploaded {video_path.name} for {email} (total: {current_account_uploads})')
+                elif result == 'restart':
+                    return False
                     
                 sleep(delay)
             
-            # 4. 계정별 업로드 카운트 업데이트
-            final_count = mapping.get('uploaded_count', 0) + uploaded_count
-            account_manager.update_uploaded_count(email, final_count)
+            # 4. 계정별 업로드 카운트 저장 (업로드 기록 기준 값)
+            # 로그아웃하면 세션이 끊기므로 이 계정의 게시 확인이 끝날 때까지 대기
+            if confirmer:
+                confirmer.drain(email)
+            final_count = account_manager.get_uploaded_count(email)
+            account_manager.flush()
             logger.info(f"📊 Account {email} completed: {uploaded_count} new files uploaded (total: {final_count}/{max_uploads_per_account})")
             
             # 5. 로그아웃
             logger.info(f"🚪 Logging out from {email}")
             automator.logout()
-            sleep(2)  # 로그아웃 완료 대기
+            sleep(logout_delay)  # 로그아웃 완료 대기
             
             logger.info(f"✅ Account {email} processing completed\n")
         
+        # 6. 일시적 실패 일괄 재시도
+        if retry_failed_only or config.get('general', 'retry_failed_at_end', True):
+            if not retry_failed_uploads(automator, tracker, failure_ledger, account_manager, account_mappings, logger,
+                                        max_uploads_per_account, delay, logout_delay, confirmer, fingerprint_index):
+                return False
+        
         logger.info("🎉 All accounts processed successfully!")
         
     except Exception as e:
@@ -184,6 +337,13 @@ def main(account_range=None):
     finally:
         logger.info("🔚 Closing browser")
         automator.close()
+        if confirmer:
+            confirmer.close()
+        account_manager.flush()
+        tracker.close()
+        failure_ledger.close()
+        if store:
+            store.close()
     
     return True
 
@@ -194,9 +354,11 @@ if __name__ == '__main__':
     
     parser = argparse.ArgumentParser(description='Multi-account upload automation')
     parser.add_argument('--account-range', type=str, help='Account ID range (e.g., "1-10")')
+    parser.add_argument('--simulate', action='store_true', help='Use the simulated automator (no browser)')
+    parser.add_argument('--retry-failed', action='store_true', help='Only retry previously failed uploads that are still eligible')
     args = parser.parse_args()
     
-    success = main(args.account_range)
+    success = main(args.account_range, simulate=args.simulate, retry_failed_only=args.retry_failed)
     if success:
         sys.exit(0)  # 성공
     else:
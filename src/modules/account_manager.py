@@ -1,35 +1,53 @@
-import json
+import atexit
+from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+from .extraction_index import ExtractionIndex, load_extraction_index
+from .file_lock import FileLock
 from .logger import setup_logger
+from .state_codec import load_state, save_state
+from .state_store import StateStore
+from .upload_journal import UploadJournal
 
 
 class AccountManager:
     """계정별 업로드 관리 클래스"""
     
-    def __init__(self):
+    def __init__(self, store: Optional[StateStore] = None, tracker: Optional['MultiAccountUploadTracker'] = None):
         self.logger = setup_logger(self.__class__.__name__, 'INFO')
         self.accounts_file = Path("accounts.json")
+        # store가 주어지면 accounts.json 대신 SQLite 상태 저장소 사용
+        self.store = store
+        # tracker가 주어지면 uploaded_count는 업로드 기록에서 계산 (accounts.json 값은 캐시)
+        self.tracker = tracker
         self.accounts_data = self._load_accounts()
+        # 변경된 카운트는 메모리에만 반영하고 flush() 시 한 번에 저장
+        self._dirty_emails = set()
+        atexit.register(self.flush)
         
     def _load_accounts(self) -> Dict:
         """accounts.json 파일 로드"""
+        if self.store:
+            data = self.store.load_accounts()
+            self.logger.info(f"Loaded {len(data.get('mappings', []))} account mappings from state store")
+            return data
+        
         if not self.accounts_file.exists():
             self.logger.error("accounts.json 파일을 찾을 수 없습니다.")
             return {}
         
         try:
-            with self.accounts_file.open('r', encoding='utf-8') as f:
-                data = json.load(f)
-                self.logger.info(f"Loaded {len(data.get('mappings', []))} account mappings")
-                return data
+            with FileLock(self.accounts_file):
+                data = load_state(self.accounts_file, {})
+            self.logger.info(f"Loaded {len(data.get('mappings', []))} account mappings")
+            return data
         except Exception as e:
             self.logger.error(f"Failed to load accounts.json: {str(e)}")
             return {}
     
-    def get_account_mappings(self, max_uploads_per_account=50, account_range=None) -> List[Dict]:
-        """폴더가 매핑되고 업로드가 완료되지 않은 계정 목록만 반환"""
+    def get_mappings_in_range(self, account_range=None) -> List[Dict]:
+        """계정 범위(예: "1-10")에 해당하는 매핑 반환 (범위가 없으면 전체)"""
         mappings = self.accounts_data.get('mappings', [])
         
         # account_range가 지정된 경우 범위 파싱 및 필터링
@@ -37,15 +55,20 @@ class AccountManager:
             start_id, end_id = self._parse_account_range(account_range)
             mappings = [m for m in mappings if start_id <= m.get('id', 0) <= end_id]
             self.logger.info(f"Filtering accounts by range {account_range}: {len(mappings)} accounts found")
+        return mappings
+    
+    def get_account_mappings(self, max_uploads_per_account=50, account_range=None) -> List[Dict]:
+        """폴더가 매핑되고 업로드가 완료되지 않은 계정 목록만 반환"""
+        mappings = self.get_mappings_in_range(account_range)
         
         valid_mappings = []
         
-        # smart_extraction_results.json 로드
-        extraction_results = self._load_smart_extraction_results()
+        # smart_extraction_results.json 인덱스 (SmartFileManager와 공유, 상태 저장소 사용 시 DB 조회로 대체)
+        extraction_index = None if self.store else self._load_extraction_index()
         
         for mapping in mappings:
             folder = mapping.get('folder')
-            uploaded_count = mapping.get('uploaded_count', 0)
+            uploaded_count = self._reconcile_uploaded_count(mapping)
             
             # 폴더가 매핑되지 않은 경우 제외
             if not folder:
@@ -58,7 +81,7 @@ class AccountManager:
                 continue
             
             # smart_extraction_results에서 해당 폴더의 high confidence 파일 개수 확인
-            high_confidence_count = self._get_high_confidence_count(extraction_results, folder)
+            high_confidence_count = self._get_high_confidence_count(extraction_index, folder)
             
             # 업로드된 개수가 high confidence 개수보다 같거나 많으면 제외
             if uploaded_count >= high_confidence_count:
@@ -91,72 +114,108 @@ class AccountManager:
             self.logger.error(f"Invalid account range format '{range_str}': {str(e)}")
             return 1, 30  # 기본값으로 전체 범위 반환
     
-    def _load_smart_extraction_results(self) -> Dict:
-        """smart_extraction_results.json 로드"""
-        results_file = Path("smart_extraction_results.json")
-        
-        if not results_file.exists():
-            self.logger.warning("smart_extraction_results.json not found")
-            return {}
-        
+    def _load_extraction_index(self) -> Optional[ExtractionIndex]:
+        """smart_extraction_results.json 인덱스 로드"""
         try:
-            with results_file.open('r', encoding='utf-8') as f:
-                return json.load(f)
+            index = load_extraction_index()
+            if index is None:
+                self.logger.warning("smart_extraction_results.json not found")
+            return index
         except Exception as e:
             self.logger.error(f"Failed to load smart_extraction_results.json: {str(e)}")
-            return {}
+            return None
     
-    def _get_high_confidence_count(self, extraction_results: Dict, folder_name: str) -> int:
+    def _get_high_confidence_count(self, extraction_index: Optional[ExtractionIndex], folder_name: str) -> int:
         """특정 폴더의 high confidence 파일 개수 반환"""
-        if folder_name not in extraction_results:
+        if self.store:
+            high_confidence_count = self.store.high_confidence_count(folder_name)
+            if not high_confidence_count and not self.store.has_folder(folder_name):
+                self.logger.warning(f"Folder '{folder_name}' not found in extraction results")
+            return high_confidence_count
+        
+        if not extraction_index or not extraction_index.has_folder(folder_name):
             self.logger.warning(f"Folder '{folder_name}' not found in extraction results")
             return 0
         
-        folder_data = extraction_results[folder_name]
-        high_confidence_count = sum(1 for item in folder_data if item.get('confidence') == 'high')
+        high_confidence_count = extraction_index.high_confidence_count(folder_name)
         
         self.logger.debug(f"Folder '{folder_name}': {high_confidence_count} high confidence files")
         return high_confidence_count
     
-    def update_uploaded_count(self, email: str, count: int):
-        """특정 계정의 업로드 카운트 업데이트"""
-        mappings = self.accounts_data.get('mappings', [])
+    def _reconcile_uploaded_count(self, mapping: Dict) -> int:
+        """저장된 uploaded_count를 업로드 기록 기준 값으로 맞춤"""
+        stored_count = mapping.get('uploaded_count', 0)
+        if not self.tracker:
+            return stored_count
         
-        for mapping in mappings:
-            if mapping.get('email') == email:
-                mapping['uploaded_count'] = count
-                break
+        derived_count = self.tracker.get_uploaded_count(mapping.get('email'))
+        if derived_count != stored_count:
+            self.logger.info(f"Reconciled upload count for {mapping.get('email')}: {stored_count} → {derived_count} (from upload ledger)")
+            mapping['uploaded_count'] = derived_count
+            self._dirty_emails.add(mapping.get('email'))
+        return derived_count
+    
+    def get_uploaded_count(self, email: str) -> int:
+        """특정 계정의 업로드 카운트 반환 (tracker가 있으면 업로드 기록 기준)"""
+        if self.tracker:
+            return self.tracker.get_uploaded_count(email)
+        account_info = self.get_account_info(email)
+        return account_info.get('uploaded_count', 0) if account_info else 0
+    
+    def update_uploaded_count(self, email: str, count: int):
+        """특정 계정의 업로드 카운트 업데이트 (저장은 flush() 시)"""
+        account_info = self.get_account_info(email)
+        if not account_info:
+            self.logger.warning(f"Account {email} not found for count update")
+            return
         
-        # 파일 저장
-        try:
-            with self.accounts_file.open('w', encoding='utf-8') as f:
-                json.dump(self.accounts_data, f, ensure_ascii=False, indent=2)
-            self.logger.info(f"Updated upload count for {email}: {count}")
-        except Exception as e:
-            self.logger.error(f"Failed to update accounts.json: {str(e)}")
+        if account_info.get('uploaded_count') != count:
+            account_info['uploaded_count'] = count
+            self._dirty_emails.add(email)
+        self.logger.info(f"Updated upload count for {email}: {count}")
     
     def increment_uploaded_count(self, email: str):
-        """특정 계정의 업로드 카운트를 1 증가"""
-        mappings = self.accounts_data.get('mappings', [])
+        """특정 계정의 업로드 카운트를 1 증가 (tracker가 있으면 업로드 기록에서 다시 계산)"""
+        account_info = self.get_account_info(email)
+        if not account_info:
+            self.logger.warning(f"Account {email} not found for count increment")
+            return 0
         
-        for mapping in mappings:
-            if mapping.get('email') == email:
-                current_count = mapping.get('uploaded_count', 0)
-                new_count = current_count + 1
-                mapping['uploaded_count'] = new_count
+        current_count = account_info.get('uploaded_count', 0)
+        new_count = self.tracker.get_uploaded_count(email) if self.tracker else current_count + 1
+        account_info['uploaded_count'] = new_count
+        self._dirty_emails.add(email)
+        self.logger.info(f"✅ Incremented upload count for {email}: {current_count} → {new_count}")
+        return new_count
+    
+    def flush(self):
+        """변경된 업로드 카운트 저장 (accounts.json은 임시 파일 + rename으로 원자적 교체)"""
+        if not self._dirty_emails:
+            return
+        
+        if self.store:
+            for email in self._dirty_emails:
+                self.store.set_uploaded_count(email, self.get_account_info(email).get('uploaded_count', 0))
+            self.logger.info(f"Saved upload counts for {len(self._dirty_emails)} accounts")
+            self._dirty_emails.clear()
+            return
+        
+        try:
+            # 다른 계정 범위를 처리하는 프로세스의 변경을 덮어쓰지 않도록
+            # 잠금 안에서 파일을 다시 읽고 이 프로세스가 바꾼 계정만 반영
+            with FileLock(self.accounts_file):
+                disk_data = self.accounts_data
+                if self.accounts_file.exists():
+                    disk_data = load_state(self.accounts_file, {})
+                    for mapping in disk_data.get('mappings', []):
+                        if mapping.get('email') in self._dirty_emails:
+                            mapping['uploaded_count'] = self.get_account_info(mapping['email']).get('uploaded_count', 0)
                 
-                # 즉시 파일 저장
-                try:
-                    with self.accounts_file.open('w', encoding='utf-8') as f:
-                        json.dump(self.accounts_data, f, ensure_ascii=False, indent=2)
-                    self.logger.info(f"✅ Incremented upload count for {email}: {current_count} → {new_count}")
-                    return new_count
-                except Exception as e:
-                    self.logger.error(f"Failed to save incremented count for {email}: {str(e)}")
-                    return current_count
-        
-        self.logger.warning(f"Account {email} not found for count increment")
-        return 0
+                save_state(self.accounts_file, disk_data)
+            self.logger.info(f"Saved upload counts for {len(self._dirty_emails)} accounts to accounts.json")
+            self._dirty_emails.clear()
+        except Exception as e:
+            self.logger.error(f"Failed to update accounts.json: {str(e)}")
     
     def get_account_info(self, email: str) -> Optional[Dict]:
         """특정 이메일의 계정 정보 반환"""
@@ -170,63 +229,166 @@ class AccountManager:
 
 
 class MultiAccountUploadTracker:
-    """계정별 업로드 추적 클래스"""
+    """계정별 업로드 추적 클래스 (스냅샷 + 추가 전용 저널)"""
     
-    def __init__(self):
+    def __init__(self, store: Optional[StateStore] = None):
         self.logger = setup_logger(self.__class__.__name__, 'INFO')
         self.tracker_file = Path("logs/uploaded_files.json")
-        self.uploaded_data = self._load_uploaded_data()
+        self.journal = UploadJournal(self.tracker_file, Path("logs/uploaded_files.jsonl"))
+        # store가 주어지면 업로드 기록은 SQLite upload_events 테이블에서 인덱스 조회
+        self.store = store
+        self.uploaded_data = {} if store else self._load_uploaded_data()
+        # 계정별 성공 업로드 수와 업로드된 내용 해시 - 매번 세지 않도록 메모리에 유지
+        self._rebuild_indexes()
+        # 비정상 종료가 아니라면 종료 시 저널을 스냅샷으로 압축
+        atexit.register(self.close)
         
     def _load_uploaded_data(self) -> Dict:
-        """uploaded_files.json 로드"""
-        if not self.tracker_file.exists():
+        """uploaded_files.json 스냅샷 로드 후 저널 재생"""
+        if not self.tracker_file.exists() and not self.journal.journal_file.exists():
             self.logger.info("No uploaded files tracker found, starting fresh")
             return {}
         
         try:
-            with self.tracker_file.open('r', encoding='utf-8') as f:
-                data = json.load(f)
-                total_files = sum(len(files) for files in data.values())
-                self.logger.info(f"Loaded upload tracker with {total_files} files across {len(data)} accounts")
-                return data
+            data = self.journal.load()
+            total_files = sum(len(files) for files in data.values())
+            self.logger.info(f"Loaded upload tracker with {total_files} files across {len(data)} accounts")
+            return data
         except Exception as e:
             self.logger.error(f"Failed to load upload tracker: {str(e)}")
             return {}
     
+    def _rebuild_indexes(self):
+        self._upload_counts: Dict[str, int] = {}
+        self._content_hashes: Dict[str, set] = {}
+        for email, files in self.uploaded_data.items():
+            uploaded = [info for info in files.values() if info.get('status', 'uploaded') == 'uploaded']
+            self._upload_counts[email] = len(uploaded)
+            self._content_hashes[email] = {info['content_hash'] for info in uploaded if info.get('content_hash')}
+    
     def _save_uploaded_data(self):
-        """uploaded_files.json 저장"""
+        """uploaded_files.json 스냅샷 저장 (저널 압축, 다른 프로세스의 기록도 병합됨)"""
         try:
-            self.tracker_file.parent.mkdir(parents=True, exist_ok=True)
-            with self.tracker_file.open('w', encoding='utf-8') as f:
-                json.dump(self.uploaded_data, f, ensure_ascii=False, indent=2)
+            self.uploaded_data = self.journal.compact()
+            self._rebuild_indexes()
         except Exception as e:
             self.logger.error(f"Failed to save upload tracker: {str(e)}")
     
     def is_uploaded(self, email: str, filename: str) -> bool:
         """특정 계정에서 파일이 업로드되었는지 확인"""
-        account_files = self.uploaded_data.get(email, {})
-        return filename in account_files
+        if self.store:
+            return self.store.has_upload(email, filename)
+        info = self.uploaded_data.get(email, {}).get(filename)
+        # 이전 버전에서 status='failed'로 남긴 기록은 업로드되지 않은 것으로 보고 다시 시도
+        return info is not None and info.get('status') != 'failed'
     
-    def mark_as_uploaded(self, email: str, filename: str, artist: str = "", title: str = ""):
-        """특정 계정에서 파일을 업로드 완료로 표시"""
-        if email not in self.uploaded_data:
-            self.uploaded_data[email] = {}
+    def is_content_uploaded(self, email: str, content_hash: Optional[str]) -> bool:
+        """같은 내용(해시)의 파일이 이 계정에서 이미 업로드되었는지 확인"""
+        if not content_hash:
+            return False
+        if self.store:
+            return self.store.has_content(email, content_hash)
+        return content_hash in self._content_hashes.get(email, ())
+    
+    def mark_as_uploaded(self, email: str, filename: str, artist: str = "", title: str = "",
+                         status: str = "uploaded", content_hash: Optional[str] = None):
+        """특정 계정에서 파일을 처리 완료로 표시 (저널에 한 줄 추가)
         
-        from datetime import datetime
+        status가 'uploaded'가 아닌 기록(failed, duplicate)은 다시 시도하지 않도록 남기지만 업로드 개수에는 포함하지 않음
+        """
         upload_info = {
             "upload_date": datetime.now().isoformat(),
             "artist": artist,
-            "title": title
+            "title": title,
+            "status": status
         }
+        if content_hash:
+            upload_info["content_hash"] = content_hash
+        self._write_upload(email, filename, upload_info)
+        self.logger.info(f"Marked as {status} for {email}: {filename}")
+    
+    def update_upload(self, email: str, filename: str, **fields) -> bool:
+        """기존 업로드 기록에 필드 추가/변경 (예: 게시 확인 시각, status='failed')"""
+        info = self.get_uploaded_files(email).get(filename)
+        if info is None:
+            return False
+        self._write_upload(email, filename, {**info, **fields})
+        return True
+    
+    def missing_content_hashes(self, email: str) -> List[str]:
+        """content_hash 없이 남은 업로드 기록의 파일명 (내용 중복 검사 도입 전에 업로드된 파일)"""
+        return [filename for filename, info in self.get_uploaded_files(email).items()
+                if info.get('status', 'uploaded') == 'uploaded' and not info.get('content_hash')]
+    
+    def backfill_content_hashes(self, email: str, hashes: Dict[str, str]) -> int:
+        """기존 업로드 기록에 content_hash 채우기 {파일명: 해시} → 갱신한 기록 수"""
+        filled = 0
+        for filename, content_hash in hashes.items():
+            if content_hash and self.update_upload(email, filename, content_hash=content_hash):
+                filled += 1
+        if filled:
+            self.logger.info(f"Backfilled content hashes for {filled} uploads of {email}")
+        return filled
+    
+    def _write_upload(self, email: str, filename: str, upload_info: Dict):
+        if self.store:
+            self.store.record_upload(email, filename, upload_info)
+            return
         
-        self.uploaded_data[email][filename] = upload_info
-        self._save_uploaded_data()
-        self.logger.info(f"Marked as uploaded for {email}: {filename}")
+        account_files = self.uploaded_data.setdefault(email, {})
+        previous = account_files.get(filename)
+        if previous is not None and previous.get('status', 'uploaded') == 'uploaded':
+            self._upload_counts[email] -= 1
+            if previous.get('content_hash'):
+                self._content_hashes.get(email, set()).discard(previous['content_hash'])
+        if upload_info.get('status', 'uploaded') == 'uploaded':
+            self._upload_counts[email] = self._upload_counts.get(email, 0) + 1
+            if upload_info.get('content_hash'):
+                self._content_hashes.setdefault(email, set()).add(upload_info['content_hash'])
+        account_files[filename] = upload_info
+        try:
+            self.journal.append({"op": "upload", "email": email, "filename": filename, "info": upload_info})
+            if self.journal.should_compact():
+                self._save_uploaded_data()
+        except Exception as e:
+            self.logger.error(f"Failed to append to upload journal: {str(e)}")
+    
+    def remove_upload(self, email: str, filename: str) -> bool:
+        """업로드 기록 삭제 (다음 실행에서 다시 업로드 대상이 됨)"""
+        if self.store:
+            return self.store.remove_upload(email, filename)
+        
+        info = self.uploaded_data.get(email, {}).pop(filename, None)
+        if info is None:
+            return False
+        if info.get('status', 'uploaded') == 'uploaded':
+            self._upload_counts[email] -= 1
+            if info.get('content_hash'):
+                self._content_hashes.get(email, set()).discard(info['content_hash'])
+        try:
+            self.journal.append({"op": "remove", "email": email, "filename": filename})
+        except Exception as e:
+            self.logger.error(f"Failed to append to upload journal: {str(e)}")
+        self.logger.info(f"Removed upload record for {email}: {filename}")
+        return True
     
     def get_uploaded_count(self, email: str) -> int:
-        """특정 계정의 업로드된 파일 개수 반환"""
-        return len(self.uploaded_data.get(email, {}))
+        """특정 계정의 업로드된 파일 개수 반환 (실패/중복 기록 제외)"""
+        if self.store:
+            return self.store.upload_count(email)
+        return self._upload_counts.get(email, 0)
     
     def get_uploaded_files(self, email: str) -> Dict:
         """특정 계정의 업로드된 파일 목록 반환"""
-        return self.uploaded_data.get(email, {})
\ No newline at end of file
+        if self.store:
+            return self.store.get_uploads(email)
+        return self.uploaded_data.get(email, {})
+    
+    def close(self):
+        """저널 fsync 후 스냅샷으로 압축"""
+        if self.store:
+            return
+        try:
+            self.journal.close()
+        except Exception as e:
+            self.logger.error(f"Failed to close upload journal: {str(e)}")
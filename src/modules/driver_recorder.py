@@ -0,0 +1,114 @@
+import json
+import time
+from collections import Counter, deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .logger import setup_logger
+
+
+def _estimate_size(value: Any, depth: int = 0) -> int:
+    """응답 값의 대략적인 크기(문자 수) 추정 - json 직렬화 없이 빠르게 계산"""
+    if value is None or isinstance(value, bool):
+        return 0
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, (int, float)):
+        return 8
+    if depth > 3:
+        return 0
+    if isinstance(value, dict):
+        return sum(len(str(k)) + _estimate_size(v, depth + 1) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(_estimate_size(v, depth + 1) for v in value)
+    return 0
+
+
+class DriverFlightRecorder:
+    """WebDriver 명령마다 소요 시간과 응답 크기를 링 버퍼에 기록하는 플라이트 레코더"""
+
+    def __init__(self, driver, capacity: int = 2000, dump_dir: str = 'logs/flight_recorder'):
+        self.logger = setup_logger(self.__class__.__name__, 'INFO')
+        self.driver = driver
+        self.buffer = deque(maxlen=capacity)
+        self.dump_dir = Path(dump_dir)
+
+        self._span_label: Optional[str] = None
+        self._span_started = 0.0
+        self._span_commands = 0
+        self._span_driver_seconds = 0.0
+        self._span_counter: Counter = Counter()
+
+        # 모든 명령(WebElement 포함)은 driver.execute를 거치므로 인스턴스 메서드만 감싸면 됨
+        self._original_execute = driver.execute
+        driver.execute = self._execute
+
+    def _execute(self, driver_command: str, params: Optional[Dict] = None):
+        started = time.perf_counter()
+        response = None
+        error = None
+        try:
+            response = self._original_execute(driver_command, params)
+            return response
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            duration = time.perf_counter() - started
+            size = _estimate_size(response.get('value')) if isinstance(response, dict) else 0
+            self.buffer.append((time.time(), driver_command, duration, size, error))
+            if self._span_label is not None:
+                self._span_commands += 1
+                self._span_driver_seconds += duration
+                self._span_counter[driver_command] += 1
+
+    def start_span(self, label: str):
+        """업로드 단위 집계 시작"""
+        self._span_label = label
+        self._span_started = time.perf_counter()
+        self._span_commands = 0
+        self._span_driver_seconds = 0.0
+        self._span_counter = Counter()
+
+    def end_span(self) -> Dict:
+        """업로드 단위 집계 종료 후 요약 반환 (명령 수, 드라이버 시간, 그 외 대기/처리 시간)"""
+        wall = time.perf_counter() - self._span_started
+        summary = {
+            'label': self._span_label,
+            'commands': self._span_commands,
+            'driver_seconds': round(self._span_driver_seconds, 3),
+            'other_seconds': round(max(0.0, wall - self._span_driver_seconds), 3),
+            'wall_seconds': round(wall, 3),
+            'top_commands': self._span_counter.most_common(5),
+        }
+        self._span_label = None
+        return summary
+
+    def dump(self, reason: str = 'manual') -> Optional[Path]:
+        """링 버퍼 내용을 JSON 파일로 저장"""
+        try:
+            self.dump_dir.mkdir(parents=True, exist_ok=True)
+            stamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+            path = self.dump_dir / f'{stamp}_{reason}.json'
+            entries = [
+                {
+                    'time': datetime.fromtimestamp(ts).isoformat(),
+                    'command': command,
+                    'duration_ms': round(duration * 1000, 2),
+                    'result_size': size,
+                    'error': error,
+                }
+                for ts, command, duration, size, error in list(self.buffer)
+            ]
+            with path.open('w', encoding='utf-8') as f:
+                json.dump({'reason': reason, 'commands': entries}, f, ensure_ascii=False, indent=2)
+            self.logger.info(f'Flight recorder dumped {len(entries)} commands to {path}')
+            return path
+        except Exception as e:
+            self.logger.error(f'Failed to dump flight recorder: {str(e)}')
+            return None
+
+    def detach(self):
+        """원래 execute로 복구"""
+        self.driver.execute = self._original_execute
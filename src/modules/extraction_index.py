@@ -0,0 +1,96 @@
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .extraction_shards import RESULTS_FILE, load_extraction_results, results_stamp
+from .logger import setup_logger
+
+
+logger = setup_logger('ExtractionIndex', 'INFO')
+
+EXTRACTION_FILE = RESULTS_FILE
+
+# 같은 프로세스의 SmartFileManager/AccountManager가 하나의 인덱스를 공유 (경로 → (원본 stat, 인덱스))
+_shared: Dict[str, Tuple[Tuple, 'ExtractionIndex']] = {}
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class ExtractionRecord:
+    """추출 결과 1건 (dict 대신 __slots__ 객체, 반복되는 아티스트/제목 문자열은 intern)"""
+    __slots__ = ('filename', 'artist', 'title', 'confidence', 'final_format', 'song_id')
+
+    def __init__(self, filename: str, artist: Optional[str], title: Optional[str], confidence: str, final_format: str,
+                 song_id: Optional[str] = None):
+        self.filename = filename
+        self.artist = _intern(artist)
+        self.title = _intern(title)
+        self.confidence = _intern(confidence)
+        self.final_format = _intern(final_format)
+        # cluster_titles.py가 기록한 대표 곡 ID (철자가 다른 같은 곡은 같은 값, 없으면 None)
+        self.song_id = _intern(song_id)
+
+    @classmethod
+    def from_dict(cls, item: Dict) -> 'ExtractionRecord':
+        return cls(item.get('original_filename', ''), item.get('artist'), item.get('title'),
+                   item.get('confidence', ''), item.get('final_format', ''), item.get('song_id'))
+
+
+class ExtractionIndex:
+    """폴더별 추출 결과 인덱스 - high confidence 목록과 개수를 미리 계산"""
+
+    def __init__(self, results: Dict[str, Iterable[Dict]]):
+        self._records: Dict[str, Tuple[ExtractionRecord, ...]] = {}
+        self._high_confidence: Dict[str, Tuple[ExtractionRecord, ...]] = {}
+        for folder, items in results.items():
+            records = tuple(ExtractionRecord.from_dict(item) for item in items)
+            self._records[folder] = records
+            self._high_confidence[folder] = tuple(record for record in records if record.confidence == 'high')
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def folders(self) -> List[str]:
+        return list(self._records)
+
+    def has_folder(self, folder: str) -> bool:
+        return folder in self._records
+
+    def records(self, folder: str) -> Tuple[ExtractionRecord, ...]:
+        return self._records.get(folder, ())
+
+    def high_confidence(self, folder: str) -> Tuple[ExtractionRecord, ...]:
+        return self._high_confidence.get(folder, ())
+
+    def high_confidence_count(self, folder: str) -> int:
+        return len(self._high_confidence.get(folder, ()))
+
+
+def load_extraction_index(path: Path = EXTRACTION_FILE) -> Optional[ExtractionIndex]:
+    """추출 결과(단일 JSON 또는 폴더별 샤드)의 공유 인덱스 반환 (바뀌었을 때만 다시 생성, 결과가 없으면 None)"""
+    path = Path(path)
+    stamp = results_stamp(path)
+    if stamp is None:
+        return None
+
+    key = str(path.resolve())
+    cached = _shared.get(key)
+    if cached and cached[0] == stamp:
+        return cached[1]
+
+    index = ExtractionIndex(load_extraction_results(path))
+    _shared[key] = (stamp, index)
+    logger.info(f"Indexed extraction results for {len(index)} folders")
+    return index
+
+
+def list_files(folder_path: Path) -> Set[str]:
+    """폴더의 파일 이름 집합 (os.scandir 한 번으로 파일별 stat 대체, 폴더가 없으면 빈 집합)"""
+    try:
+        with os.scandir(folder_path) as entries:
+            return {entry.name for entry in entries if entry.is_file()}
+    except OSError:
+        return set()
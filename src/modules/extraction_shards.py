@@ -0,0 +1,209 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .file_lock import FileLock
+from .logger import setup_logger
+from .state_codec import load_state, save_state, snapshot_path
+
+
+logger = setup_logger('ExtractionShards', 'INFO')
+
+RESULTS_FILE = Path("smart_extraction_results.json")
+# 샤드로 옮긴 뒤 이전 단일 JSON 파일에 붙이는 접미사 (이전 스크립트가 오래된 내용을 읽지 않도록 이름을 바꿔 둠)
+MIGRATED_SUFFIX = '.migrated'
+
+_UNSAFE = re.compile(r'[^\w.-]+')
+
+
+def shard_dir_for(path: Path = RESULTS_FILE) -> Path:
+    """smart_extraction_results.json → smart_extraction_results.d"""
+    path = Path(path)
+    return path.with_name(path.stem + '.d')
+
+
+class ExtractionShards:
+    """폴더별 추출 결과 샤드 디렉토리 - 폴더 하나를 저장할 때 그 폴더의 파일만 원자적으로 교체
+
+    샤드 파일: <폴더명 정리>-<해시>.json = {"folder": 폴더명, "results": [...]}
+    임시 파일(.tmp)과 잠금 파일(.lock)은 읽을 때 무시합니다.
+    """
+
+    def __init__(self, shard_dir: Path):
+        self.shard_dir = Path(shard_dir)
+
+    def exists(self) -> bool:
+        return self.shard_dir.is_dir()
+
+    def shard_path(self, folder: str) -> Path:
+        digest = hashlib.sha1(folder.encode('utf-8')).hexdigest()[:10]
+        return self.shard_dir / f"{_UNSAFE.sub('_', folder)[:80]}-{digest}.json"
+
+    def stamp(self) -> Optional[Tuple[int, int]]:
+        """디렉토리 변경 표시 (샤드 추가/교체/삭제는 모두 디렉토리 항목 변경이므로 mtime이 바뀜)"""
+        try:
+            stat = self.shard_dir.stat()
+        except OSError:
+            return None
+        return stat.st_nlink, stat.st_mtime_ns
+
+    def _shard_files(self) -> List[Path]:
+        with os.scandir(self.shard_dir) as entries:
+            return [Path(entry.path) for entry in entries
+                    if entry.name.endswith('.json') and not entry.name.startswith('.') and entry.is_file()]
+
+    def load_all(self) -> Dict[str, List[Dict]]:
+        """모든 샤드를 합친 결과 (폴더명 순)"""
+        merged = {}
+        for shard_file in self._shard_files():
+            try:
+                with shard_file.open('rb') as f:
+                    shard = json.loads(f.read())
+                merged[shard['folder']] = shard['results']
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.error(f"Skipping unreadable extraction shard {shard_file}: {str(e)}")
+        return dict(sorted(merged.items()))
+
+    def load_folder(self, folder: str) -> Optional[List[Dict]]:
+        shard_file = self.shard_path(folder)
+        if not shard_file.exists():
+            return None
+        with shard_file.open('rb') as f:
+            return json.loads(f.read())['results']
+
+    def write_folder(self, folder: str, records: List[Dict]):
+        """폴더 1개 샤드를 임시 파일에 쓴 뒤 rename으로 교체 (중간에 죽어도 이전 샤드가 그대로 남음)"""
+        self.shard_dir.mkdir(parents=True, exist_ok=True)
+        target = self.shard_path(folder)
+        tmp_file = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        with tmp_file.open('w', encoding='utf-8') as f:
+            json.dump({'folder': folder, 'results': records}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, target)
+
+    def update_folder(self, folder: str, update: Callable[[str, List[Dict]], bool]) -> bool:
+        """폴더 1개 샤드를 그 샤드의 잠금 안에서 다시 읽어 update(폴더명, 레코드)로 제자리 수정
+        update가 True를 반환할 때만 저장 → 저장했는지 여부 (샤드가 없으면 update를 호출하지 않고 False)"""
+        with FileLock(self.shard_path(folder)):
+            records = self.load_folder(folder)
+            if records is None or not update(folder, records):
+                return False
+            self.write_folder(folder, records)
+            return True
+
+    def remove_folder(self, folder: str) -> bool:
+        try:
+            self.shard_path(folder).unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+    def import_results(self, results: Dict[str, List[Dict]]):
+        for folder, records in results.items():
+            self.write_folder(folder, records)
+
+
+def load_extraction_results(path: Path = RESULTS_FILE, default=None, use_cache: bool = False) -> Dict[str, List[Dict]]:
+    """추출 결과 전체 (호환 로더) - 샤드 디렉토리가 있으면 샤드를 합쳐서, 없으면 단일 JSON 파일에서 읽음"""
+    shards = ExtractionShards(shard_dir_for(path))
+    if shards.exists():
+        return shards.load_all()
+    return load_state(path, {} if default is None else default, use_cache=use_cache)
+
+
+def results_exist(path: Path = RESULTS_FILE) -> bool:
+    return shard_dir_for(path).is_dir() or Path(path).exists()
+
+
+def results_stamp(path: Path = RESULTS_FILE) -> Optional[Tuple]:
+    """추출 결과가 바뀌었는지 판단하는 값 (없으면 None)"""
+    shards = ExtractionShards(shard_dir_for(path))
+    if shards.exists():
+        return ('shards',) + shards.stamp()
+    try:
+        stat = Path(path).stat()
+    except OSError:
+        return None
+    return ('json', stat.st_size, stat.st_mtime_ns)
+
+
+def _use_shards(path: Path, sharded: bool) -> Optional[ExtractionShards]:
+    """샤드에 쓸지 결정 - 이미 샤드 디렉토리가 있거나 sharded 설정이면 샤드 사용 (처음이면 기존 JSON을 샤드로 옮김)"""
+    shards = ExtractionShards(shard_dir_for(path))
+    if shards.exists():
+        return shards
+    if not sharded:
+        return None
+    # JSON 파일 잠금을 이미 쥔 호출자(SmartFileManager 등)와 교착되지 않도록 샤드 디렉토리용 잠금 사용
+    with FileLock(shards.shard_dir):
+        if not shards.exists():
+            legacy = load_state(path, {})
+            staging = ExtractionShards(shards.shard_dir.with_name(shards.shard_dir.name + '.tmp'))
+            # 이전에 중간에 멈춘 분할 작업이 남긴 디렉토리는 버리고 다시 분할
+            shutil.rmtree(staging.shard_dir, ignore_errors=True)
+            staging.import_results(legacy)
+            staging.shard_dir.mkdir(parents=True, exist_ok=True)
+            os.replace(staging.shard_dir, shards.shard_dir)
+            _retire_legacy_file(Path(path))
+            if legacy:
+                logger.info(f"Split {path} into {len(legacy)} folder shards in {shards.shard_dir} "
+                            f"(kept as {path}{MIGRATED_SUFFIX})")
+    return shards
+
+
+def _retire_legacy_file(path: Path):
+    """샤드로 옮긴 단일 JSON 파일은 <이름>.migrated로 바꾸고 스냅샷은 삭제 (직접 JSON을 읽는 도구가 오래된 결과를 쓰지 않도록)"""
+    if path.exists():
+        os.replace(path, path.with_name(path.name + MIGRATED_SUFFIX))
+    try:
+        snapshot_path(path).unlink()
+    except FileNotFoundError:
+        pass
+
+
+def save_extraction_folder(folder: str, records: List[Dict], all_results: Dict[str, List[Dict]],
+                           path: Path = RESULTS_FILE, sharded: bool = True):
+    """폴더 1개 저장 - 샤드 모드면 그 폴더의 샤드만, 아니면 전체 JSON(all_results)을 다시 씀"""
+    shards = _use_shards(path, sharded)
+    if shards:
+        shards.write_folder(folder, records)
+    else:
+        save_state(path, all_results)
+
+
+def update_extraction_folders(folders: List[str], update: Callable[[str, List[Dict]], bool],
+                              path: Path = RESULTS_FILE, sharded: bool = True) -> List[str]:
+    """여러 폴더의 추출 결과를 잠금 안에서 다시 읽어 update(폴더명, 레코드)로 수정 → 저장한 폴더 목록
+
+    샤드 모드: 폴더마다 그 샤드의 잠금 (SmartFileManager.remove_failed_file과 같은 잠금)
+    단일 JSON: 파일 전체를 잠그고 한 번에 저장
+    """
+    shards = _use_shards(path, sharded)
+    if shards:
+        return [folder for folder in folders if shards.update_folder(folder, update)]
+    with FileLock(path):
+        results = load_state(path, {})
+        changed = [folder for folder in folders if folder in results and update(folder, results[folder])]
+        if changed:
+            save_state(path, results)
+    return changed
+
+
+def save_extraction_results(results: Dict[str, List[Dict]], path: Path = RESULTS_FILE, sharded: bool = True,
+                            changed_folders: Optional[List[str]] = None):
+    """전체 결과 저장 - 샤드 모드면 changed_folders(없으면 전체)의 샤드를 쓰고 결과에 없는 폴더의 샤드는 삭제"""
+    shards = _use_shards(path, sharded)
+    if not shards:
+        save_state(path, results)
+        return
+    for folder in (results if changed_folders is None else changed_folders):
+        if folder in results:
+            shards.write_folder(folder, results[folder])
+        else:
+            shards.remove_folder(folder)
+    if changed_folders is None:
+        for folder in set(shards.load_all()) - set(results):
+            shards.remove_folder(folder)
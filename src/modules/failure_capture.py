@@ -0,0 +1,145 @@
+import json
+import queue
+import re
+import shutil
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+from .logger import setup_logger
+
+
+# DOM 일부와 최근 네트워크 항목을 한 번의 왕복으로 수집
+SNAPSHOT_SCRIPT = """
+const domLimit = arguments[0];
+const networkLimit = arguments[1];
+const html = document.documentElement ? document.documentElement.outerHTML : '';
+const resources = (performance.getEntriesByType ? performance.getEntriesByType('resource') : [])
+    .slice(-networkLimit)
+    .map(function (e) {
+        return {
+            name: e.name,
+            type: e.initiatorType,
+            start_ms: Math.round(e.startTime),
+            duration_ms: Math.round(e.duration),
+            transfer_size: e.transferSize || 0,
+            status: e.responseStatus || null
+        };
+    });
+return {
+    url: location.href,
+    title: document.title,
+    dom: html.length > domLimit ? html.substring(0, domLimit) : html,
+    dom_length: html.length,
+    network: resources
+};
+"""
+
+
+class FailureCapture:
+    """실패 시 스크린샷/DOM/콘솔/네트워크 기록을 비동기로 디스크 링 버퍼에 저장"""
+
+    def __init__(self, driver, capture_dir: str = 'logs/failures', max_entries: int = 50,
+                 dom_limit: int = 200_000, network_limit: int = 100, queue_size: int = 8):
+        self.logger = setup_logger(self.__class__.__name__, 'INFO')
+        self.driver = driver
+        self.capture_dir = Path(capture_dir)
+        self.max_entries = max_entries
+        self.dom_limit = dom_limit
+        self.network_limit = network_limit
+
+        # 큐가 가득 차면 캡처를 버림 (업로드 루프를 절대 막지 않음)
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._worker = threading.Thread(target=self._run, name='failure-capture', daemon=True)
+        self._worker.start()
+
+    def capture(self, label: str, error: Optional[BaseException] = None, extra: Optional[Dict] = None) -> bool:
+        """현재 브라우저 상태 수집 후 저장 작업을 큐에 등록 (디스크 쓰기는 백그라운드)"""
+        entry: Dict = {
+            'label': label,
+            'time': datetime.now(),
+            'error': f'{type(error).__name__}: {error}' if error else None,
+            'extra': extra or {},
+        }
+
+        try:
+            entry['screenshot'] = self.driver.get_screenshot_as_png()
+        except Exception as e:
+            entry['screenshot'] = None
+            entry['extra']['screenshot_error'] = str(e)
+
+        try:
+            entry['page'] = self.driver.execute_script(SNAPSHOT_SCRIPT, self.dom_limit, self.network_limit) or {}
+        except Exception as e:
+            entry['page'] = {}
+            entry['extra']['snapshot_error'] = str(e)
+
+        try:
+            entry['console'] = self.driver.get_log('browser')
+        except Exception:
+            # goog:loggingPrefs가 설정되지 않았거나 지원하지 않는 드라이버
+            entry['console'] = []
+
+        try:
+            self._queue.put_nowait(entry)
+            return True
+        except queue.Full:
+            self.logger.warning(f'Failure capture queue full, dropping capture: {label}')
+            return False
+
+    def _run(self):
+        while True:
+            entry = self._queue.get()
+            try:
+                if entry is None:
+                    return
+                self._write(entry)
+                self._enforce_ring()
+            except Exception as e:
+                self.logger.error(f'Failed to write failure capture: {str(e)}')
+            finally:
+                self._queue.task_done()
+
+    def _write(self, entry: Dict):
+        slug = re.sub(r'[^0-9A-Za-z가-힣._-]+', '_', entry['label'])[:60]
+        target = self.capture_dir / f"{entry['time'].strftime('%Y%m%d_%H%M%S_%f')}_{slug}"
+        target.mkdir(parents=True, exist_ok=True)
+
+        page = entry['page']
+        if entry['screenshot']:
+            (target / 'screenshot.png').write_bytes(entry['screenshot'])
+        (target / 'dom.html').write_text(page.get('dom', ''), encoding='utf-8')
+
+        with (target / 'console.json').open('w', encoding='utf-8') as f:
+            json.dump(entry['console'], f, ensure_ascii=False, indent=2)
+        with (target / 'network.json').open('w', encoding='utf-8') as f:
+            json.dump(page.get('network', []), f, ensure_ascii=False, indent=2)
+
+        meta = {
+            'label': entry['label'],
+            'time': entry['time'].isoformat(),
+            'error': entry['error'],
+            'url': page.get('url'),
+            'title': page.get('title'),
+            'dom_length': page.get('dom_length'),
+            'dom_truncated': page.get('dom_length', 0) > self.dom_limit,
+            **entry['extra'],
+        }
+        with (target / 'meta.json').open('w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        self.logger.info(f'📸 Failure captured: {target}')
+
+    def _enforce_ring(self):
+        """최대 보관 개수를 넘으면 가장 오래된 캡처부터 삭제"""
+        entries = sorted(p for p in self.capture_dir.iterdir() if p.is_dir())
+        for old in entries[:max(0, len(entries) - self.max_entries)]:
+            shutil.rmtree(old, ignore_errors=True)
+
+    def close(self, timeout: float = 5.0):
+        """대기 중인 캡처를 모두 기록하고 워커 종료"""
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._worker.join(timeout)
@@ -0,0 +1,132 @@
+import atexit
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .logger import setup_logger
+from .state_store import StateStore
+from .upload_journal import UploadJournal
+
+
+# 다시 시도해도 결과가 바뀌지 않는 실패 (그 외는 일시적 실패로 보고 재시도)
+PERMANENT_ERROR_TYPES = {
+    'FileNotFoundError', 'PermissionError', 'IsADirectoryError', 'InvalidArgumentException',
+}
+PERMANENT_REASON_PATTERN = re.compile(
+    r'no such file|file not found|cannot find file|invalid argument|file too large|unsupported (file|format)',
+    re.IGNORECASE,
+)
+
+
+def classify_failure(error_type: Optional[str], reason: str) -> str:
+    """실패를 'transient'(재시도 대상) 또는 'permanent'로 분류"""
+    if error_type in PERMANENT_ERROR_TYPES or PERMANENT_REASON_PATTERN.search(reason or ''):
+        return 'permanent'
+    return 'transient'
+
+
+class FailureLedger:
+    """업로드 실패 기록 (원인, 실패 단계, 시도 횟수)과 재시도 가능 여부 관리
+
+    업로드 기록(MultiAccountUploadTracker)과 분리되어 있어 실패한 파일이 업로드된 것으로 집계되지 않으며,
+    일시적 실패는 max_attempts까지 다시 시도할 수 있습니다.
+    """
+
+    def __init__(self, store: Optional[StateStore] = None, max_attempts: int = 3):
+        self.logger = setup_logger(self.__class__.__name__, 'INFO')
+        self.store = store
+        self.max_attempts = max_attempts
+        self.ledger_file = Path("logs/upload_failures.json")
+        self.journal = UploadJournal(self.ledger_file, Path("logs/upload_failures.jsonl"))
+        self.failures: Dict[str, Dict[str, Dict]] = {} if store else self._load()
+        atexit.register(self.close)
+
+    def _load(self) -> Dict[str, Dict[str, Dict]]:
+        try:
+            data = self.journal.load()
+            total = sum(len(files) for files in data.values())
+            if total:
+                self.logger.info(f"Loaded failure ledger with {total} failed files across {len(data)} accounts")
+            return data
+        except Exception as e:
+            self.logger.error(f"Failed to load failure ledger: {str(e)}")
+            return {}
+
+    def get(self, email: str, filename: str) -> Optional[Dict]:
+        if self.store:
+            return self.store.get_failure(email, filename)
+        return self.failures.get(email, {}).get(filename)
+
+    def has_failure(self, email: str, filename: str) -> bool:
+        return self.get(email, filename) is not None
+
+    def is_retry_eligible(self, entry: Optional[Dict]) -> bool:
+        return bool(entry) and entry.get('kind') == 'transient' and entry.get('attempts', 0) < self.max_attempts
+
+    def record_failure(self, email: str, file_path: Path, artist: str, title: str, reason: str,
+                       step: Optional[str] = None, error_type: Optional[str] = None) -> Dict:
+        """실패 1건 기록 (같은 파일이 다시 실패하면 시도 횟수 증가)"""
+        previous = self.get(email, file_path.name) or {}
+        now = datetime.now().isoformat()
+        entry = {
+            'path': str(file_path),
+            'artist': artist,
+            'title': title,
+            'reason': reason,
+            'step': step,
+            'error_type': error_type,
+            'kind': classify_failure(error_type, reason),
+            'attempts': previous.get('attempts', 0) + 1,
+            'first_failed': previous.get('first_failed', now),
+            'last_failed': now,
+        }
+        self._write(email, file_path.name, entry)
+
+        status = 'retry eligible' if self.is_retry_eligible(entry) else 'not retried'
+        self.logger.info(f"Recorded {entry['kind']} failure for {email}: {file_path.name} "
+                         f"(step {step}, attempt {entry['attempts']}/{self.max_attempts}, {status})")
+        return entry
+
+    def clear(self, email: str, filename: str):
+        """업로드 성공 시 실패 기록 삭제"""
+        if not self.has_failure(email, filename):
+            return
+        if self.store:
+            self.store.clear_failure(email, filename)
+            return
+        self.failures.get(email, {}).pop(filename, None)
+        self._append({'op': 'remove', 'email': email, 'filename': filename})
+
+    def eligible_failures(self, emails: Optional[List[str]] = None) -> List[Tuple[str, str, Dict]]:
+        """재시도 가능한 실패 목록 (email, filename, entry) - 계정별로 묶여 있도록 정렬"""
+        failures = self.store.load_failures() if self.store else self.failures
+        selected = []
+        for email in (emails if emails is not None else sorted(failures)):
+            for filename, entry in failures.get(email, {}).items():
+                if self.is_retry_eligible(entry):
+                    selected.append((email, filename, entry))
+        return selected
+
+    def _write(self, email: str, filename: str, entry: Dict):
+        if self.store:
+            self.store.record_failure(email, filename, entry)
+            return
+        self.failures.setdefault(email, {})[filename] = entry
+        self._append({'op': 'set', 'email': email, 'filename': filename, 'info': entry})
+
+    def _append(self, record: Dict):
+        try:
+            self.journal.append(record)
+            if self.journal.should_compact():
+                self.failures = self.journal.compact()
+        except Exception as e:
+            self.logger.error(f"Failed to append to failure ledger: {str(e)}")
+
+    def close(self):
+        if self.store:
+            return
+        try:
+            self.journal.close()
+        except Exception as e:
+            self.logger.error(f"Failed to close failure ledger: {str(e)}")
@@ -0,0 +1,99 @@
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLockTimeout(TimeoutError):
+    """잠금을 제한 시간 안에 얻지 못함"""
+
+
+class FileLock:
+    """여러 프로세스가 같은 상태 파일을 다룰 때 쓰는 배타적 파일 잠금 (<파일>.lock)
+
+    잠금을 쥔 스레드 안에서만 재진입 가능하고, 같은 인스턴스를 쓰는 다른 스레드는 해제될 때까지 기다립니다.
+    프로세스가 죽으면 OS가 잠금을 해제합니다.
+    """
+
+    def __init__(self, path, timeout: Optional[float] = 60.0, poll_interval: float = 0.05):
+        path = Path(path)
+        self.lock_file = path.with_name(path.name + '.lock')
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._fd: Optional[int] = None
+        self._depth = 0
+        # 스레드 간 배타 + 소유 스레드 재진입 (OS 잠금은 소유 스레드가 처음 들어올 때만 잡음)
+        self._thread_lock = threading.RLock()
+        self._owner: Optional[int] = None
+
+    def acquire(self):
+        started = time.monotonic()
+        if not self._thread_lock.acquire(timeout=-1 if self.timeout is None else self.timeout):
+            raise FileLockTimeout(f"Timed out waiting for lock: {self.lock_file}")
+        if self._depth:
+            self._depth += 1
+            return self
+
+        try:
+            self.lock_file.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(str(self.lock_file), os.O_RDWR | os.O_CREAT, 0o644)
+            while True:
+                try:
+                    self._try_lock(fd)
+                    break
+                except OSError:
+                    if self.timeout is not None and time.monotonic() - started >= self.timeout:
+                        os.close(fd)
+                        raise FileLockTimeout(f"Timed out waiting for lock: {self.lock_file}")
+                    time.sleep(self.poll_interval)
+        except BaseException:
+            self._thread_lock.release()
+            raise
+
+        self._fd = fd
+        self._depth = 1
+        self._owner = threading.get_ident()
+        return self
+
+    def release(self):
+        if not self._depth:
+            return
+        if self._owner != threading.get_ident():
+            raise RuntimeError(f"Lock {self.lock_file} released by a thread that does not hold it")
+        self._depth -= 1
+        if not self._depth:
+            self._owner = None
+            try:
+                self._unlock(self._fd)
+            finally:
+                os.close(self._fd)
+                self._fd = None
+        self._thread_lock.release()
+
+    @staticmethod
+    def _try_lock(fd: int):
+        if fcntl:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+
+    @staticmethod
+    def _unlock(fd: int):
+        if fcntl:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
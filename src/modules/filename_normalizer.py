@@ -0,0 +1,88 @@
+import re
+import unicodedata
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from .config_manager import ConfigManager
+
+
+# 설정(title_extraction.remove_keywords/remove_patterns)이 없을 때 쓰는 기본값
+DEFAULT_REMOVE_KEYWORDS = [
+    "Official", "MV", "가사", "lyrics", "커버", "댄스", "cover", "MIRRORED", "dance",
+    "feat", "featuring", "music video", "choreography", "choreo",
+]
+DEFAULT_REMOVE_PATTERNS = [
+    r"\[.*?\]",    # [MIRRORED], [MV] 등
+    r"\(.*?\)",    # (한글명), (1) 등
+]
+
+HANGUL = "가-힣ㄱ-ㆎ"
+_SEPARATORS = re.compile(r"[_\-\s]+")
+# 한글 연속 구간과 그 외 문자/숫자 연속 구간을 각각 토큰으로 ("IVE아이브" → "ive", "아이브")
+_TOKENS = re.compile(rf"[{HANGUL}]+|[^\W_{HANGUL}]+(?:['.][^\W_{HANGUL}]+)*")
+_SCRIPT_BOUNDARY = re.compile(rf"(?<=[{HANGUL}])(?=[^\W_{HANGUL}])|(?<=[^\W_{HANGUL}])(?=[{HANGUL}])")
+
+
+class FilenameNormalizer:
+    """파일명 정리기 - 제거할 패턴과 키워드를 하나의 정규식으로 컴파일해 한 번에 치환
+
+    unicode_nfkc: 전각 괄호/영숫자 등을 NFKC로 통일한 뒤 정리
+    split_hangul: 붙어 있는 한글과 영문/숫자 사이에 공백 삽입 ("아이브IVE" → "아이브 IVE")
+    """
+
+    def __init__(self, remove_keywords: Optional[Iterable[str]] = None, remove_patterns: Optional[Iterable[str]] = None,
+                 unicode_nfkc: bool = False, split_hangul: bool = False):
+        keywords = DEFAULT_REMOVE_KEYWORDS if remove_keywords is None else remove_keywords
+        patterns = DEFAULT_REMOVE_PATTERNS if remove_patterns is None else remove_patterns
+        # 긴 키워드 먼저 ("music video"가 "mv"보다 우선), 대소문자만 다른 중복 제거
+        unique_keywords = {kw.casefold(): kw for kw in keywords if kw}
+        ordered = sorted(unique_keywords.values(), key=len, reverse=True)
+        alternatives = [f"(?:{pattern})" for pattern in patterns]
+        if ordered:
+            alternatives.append(r"\b(?:" + "|".join(re.escape(kw) for kw in ordered) + r")\b")
+        self.removal = re.compile("|".join(alternatives), re.IGNORECASE) if alternatives else None
+        self.unicode_nfkc = unicode_nfkc
+        self.split_hangul = split_hangul
+
+    def normalize(self, filename: str) -> str:
+        """확장자 제거 → (NFKC) → 패턴/키워드 제거 → 공백, 언더스코어, 하이픈을 공백 하나로"""
+        name = Path(filename).stem
+        if self.unicode_nfkc:
+            name = unicodedata.normalize('NFKC', name)
+        if self.removal is not None:
+            name = self.removal.sub('', name)
+        if self.split_hangul:
+            name = _SCRIPT_BOUNDARY.sub(' ', name)
+        return _SEPARATORS.sub(' ', name).strip()
+
+    def tokenize(self, text: str) -> List[str]:
+        """비교용 토큰 목록 (NFKC 설정을 따르고 소문자로 통일, 한글/영문 경계에서 분리)"""
+        if self.unicode_nfkc:
+            text = unicodedata.normalize('NFKC', text)
+        return _TOKENS.findall(text.casefold())
+
+
+_default: Optional[FilenameNormalizer] = None
+
+
+def normalizer_from_config(config: ConfigManager) -> FilenameNormalizer:
+    return FilenameNormalizer(config.get('title_extraction', 'remove_keywords'),
+                              config.get('title_extraction', 'remove_patterns'),
+                              unicode_nfkc=config.get('title_extraction', 'unicode_nfkc', False),
+                              split_hangul=config.get('title_extraction', 'split_hangul', False))
+
+
+def get_normalizer() -> FilenameNormalizer:
+    """프로세스에서 공유하는 정리기 (처음 호출 시 config/config.json으로 생성, 설정 파일이 없으면 기본값)"""
+    global _default
+    if _default is None:
+        try:
+            _default = normalizer_from_config(ConfigManager())
+        except (OSError, ValueError):
+            _default = FilenameNormalizer()
+    return _default
+
+
+def set_normalizer(normalizer: FilenameNormalizer):
+    global _default
+    _default = normalizer
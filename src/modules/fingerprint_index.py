@@ -0,0 +1,105 @@
+import hashlib
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from .file_lock import FileLock
+from .logger import setup_logger
+from .state_codec import load_state, save_state
+
+
+def hash_file(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """파일 내용 해시 (mmap으로 매핑 후 chunk 단위로 해시 - hashlib은 큰 버퍼에서 GIL을 풀어 스레드 병렬화 가능)"""
+    hasher = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return hasher.hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                for offset in range(0, size, chunk_size):
+                    hasher.update(view[offset:offset + chunk_size])
+            finally:
+                view.release()
+    return hasher.hexdigest()
+
+
+class FingerprintIndex:
+    """(경로, 크기, mtime, inode)를 키로 파일 내용 해시를 캐시하는 인덱스
+
+    파일이 바뀌지 않았으면 다시 읽지 않고, 새 파일/변경된 파일만 스레드 풀에서 해시합니다.
+    """
+
+    def __init__(self, index_file: str = 'logs/fingerprints.json', workers: int = 4,
+                 chunk_size: int = 1024 * 1024):
+        self.logger = setup_logger(self.__class__.__name__, 'INFO')
+        self.index_file = Path(index_file)
+        self.workers = max(1, workers)
+        self.chunk_size = chunk_size
+        self.entries: Dict[str, Dict] = self._load()
+        self._dirty = False
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            return load_state(self.index_file, {})
+        except Exception as e:
+            self.logger.warning(f"Failed to load fingerprint index, starting fresh: {str(e)}")
+            return {}
+
+    @staticmethod
+    def _stat_key(stat: os.stat_result) -> Dict:
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'inode': stat.st_ino}
+
+    def fingerprints(self, paths: Iterable[Path]) -> Dict[Path, str]:
+        """여러 파일의 내용 해시 반환 (캐시에 없거나 바뀐 파일만 계산)"""
+        results: Dict[Path, str] = {}
+        pending = []
+        for path in paths:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            key = self._stat_key(stat)
+            entry = self.entries.get(str(path))
+            if entry and all(entry.get(field) == value for field, value in key.items()):
+                results[path] = entry['hash']
+            else:
+                pending.append((path, key))
+
+        if pending:
+            cached = len(results)
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(pending))) as pool:
+                hashes = pool.map(lambda item: self._hash_safely(item[0]), pending)
+                for (path, key), content_hash in zip(pending, hashes):
+                    if content_hash is None:
+                        continue
+                    self.entries[str(path)] = {**key, 'hash': content_hash}
+                    results[path] = content_hash
+            self._dirty = True
+            self.logger.info(f"Fingerprinted {len(pending)} files ({cached} cached)")
+            self.save()
+        return results
+
+    def _hash_safely(self, path: Path) -> Optional[str]:
+        try:
+            return hash_file(path, self.chunk_size)
+        except OSError as e:
+            self.logger.warning(f"Failed to hash {path}: {str(e)}")
+            return None
+
+    def save(self):
+        """변경 사항이 있으면 인덱스 저장 (다른 프로세스가 추가한 항목과 병합)"""
+        if not self._dirty:
+            return
+        try:
+            with FileLock(self.index_file):
+                merged = load_state(self.index_file, {})
+                merged.update(self.entries)
+                save_state(self.index_file, merged)
+                self.entries = merged
+            self._dirty = False
+        except Exception as e:
+            self.logger.error(f"Failed to save fingerprint index: {str(e)}")
@@ -0,0 +1,258 @@
+import json
+import re
+import unicodedata
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+from .logger import setup_logger
+
+
+logger = setup_logger('Gazetteer', 'INFO')
+
+ARTIST_MAPPING_FILE = Path("config/artist_mapping.json")
+
+CONFIDENCE_LEVELS = {'low': 0, 'medium': 1, 'high': 2}
+
+# 이보다 짧은 이름은 다른 단어 안에서 우연히 매칭되기 쉬워 사전에 넣지 않음
+MIN_TERM_LENGTH = 2
+
+_SEPARATORS = re.compile(r"[_\-\s]+")
+_HANGUL = re.compile(r"[가-힣ㄱ-ㆎ]")
+
+
+def normalize_term(text: str) -> str:
+    """사전 키/검색 대상 공통 정규화 (NFKC, 소문자, 구분자를 공백 하나로)"""
+    return _SEPARATORS.sub(' ', unicodedata.normalize('NFKC', text).casefold()).strip()
+
+
+def _is_boundary(text: str, index: int, inner: str) -> bool:
+    """text[index]가 단어 경계인지 (범위 밖, 문자/숫자가 아님, 또는 한글↔영문처럼 문자 종류가 바뀜)"""
+    if index < 0 or index >= len(text):
+        return True
+    outer = text[index]
+    if not outer.isalnum():
+        return True
+    return bool(_HANGUL.match(outer)) != bool(_HANGUL.match(inner))
+
+
+class _PyAutomaton:
+    """pyahocorasick이 없을 때 쓰는 순수 파이썬 Aho-Corasick (add_word/make_automaton/iter만 구현)"""
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List] = [[]]
+
+    def add_word(self, key: str, value) -> None:
+        node = 0
+        for ch in key:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node] = [value]
+
+    def make_automaton(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter(self, text: str) -> Iterator[Tuple[int, object]]:
+        node = 0
+        for end, ch in enumerate(text):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for value in self._out[node]:
+                yield end, value
+
+
+class GazetteerMatch:
+    """파일명에서 찾은 사전 항목 1개 (text에서의 [start, end) 위치)"""
+    __slots__ = ('start', 'end', 'kind', 'value', 'artists')
+
+    def __init__(self, start: int, end: int, kind: str, value: str, artists: Set[str]):
+        self.start = start
+        self.end = end
+        self.kind = kind
+        self.value = value
+        self.artists = artists
+
+    def overlaps(self, other: 'GazetteerMatch') -> bool:
+        return self.start < other.end and other.start < self.end
+
+
+class Gazetteer:
+    """지금까지 확인된 아티스트/제목 사전 - Aho-Corasick 오토마톤으로 파일명을 한 번 훑어 모든 이름을 찾음
+
+    high confidence 추출 결과의 아티스트/제목과 파일명의 "ARTIST(별칭)" 표기, config/artist_mapping.json의
+    {별칭: 아티스트} 매핑으로 사전을 만들고, 새 결과가 추가되면 다음 조회 때 오토마톤을 다시 만듭니다.
+    match()는 아티스트와 그 아티스트의 알려진 제목이 모두 파일명에 있을 때만 결과를 반환합니다.
+    """
+
+    def __init__(self, artist_mapping: Optional[Dict[str, str]] = None, min_confidence: str = 'high'):
+        if min_confidence not in CONFIDENCE_LEVELS:
+            raise ValueError(f"unknown confidence '{min_confidence}'")
+        self.min_level = CONFIDENCE_LEVELS[min_confidence]
+        self._artists: Dict[str, str] = {}           # 정규화된 이름/별칭 → 대표 아티스트명
+        self._titles: Dict[str, str] = {}            # 정규화된 제목 → 대표 제목 표기
+        self._title_artists: Dict[str, Set[str]] = {}  # 정규화된 제목 → 그 제목을 부른 대표 아티스트들
+        self._automaton = None
+        self.stats = {'checked': 0, 'hits': 0}
+        for alias, artist in (artist_mapping or {}).items():
+            self.add_artist(artist)
+            self.add_artist(alias, canonical=artist)
+
+    def __len__(self) -> int:
+        return len(self._artists) + len(self._titles)
+
+    def add_artist(self, name: str, canonical: Optional[str] = None) -> bool:
+        key = normalize_term(name or '')
+        if len(key) < MIN_TERM_LENGTH or key in self._artists:
+            return False
+        self._artists[key] = canonical or name.strip()
+        self._automaton = None
+        return True
+
+    def add_title(self, title: str, artist: str) -> bool:
+        key = normalize_term(title or '')
+        if len(key) < MIN_TERM_LENGTH:
+            return False
+        canonical_artist = self._artists.get(normalize_term(artist), artist)
+        artists = self._title_artists.setdefault(key, set())
+        if key in self._titles and canonical_artist in artists:
+            return False
+        self._titles.setdefault(key, title.strip())
+        artists.add(canonical_artist)
+        self._automaton = None
+        return True
+
+    def add_results(self, results: Dict[str, Iterable[Dict]]) -> int:
+        """추출 결과에서 high confidence 항목을 사전에 추가 (사전이 직접 만든 결과는 제외) → 새로 추가된 이름 수"""
+        added = 0
+        for items in results.values():
+            for item in items:
+                artist, title = item.get('artist'), item.get('title')
+                if item.get('confidence') != 'high' or not artist or not title or item.get('method') == 'gazetteer':
+                    continue
+                added += self.add_artist(artist)
+                alias = self._alias_in_filename(item.get('original_filename', ''), artist)
+                if alias:
+                    added += self.add_artist(alias, canonical=self._artists.get(normalize_term(artist), artist))
+                added += self.add_title(title, artist)
+        return added
+
+    @staticmethod
+    def _alias_in_filename(filename: str, artist: str) -> Optional[str]:
+        """파일명의 "ARTIST(별칭)" 표기에서 별칭 (예: "LE SSERAFIM(르세라핌)" → "르세라핌")"""
+        found = re.search(re.escape(artist) + r"\s*\(([^()]+)\)", filename, re.IGNORECASE)
+        return found.group(1).strip() if found else None
+
+    def _build(self):
+        automaton = ahocorasick.Automaton() if ahocorasick else _PyAutomaton()
+        entries: Dict[str, List[Tuple[str, str, Set[str]]]] = {}
+        for key, artist in self._artists.items():
+            entries.setdefault(key, []).append(('artist', artist, {artist}))
+        for key, title in self._titles.items():
+            entries.setdefault(key, []).append(('title', title, self._title_artists[key]))
+        for key, payloads in entries.items():
+            automaton.add_word(key, (len(key), payloads))
+        if entries:
+            automaton.make_automaton()
+        self._automaton = automaton
+        logger.info(f"Built gazetteer automaton: {len(self._artists)} artist names, {len(self._titles)} titles "
+                    f"({'pyahocorasick' if ahocorasick else 'pure Python'})")
+
+    def find(self, filename: str) -> Tuple[str, List[GazetteerMatch]]:
+        """파일명(확장자 제외)에서 단어 경계에 맞는 모든 사전 항목 → (정규화된 텍스트, 매칭 목록)"""
+        text = normalize_term(Path(filename).stem)
+        if not len(self):
+            return text, []
+        if self._automaton is None:
+            self._build()
+        matches = []
+        for end, (length, payloads) in self._automaton.iter(text):
+            start = end - length + 1
+            if not (_is_boundary(text, start - 1, text[start]) and _is_boundary(text, end + 1, text[end])):
+                continue
+            for kind, value, artists in payloads:
+                matches.append(GazetteerMatch(start, end + 1, kind, value, artists))
+        return text, matches
+
+    def match(self, filename: str) -> Optional[Dict]:
+        """사전으로 추출한 결과 (추출 결과와 같은 필드 + method), 신뢰도가 min_confidence 미만이면 None"""
+        self.stats['checked'] += 1
+        _, matches = self.find(filename)
+        artists = [m for m in matches if m.kind == 'artist']
+        if not artists:
+            return None
+
+        # 가장 긴 아티스트 표기를 우선 (다른 아티스트 이름 안에 포함된 짧은 이름은 무시)
+        artists.sort(key=lambda m: m.end - m.start, reverse=True)
+        chosen_artists: List[GazetteerMatch] = []
+        for candidate in artists:
+            if not any(candidate.overlaps(kept) for kept in chosen_artists):
+                chosen_artists.append(candidate)
+        artist_names = {m.value for m in chosen_artists}
+
+        titles = [m for m in matches if m.kind == 'title' and not any(m.overlaps(a) for a in chosen_artists)]
+        if not titles:
+            return None
+        # 다른 제목 안에 포함된 짧은 제목은 제외 ("Love 119" 안의 "Love")
+        titles = [t for t in titles if not any(o is not t and o.start <= t.start and t.end <= o.end
+                                               and (o.end - o.start) > (t.end - t.start) for o in titles)]
+        own_titles = [t for t in titles if t.artists & artist_names]
+
+        if len(artist_names) == 1 and len({t.value for t in own_titles}) == 1:
+            # 아티스트 1명 + 그 아티스트의 알려진 제목 1개
+            artist, title, confidence = next(iter(artist_names)), own_titles[0].value, 'high'
+        elif own_titles:
+            title_match = max(own_titles, key=lambda t: t.end - t.start)
+            artist = next(iter(title_match.artists & artist_names))
+            title, confidence = title_match.value, 'medium'
+        else:
+            # 제목은 알지만 다른 아티스트의 곡으로만 알려져 있음 (커버/리믹스 또는 오매칭)
+            title_match = max(titles, key=lambda t: t.end - t.start)
+            artist, title, confidence = chosen_artists[0].value, title_match.value, 'medium'
+
+        if CONFIDENCE_LEVELS[confidence] < self.min_level:
+            return None
+        self.stats['hits'] += 1
+        return {
+            "artist": artist,
+            "title": title,
+            "confidence": confidence,
+            "final_format": f"{artist} - {title}",
+            "method": "gazetteer",
+        }
+
+
+def load_artist_mapping(path: Path = ARTIST_MAPPING_FILE) -> Dict[str, str]:
+    """config/artist_mapping.json ({별칭: 아티스트}) 로드 (파일이 없으면 빈 매핑)"""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    try:
+        with path.open('r', encoding='utf-8') as f:
+            mapping = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.error(f"Invalid artist mapping file {path}: {str(e)}")
+        return {}
+    return {str(alias): str(artist) for alias, artist in mapping.items() if alias and artist}
@@ -0,0 +1,25 @@
+import random
+from typing import Dict, Union
+
+
+def sample_ms(rng: random.Random, dist: Union[int, float, Dict]) -> float:
+    """지연 분포에서 밀리초 단위 값 추출 (mock_hanlim_site의 latency_ms와 시뮬레이터 설정이 같은 형식 사용)
+
+    숫자: 고정값, {"dist": "fixed", "ms"}, {"dist": "uniform", "min", "max"}, {"dist": "normal", "mean", "stddev"},
+    {"dist": "lognormal", "mean", "sigma"} (mean은 중앙값), {"dist": "exponential", "mean"}
+    """
+    if isinstance(dist, (int, float)):
+        return max(0.0, float(dist))
+    kind = dist.get('dist', 'fixed')
+    if kind == 'uniform':
+        value = rng.uniform(dist.get('min', 0), dist.get('max', 0))
+    elif kind == 'normal':
+        value = rng.gauss(dist.get('mean', 0), dist.get('stddev', 0))
+    elif kind == 'lognormal':
+        # mean은 중앙값(ms), sigma는 로그 스케일 표준편차
+        value = rng.lognormvariate(0, dist.get('sigma', 0.5)) * dist.get('mean', 0)
+    elif kind == 'exponential':
+        value = rng.expovariate(1.0 / max(dist.get('mean', 1), 1e-3))
+    else:
+        value = dist.get('ms', dist.get('mean', 0))
+    return max(0.0, value)
@@ -0,0 +1,146 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from .config_manager import ConfigManager
+from .logger import setup_logger
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    model TEXT NOT NULL,
+    prompt_version INTEGER NOT NULL,
+    input TEXT NOT NULL,
+    response TEXT NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache(last_used);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_created ON llm_cache(created);
+"""
+
+# 저장할 때마다 정리하지 않고 이만큼 저장했거나 max_entries를 넘었을 때만 정리
+EVICT_INTERVAL = 1000
+# max_entries를 넘으면 이 비율까지 줄여 두어 가득 찬 상태에서 매번 정리하지 않도록 함
+EVICT_LOW_WATER = 0.9
+
+
+def cache_key(kind: str, model: str, prompt_version: int, value: Any) -> str:
+    """(용도, 모델, 프롬프트 버전, 입력)으로 만든 내용 기반 키"""
+    payload = json.dumps([kind, model, prompt_version, value], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LLMCache:
+    """LLM 응답 캐시 (SQLite) - 같은 입력은 다시 API를 호출하지 않음
+
+    ttl_days가 지난 항목은 조회되지 않으며, max_entries를 넘으면 가장 오래 사용되지 않은 항목부터 삭제합니다.
+    프롬프트나 모델이 바뀌면 키가 달라지므로 이전 응답은 자연스럽게 쓰이지 않습니다.
+    """
+
+    def __init__(self, db_path: str = 'logs/llm_cache.db', ttl_days: float = 90, max_entries: int = 200000):
+        self.logger = setup_logger(self.__class__.__name__, 'INFO')
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_days * 86400 if ttl_days else None
+        self.max_entries = max_entries
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+        self.stats = {'hits': 0, 'misses': 0, 'stored': 0}
+        # 대략적인 항목 수 (INSERT OR REPLACE로 덮어쓴 항목도 더해지므로 실제보다 클 수 있음, 정리할 때 다시 셈)
+        self._approx_entries = self.conn.execute('SELECT COUNT(*) FROM llm_cache').fetchone()[0]
+        self._puts_since_evict = 0
+
+    def get_many(self, kind: str, model: str, prompt_version: int, values: Iterable[Any]) -> Dict[str, Any]:
+        """여러 입력을 한 번에 조회 → {키: 응답} (없거나 만료된 항목은 제외)"""
+        keys = list(dict.fromkeys(cache_key(kind, model, prompt_version, value) for value in values))
+        if not keys:
+            return {}
+        now = time.time()
+        found = {}
+        with self._lock, self.conn:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                query = f'SELECT key, response, created FROM llm_cache WHERE key IN ({placeholders})'
+                for key, response, created in self.conn.execute(query, chunk):
+                    if self.ttl_seconds and now - created > self.ttl_seconds:
+                        continue
+                    found[key] = json.loads(response)
+            if found:
+                self.conn.executemany('UPDATE llm_cache SET last_used = ? WHERE key = ?',
+                                      [(now, key) for key in found])
+        self.stats['hits'] += len(found)
+        self.stats['misses'] += len(keys) - len(found)
+        return found
+
+    def get(self, kind: str, model: str, prompt_version: int, value: Any) -> Optional[Any]:
+        return self.get_many(kind, model, prompt_version, [value]).get(cache_key(kind, model, prompt_version, value))
+
+    def put_many(self, kind: str, model: str, prompt_version: int, items: List[tuple]):
+        """[(입력, 응답), ...] 저장 후 필요하면 오래된 항목 정리"""
+        if not items:
+            return
+        now = time.time()
+        rows = [(cache_key(kind, model, prompt_version, value), kind, model, prompt_version,
+                 json.dumps(value, ensure_ascii=False), json.dumps(response, ensure_ascii=False), now, now)
+                for value, response in items]
+        with self._lock, self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO llm_cache(key, kind, model, prompt_version, input, response, created, last_used) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows
+            )
+        self.stats['stored'] += len(rows)
+        self._approx_entries += len(rows)
+        self._puts_since_evict += len(rows)
+        if (self._puts_since_evict >= EVICT_INTERVAL
+                or (self.max_entries and self._approx_entries > self.max_entries)):
+            self.evict()
+
+    def put(self, kind: str, model: str, prompt_version: int, value: Any, response: Any):
+        self.put_many(kind, model, prompt_version, [(value, response)])
+
+    def evict(self) -> int:
+        """만료된 항목 삭제, max_entries를 넘으면 가장 오래 사용되지 않은 항목부터 max_entries * EVICT_LOW_WATER까지 삭제"""
+        removed = 0
+        with self._lock, self.conn:
+            if self.ttl_seconds:
+                removed += self.conn.execute('DELETE FROM llm_cache WHERE created < ?',
+                                             (time.time() - self.ttl_seconds,)).rowcount
+            count = self.conn.execute('SELECT COUNT(*) FROM llm_cache').fetchone()[0]
+            if self.max_entries and count > self.max_entries:
+                excess = count - int(self.max_entries * EVICT_LOW_WATER)
+                deleted = self.conn.execute(
+                    'DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache ORDER BY last_used LIMIT ?)',
+                    (excess,)
+                ).rowcount
+                removed += deleted
+                count -= deleted
+            self._approx_entries = count
+            self._puts_since_evict = 0
+        return removed
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+        if self.stats['hits'] or self.stats['misses']:
+            self.logger.info(f"LLM cache: {self.stats}")
+
+
+def open_llm_cache(config: ConfigManager) -> Optional[LLMCache]:
+    """title_extraction.llm_cache가 켜져 있으면 LLMCache를 열어 반환"""
+    if not config.get('title_extraction', 'llm_cache', True):
+        return None
+    return LLMCache(config.get('title_extraction', 'llm_cache_path', 'logs/llm_cache.db'),
+                    ttl_days=config.get('title_extraction', 'llm_cache_ttl_days', 90),
+                    max_entries=config.get('title_extraction', 'llm_cache_max_entries', 200000))
@@ -0,0 +1,149 @@
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .logger import setup_logger
+from .rate_limit import is_retryable
+
+
+logger = setup_logger('OpenAIBatch', 'INFO')
+
+BATCH_DIR = Path("logs/batch")
+CHAT_COMPLETIONS_URL = "/v1/chat/completions"
+
+# Batch API 입력 파일 1개의 상한 (요청 50,000개, 200MB) - 넘으면 여러 배치로 나눠 제출
+MAX_BATCH_REQUESTS = 50000
+MAX_BATCH_BYTES = 190 * 1024 * 1024
+
+# 더 이상 진행되지 않는 배치 상태
+FINAL_STATUSES = ('completed', 'failed', 'expired', 'cancelled')
+
+
+class BatchJob:
+    """제출한 배치 묶음 - manifest 파일에 저장해 두고, 기다리는 중 프로세스가 끝나도 다음 실행에서 이어서 기다림
+
+    manifest: {"model", "prompt_version", "batches": [{"batch_id", "input_file", "requests": {custom_id: [[정리된 이름, 원본 파일명], ...]}}]}
+    """
+
+    def __init__(self, manifest_path: Path, model: str, prompt_version: int, batches: Optional[List[Dict]] = None):
+        self.manifest_path = Path(manifest_path)
+        self.model = model
+        self.prompt_version = prompt_version
+        self.batches = batches or []
+
+    @classmethod
+    def load(cls, manifest_path: Path) -> Optional['BatchJob']:
+        manifest_path = Path(manifest_path)
+        if not manifest_path.exists():
+            return None
+        try:
+            with manifest_path.open('r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            return cls(manifest_path, manifest['model'], manifest['prompt_version'], manifest['batches'])
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"Ignoring unreadable batch manifest {manifest_path}: {str(e)}")
+            return None
+
+    def save(self):
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.manifest_path.with_name(self.manifest_path.name + '.tmp')
+        with tmp_file.open('w', encoding='utf-8') as f:
+            json.dump({'model': self.model, 'prompt_version': self.prompt_version, 'batches': self.batches},
+                      f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, self.manifest_path)
+
+    def remove(self):
+        """결과를 모두 반영한 뒤 manifest와 입력 파일 삭제"""
+        for path in [Path(batch['input_file']) for batch in self.batches] + [self.manifest_path]:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def request_items(self) -> Iterator[Tuple[str, List[Tuple[str, str]]]]:
+        """(custom_id, [(정리된 이름, 원본 파일명), ...]) - 모든 배치의 요청"""
+        for batch in self.batches:
+            for custom_id, items in batch['requests'].items():
+                yield custom_id, [tuple(item) for item in items]
+
+
+def write_batch_inputs(batch_dir: Path, prefix: str, requests: Dict[str, Dict]) -> List[Tuple[Path, List[str]]]:
+    """요청 {custom_id: chat.completions 인자}를 JSONL 입력 파일로 기록 (상한을 넘으면 여러 파일) → [(파일, custom_id 목록)]"""
+    batch_dir = Path(batch_dir)
+    batch_dir.mkdir(parents=True, exist_ok=True)
+    files: List[Tuple[Path, List[str]]] = []
+    handle, size = None, 0
+    try:
+        for custom_id, body in requests.items():
+            line = json.dumps({'custom_id': custom_id, 'method': 'POST', 'url': CHAT_COMPLETIONS_URL, 'body': body},
+                              ensure_ascii=False).encode('utf-8') + b'\n'
+            if handle is None or len(files[-1][1]) >= MAX_BATCH_REQUESTS or size + len(line) > MAX_BATCH_BYTES:
+                if handle:
+                    handle.close()
+                path = batch_dir / f"{prefix}-{len(files) + 1}.jsonl"
+                handle, size = path.open('wb'), 0
+                files.append((path, []))
+            handle.write(line)
+            size += len(line)
+            files[-1][1].append(custom_id)
+    finally:
+        if handle:
+            handle.close()
+    return files
+
+
+def submit_batch(client, input_file: Path, metadata: Optional[Dict[str, str]] = None):
+    """입력 파일 업로드 후 배치 생성 (24시간 완료 창) → Batch 객체"""
+    with Path(input_file).open('rb') as f:
+        uploaded = client.files.create(file=f, purpose='batch')
+    extra = {'metadata': metadata} if metadata else {}
+    batch = client.batches.create(input_file_id=uploaded.id, endpoint=CHAT_COMPLETIONS_URL,
+                                  completion_window='24h', **extra)
+    logger.info(f"Submitted batch {batch.id} ({input_file}, input file {uploaded.id})")
+    return batch
+
+
+def wait_for_batch(client, batch_id: str, poll_interval: float = 60.0, timeout: Optional[float] = None):
+    """배치가 끝날 때까지 폴링 (진행 상황이 바뀔 때만 출력, 일시적 오류는 다음 폴링에서 재시도) → 마지막 Batch 객체"""
+    deadline = time.monotonic() + timeout if timeout else None
+    last_progress = None
+    while True:
+        try:
+            batch = client.batches.retrieve(batch_id)
+        except Exception as e:
+            if not is_retryable(e):
+                raise
+            logger.warning(f"Polling batch {batch_id} failed, retrying: {str(e)}")
+        else:
+            counts = batch.request_counts
+            progress = (batch.status, counts.completed if counts else 0, counts.failed if counts else 0)
+            if progress != last_progress:
+                total = counts.total if counts else 0
+                print(f"  ⏳ 배치 {batch_id}: {batch.status} ({progress[1]}/{total} 완료, 실패 {progress[2]})")
+                last_progress = progress
+            if batch.status in FINAL_STATUSES:
+                return batch
+        if deadline and time.monotonic() >= deadline:
+            raise TimeoutError(f"batch {batch_id} did not finish within {timeout}s")
+        time.sleep(poll_interval)
+
+
+def read_batch_output(client, batch) -> Dict[str, Dict]:
+    """끝난 배치의 성공한 응답 본문 {custom_id: chat completion JSON} (실패한 요청은 로그만 남기고 제외)"""
+    bodies = {}
+    for file_id in (batch.output_file_id, batch.error_file_id):
+        if not file_id:
+            continue
+        for line in client.files.content(file_id).text.splitlines():
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            response = entry.get('response') or {}
+            if response.get('status_code') == 200 and response.get('body'):
+                bodies[entry['custom_id']] = response['body']
+            else:
+                error = entry.get('error') or response.get('body', {}).get('error')
+                logger.warning(f"Batch request {entry.get('custom_id')} failed: {error}")
+    return bodies
@@ -0,0 +1,65 @@
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from .logger import setup_logger
+
+
+logger = setup_logger('RateLimit', 'INFO')
+
+T = TypeVar('T')
+
+# 다시 시도하면 성공할 수 있는 HTTP 상태 (요청 제한, 타임아웃, 서버 오류)
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+RETRYABLE_ERROR_NAMES = {'APIConnectionError', 'APITimeoutError', 'TimeoutError', 'ConnectionError'}
+
+
+def is_retryable(error: Exception) -> bool:
+    status = getattr(error, 'status_code', None)
+    if status is not None:
+        return status in RETRYABLE_STATUS or status >= 500
+    return type(error).__name__ in RETRYABLE_ERROR_NAMES
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """응답 헤더의 retry-after-ms / retry-after(초 또는 HTTP 날짜) 값 (없으면 None)"""
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    try:
+        if headers.get('retry-after-ms'):
+            return float(headers['retry-after-ms']) / 1000
+        value = headers.get('retry-after')
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None, base_delay: float = 1.0,
+                  max_delay: float = 60.0, rng: random.Random = random) -> float:
+    """재시도 대기 시간 - retry-after가 있으면 그 이상 기다리고, 없으면 지수 백오프 (full jitter)"""
+    if retry_after is not None:
+        # 동시에 제한에 걸린 요청들이 같은 순간에 몰리지 않도록 약간의 지터 추가
+        return min(max_delay, retry_after) + rng.uniform(0, base_delay)
+    return rng.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+async def call_with_retry(func: Callable[[], Awaitable[T]], max_retries: int = 5, base_delay: float = 1.0,
+                          max_delay: float = 60.0, label: str = 'request') -> T:
+    """비동기 호출을 재시도 가능한 오류(429/5xx/연결 오류)에 한해 백오프 후 다시 시도"""
+    attempt = 0
+    while True:
+        try:
+            return await func()
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable(e):
+                raise
+            delay = backoff_delay(attempt, retry_after_seconds(e), base_delay, max_delay)
+            attempt += 1
+            logger.warning(f"{label} failed ({type(e).__name__}), retry {attempt}/{max_retries} in {delay:.1f}s")
+            await asyncio.sleep(delay)
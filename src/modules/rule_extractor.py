@@ -0,0 +1,99 @@
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from .logger import setup_logger
+
+
+logger = setup_logger('RuleExtractor', 'INFO')
+
+PATTERNS_FILE = Path("config/title_patterns.json")
+
+CONFIDENCE_LEVELS = {'low': 0, 'medium': 1, 'high': 2}
+
+# 이름 없이 문자열로만 적힌 예전 패턴의 신뢰도 (너무 넓게 매칭되므로 기본 설정에서는 LLM 대신 쓰지 않음)
+DEFAULT_PATTERN_CONFIDENCE = 'low'
+
+# 파일명 끝의 복사본 번호 "(1)", 합성 데이터셋의 " 00004" 같은 일련번호
+_COPY_SUFFIX = re.compile(r'(?:\s*\(\d+\))?(?:\s+\d+)?$')
+
+
+class TitlePattern:
+    """컴파일된 제목 패턴 1개 (artist/title 이름 그룹 필수)"""
+
+    def __init__(self, name: str, pattern: str, confidence: str = DEFAULT_PATTERN_CONFIDENCE):
+        if confidence not in CONFIDENCE_LEVELS:
+            raise ValueError(f"unknown confidence '{confidence}' for pattern {name}")
+        self.name = name
+        self.regex = re.compile(pattern, re.IGNORECASE)
+        if not {'artist', 'title'} <= set(self.regex.groupindex):
+            raise ValueError(f"pattern {name} needs (?P<artist>...) and (?P<title>...) groups")
+        self.confidence = confidence
+
+    @classmethod
+    def from_entry(cls, entry: Union[str, Dict], position: int) -> 'TitlePattern':
+        """title_patterns.json 항목 → 패턴 (문자열 또는 {"name", "pattern", "confidence"})"""
+        if isinstance(entry, str):
+            return cls(f"pattern_{position}", entry)
+        return cls(entry.get('name') or f"pattern_{position}", entry['pattern'],
+                   entry.get('confidence', DEFAULT_PATTERN_CONFIDENCE))
+
+
+class RuleExtractor:
+    """정규식 규칙으로 파일명에서 아티스트/제목을 추출하는 로컬 단계 (LLM 호출 전)
+
+    패턴은 파일에 적힌 순서대로 확장자를 뺀 원본 파일명에 매칭하며, 처음 매칭된 패턴의 결과를 사용합니다.
+    매칭된 패턴의 신뢰도가 min_confidence 이상일 때만 결과를 반환하고, 나머지 파일은 LLM으로 보냅니다.
+    """
+
+    def __init__(self, patterns: List[TitlePattern], min_confidence: str = 'high'):
+        if min_confidence not in CONFIDENCE_LEVELS:
+            raise ValueError(f"unknown confidence '{min_confidence}'")
+        self.patterns = patterns
+        self.min_level = CONFIDENCE_LEVELS[min_confidence]
+        self.stats = {'checked': 0, 'hits': 0, 'by_pattern': {}}
+
+    def match(self, filename: str) -> Optional[Dict]:
+        """규칙으로 추출한 결과 (추출 결과와 같은 필드 + method/rule), 확실하지 않으면 None"""
+        self.stats['checked'] += 1
+        stem = _COPY_SUFFIX.sub('', Path(filename).stem).strip()
+        for pattern in self.patterns:
+            found = pattern.regex.search(stem)
+            if not found:
+                continue
+            artist = found.group('artist').strip()
+            title = found.group('title').strip()
+            if not artist or not title or CONFIDENCE_LEVELS[pattern.confidence] < self.min_level:
+                # 처음 매칭된 패턴이 기준보다 낮으면 더 느슨한 뒤쪽 패턴은 볼 필요가 없음
+                return None
+            self.stats['hits'] += 1
+            self.stats['by_pattern'][pattern.name] = self.stats['by_pattern'].get(pattern.name, 0) + 1
+            return {
+                "artist": artist,
+                "title": title,
+                "confidence": pattern.confidence,
+                "final_format": f"{artist} - {title}",
+                "method": "rule",
+                "rule": pattern.name,
+            }
+        return None
+
+    def hit_rate(self) -> float:
+        return self.stats['hits'] / self.stats['checked'] if self.stats['checked'] else 0.0
+
+
+def load_rule_extractor(path: Path = PATTERNS_FILE, min_confidence: str = 'high') -> Optional[RuleExtractor]:
+    """title_patterns.json에서 규칙 추출기 생성 (파일이 없거나 잘못되었으면 None → 전부 LLM으로 처리)"""
+    path = Path(path)
+    if not path.exists():
+        logger.warning(f"Title pattern file not found: {path}")
+        return None
+    try:
+        with path.open('r', encoding='utf-8') as f:
+            entries = json.load(f)
+        patterns = [TitlePattern.from_entry(entry, position) for position, entry in enumerate(entries, 1)]
+    except (OSError, ValueError, KeyError, re.error) as e:
+        logger.error(f"Invalid title pattern file {path}: {str(e)}")
+        return None
+    return RuleExtractor(patterns, min_confidence)
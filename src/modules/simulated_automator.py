@@ -0,0 +1,139 @@
+import random
+from pathlib import Path
+from time import sleep
+from typing import Callable, Dict, List, Optional
+
+from .config_manager import ConfigManager
+from .file_lock import FileLock
+from .latency import sample_ms
+from .logger import setup_logger
+from .state_codec import load_state, save_state
+
+
+DEFAULT_SIMULATION = {
+    "seed": None,
+    "time_scale": 1.0,
+    "login_ms": {"dist": "lognormal", "mean": 3000, "sigma": 0.3},
+    "upload_ms": {"dist": "lognormal", "mean": 12000, "sigma": 0.4},
+    "logout_ms": {"dist": "uniform", "min": 800, "max": 1500},
+    "login_failure_rate": 0.0,
+    "upload_failure_rate": 0.02,
+    "upload_error_rate": 0.0,
+    # 마지막 클릭이 조용히 실패하는 경우 (True를 반환하지만 게시물은 생성되지 않음)
+    "silent_failure_rate": 0.0,
+    "posts_file": "logs/simulated_posts.json",
+}
+
+
+class SimulatedAutomator:
+    """브라우저 없이 WebAutomator 인터페이스를 흉내내는 시뮬레이터 (오케스트레이션 오버헤드 측정용)"""
+
+    def __init__(self, config: ConfigManager):
+        self.config = config
+        self.logger = setup_logger(self.__class__.__name__, config.get('general', 'log_level', 'INFO'))
+
+        settings = dict(DEFAULT_SIMULATION)
+        settings.update(config.data.get('simulation', {}))
+        self.settings = settings
+        self.random = random.Random(settings.get('seed'))
+        self.time_scale = settings.get('time_scale', 1.0)
+
+        self.current_email: Optional[str] = None
+        self.current_step: Optional[str] = None
+        self.last_failure: Optional[Dict] = None
+        self.stats: Dict[str, float] = {
+            'logins': 0, 'uploads': 0, 'upload_failures': 0, 'upload_errors': 0, 'silent_failures': 0,
+            'simulated_seconds': 0.0
+        }
+        # 계정별 게시물 (재실행/대조 작업에서도 보이도록 파일에 보관)
+        self.posts_file = Path(settings.get('posts_file', 'logs/simulated_posts.json'))
+        self.posts: Dict[str, List[Dict]] = load_state(self.posts_file, {})
+        # 이번 실행에서 새로 만든 게시물 (종료 시 다른 프로세스가 기록한 내용과 병합)
+        self._new_posts: Dict[str, List[Dict]] = {}
+        self.logger.info(f"🧪 Simulated automator initialized (time_scale={self.time_scale})")
+
+    def _wait(self, key: str):
+        """설정된 분포만큼 대기 (time_scale=0이면 대기 없이 시간만 누적)"""
+        seconds = sample_ms(self.random, self.settings.get(key, 0)) / 1000.0
+        self.stats['simulated_seconds'] += seconds
+        if self.time_scale > 0:
+            sleep(seconds * self.time_scale)
+
+    def _chance(self, key: str) -> bool:
+        rate = self.settings.get(key, 0.0)
+        return bool(rate) and self.random.random() < rate
+
+    def login_with_account(self, email: str, password: str):
+        """특정 계정으로 로그인 (시뮬레이션)"""
+        self._wait('login_ms')
+        if self._chance('login_failure_rate'):
+            raise RuntimeError(f'Simulated login failure for {email}')
+        self.current_email = email
+        self.stats['logins'] += 1
+        self.logger.info(f'Login successful for: {email}')
+
+    def upload_video(self, file_path: Path, artist: str, title: str, description: str, tracker=None) -> bool:
+        """업로드 시뮬레이션 - 실패율/예외율에 따라 결과 결정"""
+        self.last_failure = None
+        self.current_step = str(self.random.randint(1, 8))
+        self._wait('upload_ms')
+        if self._chance('upload_error_rate'):
+            self.stats['upload_errors'] += 1
+            raise RuntimeError(f'Simulated connection error while uploading {file_path.name}')
+        if self._chance('upload_failure_rate'):
+            self.stats['upload_failures'] += 1
+            # 실제 업로드 실패의 대부분인 요소 대기 타임아웃을 흉내냄 (재시도 대상)
+            self.last_failure = {'step': self.current_step, 'reason': 'simulated failure',
+                                 'error_type': 'TimeoutException'}
+            self.logger.error(f'Upload failed for {file_path.name}: simulated failure')
+            return False
+
+        if self._chance('silent_failure_rate'):
+            self.stats['silent_failures'] += 1
+        else:
+            account_posts = self.posts.setdefault(self.current_email or '', [])
+            account_posts.append({'post_id': str(len(account_posts) + 1), 'description': description})
+            self._new_posts.setdefault(self.current_email or '', []).append(account_posts[-1])
+        
+        if tracker:
+            tracker.mark_as_uploaded(file_path.name, artist, title)
+        self.stats['uploads'] += 1
+        self.logger.info(f'Step 8: Upload completed successfully for {file_path.name}')
+        return True
+
+    def logout(self):
+        """로그아웃 (시뮬레이션)"""
+        self._wait('logout_ms')
+        self.current_email = None
+        self.logger.info('🏁 Logout process completed')
+
+    def list_posted_videos(self, source: str = 'profile', max_scrolls: int = 50) -> List[Dict]:
+        """현재 계정의 게시물 목록 (시뮬레이션)"""
+        self._wait('logout_ms')
+        return list(self.posts.get(self.current_email or '', []))
+
+    def post_list_fetcher(self) -> Callable[[], List[Dict]]:
+        """다른 스레드에서 현재 계정의 게시물 목록을 조회하는 함수 반환 (시뮬레이션)"""
+        account_posts = self.posts.setdefault(self.current_email or '', [])
+        return lambda: list(account_posts)
+
+    def dump_flight_recorder(self, reason: str = 'manual'):
+        """시뮬레이터에는 WebDriver 명령이 없으므로 기록할 내용 없음"""
+        return None
+
+    def close(self):
+        self._save_posts()
+        self.logger.info(f'Simulation finished: {self.stats}')
+
+    def _save_posts(self):
+        """새 게시물을 잠금 안에서 디스크의 최신 내용에 병합 (여러 계정 범위를 동시에 실행해도 서로 덮어쓰지 않음)"""
+        if not self._new_posts:
+            return
+        with FileLock(self.posts_file):
+            merged = load_state(self.posts_file, {})
+            for email, posts in self._new_posts.items():
+                account_posts = merged.setdefault(email, [])
+                for post in posts:
+                    account_posts.append({'post_id': str(len(account_posts) + 1), 'description': post['description']})
+            save_state(self.posts_file, merged)
+        self._new_posts = {}
@@ -1,46 +1,86 @@
-import json
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 from .config_manager import ConfigManager
+from .extraction_index import ExtractionIndex, ExtractionRecord, list_files, load_extraction_index
+from .extraction_shards import (RESULTS_FILE, ExtractionShards, load_extraction_results, results_exist,
+                                save_extraction_folder, shard_dir_for)
+from .file_lock import FileLock
 from .logger import setup_logger
+from .state_store import StateStore
 
 
 class SmartFileManager:
     """smart_extraction_results.json을 기반으로 파일을 관리하는 클래스"""
     
-    def __init__(self, config: ConfigManager):
+    def __init__(self, config: ConfigManager, store: Optional[StateStore] = None):
         self.config = config
         self.logger = setup_logger(self.__class__.__name__, config.get('general', 'log_level', 'INFO'))
-        self.extraction_results = self._load_extraction_results()
-        
-    def _load_extraction_results(self) -> Dict:
-        """smart_extraction_results.json 파일 로드"""
-        results_file = Path("smart_extraction_results.json")
-        
-        if not results_file.exists():
-            self.logger.error(f"smart_extraction_results.json 파일을 찾을 수 없습니다: {results_file}")
+        # store가 주어지면 폴더별로 필요한 레코드만 조회, 아니면 AccountManager와 공유하는 압축 인덱스 사용
+        # (전체 결과 dict는 수정이 필요할 때만 로드)
+        self.store = store
+        self._extraction_results: Optional[Dict] = None
+    
+    @property
+    def extraction_results(self) -> Dict:
+        """전체 추출 결과 (처음 접근할 때 로드)"""
+        if self._extraction_results is None:
+            if self.store:
+                self._extraction_results = self.store.load_extraction_results()
+            else:
+                self._extraction_results = self._load_extraction_results(use_cache=False)
+        return self._extraction_results
+    
+    @extraction_results.setter
+    def extraction_results(self, value: Dict):
+        self._extraction_results = value
+        
+    def _load_extraction_results(self, use_cache: bool = False) -> Dict:
+        """smart_extraction_results.json(또는 폴더별 샤드) 로드 (최신 바이너리 스냅샷이 있으면 사용)"""
+        if not results_exist(RESULTS_FILE):
+            self.logger.error(f"smart_extraction_results.json 파일을 찾을 수 없습니다: {RESULTS_FILE}")
             return {}
         
         try:
-            with results_file.open('r', encoding='utf-8') as f:
-                results = json.load(f)
-                self.logger.info(f"Loaded smart extraction results for {len(results)} folders")
-                return results
+            results = load_extraction_results(RESULTS_FILE, use_cache=use_cache)
+            self.logger.info(f"Loaded smart extraction results for {len(results)} folders")
+            return results
         except Exception as e:
             self.logger.error(f"Failed to load extraction results: {str(e)}")
             return {}
     
+    def _get_index(self) -> Optional[ExtractionIndex]:
+        """공유 추출 결과 인덱스 (파일이 바뀐 경우에만 다시 생성)"""
+        try:
+            index = load_extraction_index()
+            if index is None:
+                self.logger.error("smart_extraction_results.json 파일을 찾을 수 없습니다")
+            return index
+        except Exception as e:
+            self.logger.error(f"Failed to load extraction results: {str(e)}")
+            return None
+    
     def get_folder_videos(self, folder_name: str) -> List[Tuple[Path, str, str, str]]:
         """
         특정 폴더의 비디오 파일들과 메타데이터를 반환
         Returns: List of (file_path, artist, title, final_format)
         """
-        if folder_name not in self.extraction_results:
+        if self.store:
+            folder_records = [ExtractionRecord.from_dict(item) for item in self.store.get_folder_records(folder_name)]
+            records = [record for record in folder_records if record.confidence == 'high']
+        else:
+            index = self._get_index()
+            folder_records = index.records(folder_name) if index else ()
+            records = index.high_confidence(folder_name) if index else ()
+        if not folder_records:
             self.logger.warning(f"Folder '{folder_name}' not found in extraction results")
             return []
         
-        folder_data = self.extraction_results[folder_name]
+        # confidence가 'high'가 아닌 파일은 건너뛰기
+        skipped = len(folder_records) - len(records)
+        if skipped:
+            self.logger.info(f"⏭️ Skipping {skipped} files without high confidence in folder '{folder_name}'")
+        
         # config에서 video_folder_path 가져와서 경로 구성
         video_folder_path = self.config.get('general', 'video_folder_path', '/Users/minsung/Documents/choom')
         base_path = Path(video_folder_path) / folder_name
@@ -50,31 +90,22 @@ class SmartFileManager:
             return []
         
         results = []
+        # 파일 존재 여부는 폴더를 한 번 스캔한 결과로 확인
+        existing_files = list_files(base_path)
         
-        for item in folder_data:
-            filename = item.get('original_filename', '')
-            artist = item.get('artist')
-            title = item.get('title')
-            confidence = item.get('confidence', '')
-            final_format = item.get('final_format', '')
-            
-            # confidence가 'high'가 아니면 건너뛰기
-            if confidence != 'high':
-                self.logger.info(f"⏭️ Skipping file with {confidence} confidence: {filename}")
-                continue
-            
+        for record in records:
             # title이 null이면 건너뛰기
-            if not title:
-                self.logger.warning(f"Skipping file with no title: {filename}")
+            if not record.title:
+                self.logger.warning(f"Skipping file with no title: {record.filename}")
                 continue
             
             # 파일 경로 확인
-            file_path = base_path / filename
-            if not file_path.exists():
+            file_path = base_path / record.filename
+            if record.filename not in existing_files:
                 self.logger.warning(f"File does not exist: {file_path}")
                 continue
             
-            results.append((file_path, artist, title, final_format))
+            results.append((file_path, record.artist, record.title, record.final_format))
         
         self.logger.info(f"Found {len(results)} valid videos in folder '{folder_name}'")
         return results
@@ -106,7 +137,10 @@ class SmartFileManager:
     
     def get_available_folders(self) -> List[str]:
         """사용 가능한 폴더 목록 반환"""
-        return list(self.extraction_results.keys())
+        if self.store:
+            return self.store.get_folders()
+        index = self._get_index()
+        return index.folders() if index else []
     
     def remove_failed_file(self, folder_name: str, filename: str) -> bool:
         """
@@ -119,6 +153,48 @@ class SmartFileManager:
         Returns:
             bool: 삭제 성공 여부
         """
+        if self.store:
+            if self._extraction_results is not None and folder_name in self._extraction_results:
+                self._extraction_results[folder_name] = [
+                    item for item in self._extraction_results[folder_name]
+                    if item.get('original_filename', '') != filename
+                ]
+            if self.store.delete_extraction_record(folder_name, filename):
+                self.logger.info(f"✅ Removed failed file '{filename}' from folder '{folder_name}'")
+                return True
+            self.logger.warning(f"File '{filename}' not found in folder '{folder_name}'")
+            return False
+        
+        shards = ExtractionShards(shard_dir_for(RESULTS_FILE))
+        if shards.exists():
+            # 폴더별 샤드: 해당 폴더의 샤드만 잠그고 다시 읽어 수정 (cluster_titles.py --apply와 같은 잠금)
+            loaded = []
+            
+            def drop_file(folder: str, records: List[Dict]) -> bool:
+                loaded.append(records)
+                updated = [item for item in records if item.get('original_filename', '') != filename]
+                if len(updated) == len(records):
+                    return False
+                records[:] = updated
+                return True
+            
+            if not shards.update_folder(folder_name, drop_file):
+                if loaded:
+                    self.logger.warning(f"File '{filename}' not found in folder '{folder_name}'")
+                else:
+                    self.logger.warning(f"Folder '{folder_name}' not found in extraction results")
+                return False
+            if self._extraction_results is not None:
+                self._extraction_results[folder_name] = loaded[0]
+            self.logger.info(f"✅ Removed failed file '{filename}' from folder '{folder_name}'")
+            return True
+        
+        # 다른 프로세스의 변경을 덮어쓰지 않도록 잠금 안에서 다시 읽고 수정 후 저장
+        with FileLock(RESULTS_FILE):
+            self.extraction_results = self._load_extraction_results(use_cache=False)
+            return self._remove_and_save(folder_name, filename)
+    
+    def _remove_and_save(self, folder_name: str, filename: str) -> bool:
         if folder_name not in self.extraction_results:
             self.logger.warning(f"Folder '{folder_name}' not found in extraction results")
             return False
@@ -140,21 +216,19 @@ class SmartFileManager:
         self.extraction_results[folder_name] = updated_folder_data
         
         # 파일에 저장
-        if self._save_extraction_results():
+        if self._save_extraction_results(folder_name):
             self.logger.info(f"✅ Removed failed file '{filename}' from folder '{folder_name}'")
             return True
         else:
             self.logger.error(f"❌ Failed to save extraction results after removing '{filename}'")
             return False
     
-    def _save_extraction_results(self) -> bool:
-        """extraction_results를 파일에 저장"""
-        results_file = Path("smart_extraction_results.json")
-        
+    def _save_extraction_results(self, folder_name: str) -> bool:
+        """extraction_results 저장 (샤드 모드면 해당 폴더의 샤드만)"""
         try:
-            with results_file.open('w', encoding='utf-8') as f:
-                json.dump(self.extraction_results, f, ensure_ascii=False, indent=2)
+            save_extraction_folder(folder_name, self.extraction_results[folder_name], self.extraction_results,
+                                   sharded=self.config.get('general', 'extraction_storage', 'sharded') == 'sharded')
             return True
         except Exception as e:
             self.logger.error(f"Failed to save extraction results: {str(e)}")
-            return False
\ No newline at end of file
+            return False
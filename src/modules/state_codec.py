@@ -0,0 +1,196 @@
+import hashlib
+import json
+import os
+import pickle
+import struct
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+from .logger import setup_logger
+
+
+logger = setup_logger('StateCodec', 'INFO')
+
+# 스냅샷 형식이 바뀌면 올려서 이전 스냅샷을 무효화
+SCHEMA_VERSION = 1
+SNAPSHOT_SUFFIX = '.snap'
+MAGIC = b'CHOOMSNP'
+# magic, schema version, codec 이름 길이, 원본 JSON 크기, 원본 JSON mtime(ns), sha256
+HEADER = struct.Struct('>8sHHQQ32s')
+
+
+class JsonCodec:
+    """사람이 읽을 수 있는 교환/내보내기 형식"""
+    name = 'json'
+
+    def dumps(self, data: Any) -> bytes:
+        return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+    def loads(self, payload: bytes) -> Any:
+        return json.loads(payload)
+
+
+class PickleCodec:
+    """표준 라이브러리만으로 동작하는 바이너리 스냅샷 (로컬에서 직접 만든 파일만 읽음)"""
+    name = 'pickle'
+
+    def dumps(self, data: Any) -> bytes:
+        return pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def loads(self, payload: bytes) -> Any:
+        return pickle.loads(payload)
+
+
+class MsgpackCodec:
+    """msgpack 설치 시 사용하는 바이너리 스냅샷"""
+    name = 'msgpack'
+
+    def dumps(self, data: Any) -> bytes:
+        return msgpack.packb(data, use_bin_type=True)
+
+    def loads(self, payload: bytes) -> Any:
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+
+
+CODECS = {codec.name: codec for codec in (JsonCodec(), PickleCodec(), MsgpackCodec())}
+
+# 같은 프로세스 안에서 같은 파일을 다시 파싱하지 않도록 (경로 → (원본 stat, 데이터))
+_cache: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+
+
+def get_codec(name: str = 'auto'):
+    """이름으로 코덱 반환 ('auto'는 msgpack이 있으면 msgpack, 없으면 pickle)"""
+    if name == 'auto':
+        name = 'msgpack' if msgpack else 'pickle'
+    if name == 'msgpack' and not msgpack:
+        raise ValueError("msgpack codec requested but msgpack is not installed")
+    if name not in CODECS:
+        raise ValueError(f"Unknown state codec: {name}")
+    return CODECS[name]
+
+
+def snapshot_path(path: Path) -> Path:
+    return path.with_name(path.name + SNAPSHOT_SUFFIX)
+
+
+def _source_stamp(path: Path) -> Tuple[int, int]:
+    stat = path.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _atomic_write(target: Path, write) -> None:
+    """프로세스/스레드별 임시 파일에 쓴 뒤 rename (여러 프로세스가 동시에 저장해도 임시 파일이 겹치지 않음)"""
+    tmp_file = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with tmp_file.open('wb') as f:
+            write(f)
+        os.replace(tmp_file, target)
+    except BaseException:
+        try:
+            tmp_file.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def write_snapshot(path: Path, data: Any, codec: str = 'auto',
+                   stamp: Optional[Tuple[int, int]] = None) -> Optional[Path]:
+    """JSON 파일(path)에 대응하는 바이너리 스냅샷 기록 (원본 크기/mtime과 체크섬 포함)
+
+    stamp는 data를 읽어 온 JSON 파일의 (크기, mtime) - 읽은 뒤 다른 프로세스가 파일을 바꿨더라도
+    스냅샷이 새 파일의 stamp로 기록되지 않도록 읽을 때 얻은 값을 넘겨야 함 (없으면 지금 파일 기준).
+    """
+    path = Path(path)
+    target = snapshot_path(path)
+    try:
+        codec_impl = get_codec(codec)
+        payload = codec_impl.dumps(data)
+        size, mtime_ns = stamp or _source_stamp(path)
+        name = codec_impl.name.encode('ascii')
+        header = HEADER.pack(MAGIC, SCHEMA_VERSION, len(name), size, mtime_ns, hashlib.sha256(payload).digest())
+        _atomic_write(target, lambda f: f.write(header + name + payload))
+        return target
+    except Exception as e:
+        # 스냅샷은 캐시일 뿐이므로 실패해도 JSON만으로 동작
+        logger.warning(f"Failed to write state snapshot {target}: {str(e)}")
+        return None
+
+
+def read_snapshot(path: Path) -> Tuple[bool, Any]:
+    """원본 JSON과 일치하는 (fresh) 스냅샷이 있으면 (True, 데이터), 없거나 오래됐으면 (False, None)"""
+    path = Path(path)
+    target = snapshot_path(path)
+    if not target.exists() or not path.exists():
+        return False, None
+
+    try:
+        with target.open('rb') as f:
+            blob = f.read()
+        magic, version, name_len, size, mtime_ns, digest = HEADER.unpack_from(blob)
+        if magic != MAGIC or version != SCHEMA_VERSION:
+            return False, None
+        if (size, mtime_ns) != _source_stamp(path):
+            return False, None
+        offset = HEADER.size + name_len
+        codec_name = blob[HEADER.size:offset].decode('ascii')
+        payload = memoryview(blob)[offset:]
+        if hashlib.sha256(payload).digest() != digest:
+            logger.warning(f"Checksum mismatch in state snapshot {target}, falling back to JSON")
+            return False, None
+        return True, get_codec(codec_name).loads(payload)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable state snapshot {target}: {str(e)}")
+        return False, None
+
+
+def load_state(path, default: Any = None, use_cache: bool = False, codec: str = 'auto') -> Any:
+    """상태 파일 로드 - 최신 바이너리 스냅샷이 있으면 사용하고, 없으면 JSON을 읽은 뒤 스냅샷 생성
+
+    use_cache=True이면 같은 프로세스에서 같은 파일을 다시 읽을 때 파싱 없이 같은 객체를 반환하므로
+    호출 측에서 내용을 제자리에서 수정하면 안 됨.
+    """
+    path = Path(path)
+    if not path.exists():
+        return default
+
+    stamp = _source_stamp(path)
+    key = str(path.resolve())
+    if use_cache and key in _cache and _cache[key][0] == stamp:
+        return _cache[key][1]
+
+    fresh, data = read_snapshot(path)
+    if not fresh:
+        with path.open('rb') as f:
+            # 실제로 읽은 파일의 stamp (stat 이후 다른 프로세스가 교체했을 수 있음)
+            stat = os.fstat(f.fileno())
+            stamp = (stat.st_size, stat.st_mtime_ns)
+            data = json.loads(f.read())
+        write_snapshot(path, data, codec, stamp=stamp)
+
+    if use_cache:
+        _cache[key] = (stamp, data)
+    return data
+
+
+def save_state(path, data: Any, codec: str = 'auto', fsync: bool = False, snapshot: bool = False):
+    """JSON(교환 형식)을 원자적으로 저장 (snapshot=True면 바이너리 스냅샷도 바로 갱신, 아니면 다음 로드 때 생성)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+    def write(f):
+        f.write(payload)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+
+    _atomic_write(path, write)
+    _cache.pop(str(path.resolve()), None)
+    if snapshot:
+        write_snapshot(path, data, codec)
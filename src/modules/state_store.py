@@ -0,0 +1,321 @@
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .config_manager import ConfigManager
+from .logger import setup_logger
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS accounts (
+    email TEXT PRIMARY KEY,
+    id INTEGER,
+    password TEXT,
+    folder TEXT,
+    uploaded_count INTEGER NOT NULL DEFAULT 0,
+    position INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_accounts_id ON accounts(id);
+CREATE TABLE IF NOT EXISTS extraction_records (
+    folder TEXT NOT NULL,
+    original_filename TEXT NOT NULL,
+    artist TEXT,
+    title TEXT,
+    confidence TEXT,
+    position INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL,
+    PRIMARY KEY (folder, original_filename)
+);
+CREATE INDEX IF NOT EXISTS idx_extraction_folder_confidence ON extraction_records(folder, confidence);
+CREATE TABLE IF NOT EXISTS upload_events (
+    email TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    artist TEXT,
+    title TEXT,
+    upload_date TEXT,
+    status TEXT NOT NULL DEFAULT 'uploaded',
+    content_hash TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (email, filename)
+);
+CREATE TABLE IF NOT EXISTS upload_failures (
+    email TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    kind TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_failed TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (email, filename)
+);
+"""
+
+
+class StateStore:
+    """계정/추출 결과/업로드 기록을 하나의 SQLite DB로 관리하는 상태 저장소"""
+
+    def __init__(self, db_path: str = 'choom_state.db'):
+        self.logger = setup_logger(self.__class__.__name__, 'INFO')
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        # WAL: 읽기와 쓰기가 서로 막지 않음, 여러 프로세스 동시 접근 가능
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+        self.conn.commit()
+
+    def _migrate(self):
+        """이전 스키마로 만든 DB에 누락된 컬럼 추가"""
+        columns = {row['name'] for row in self.conn.execute('PRAGMA table_info(upload_events)')}
+        if 'status' not in columns:
+            self.conn.execute("ALTER TABLE upload_events ADD COLUMN status TEXT NOT NULL DEFAULT 'uploaded'")
+        if 'content_hash' not in columns:
+            self.conn.execute("ALTER TABLE upload_events ADD COLUMN content_hash TEXT")
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_upload_events_hash ON upload_events(email, content_hash)')
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    # ------------------------------------------------------------------
+    # 계정
+    # ------------------------------------------------------------------
+    def load_accounts(self) -> Dict:
+        """accounts.json과 같은 구조({'emails', 'password', 'mappings'})로 반환"""
+        with self._lock:
+            meta = {row['key']: json.loads(row['value'])
+                    for row in self.conn.execute("SELECT key, value FROM meta WHERE key IN ('emails', 'password')")}
+            rows = self.conn.execute(
+                'SELECT id, email, password, folder, uploaded_count FROM accounts ORDER BY position'
+            ).fetchall()
+
+        mappings = []
+        for row in rows:
+            mapping = {'email': row['email'], 'password': row['password'],
+                       'folder': row['folder'], 'uploaded_count': row['uploaded_count']}
+            if row['id'] is not None:
+                mapping = {'id': row['id'], **mapping}
+            mappings.append(mapping)
+        return {'emails': meta.get('emails', [m['email'] for m in mappings]),
+                'password': meta.get('password', []),
+                'mappings': mappings}
+
+    def save_accounts(self, data: Dict):
+        """accounts.json 구조 전체를 저장 (가져오기 용도)"""
+        with self._lock, self.conn:
+            for key in ('emails', 'password'):
+                if key in data:
+                    self.conn.execute('INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)',
+                                      (key, json.dumps(data[key], ensure_ascii=False)))
+            for position, mapping in enumerate(data.get('mappings', [])):
+                self.conn.execute(
+                    'INSERT OR REPLACE INTO accounts(email, id, password, folder, uploaded_count, position) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (mapping.get('email'), mapping.get('id'), mapping.get('password'),
+                     mapping.get('folder'), mapping.get('uploaded_count', 0), position)
+                )
+
+    def set_uploaded_count(self, email: str, count: int) -> bool:
+        """계정의 uploaded_count 갱신 (행 1개만 수정)"""
+        with self._lock, self.conn:
+            cursor = self.conn.execute('UPDATE accounts SET uploaded_count = ? WHERE email = ?', (count, email))
+        return cursor.rowcount > 0
+
+    def increment_uploaded_count(self, email: str) -> Optional[int]:
+        """계정의 uploaded_count를 1 증가시키고 새 값 반환"""
+        with self._lock, self.conn:
+            self.conn.execute('UPDATE accounts SET uploaded_count = uploaded_count + 1 WHERE email = ?', (email,))
+            row = self.conn.execute('SELECT uploaded_count FROM accounts WHERE email = ?', (email,)).fetchone()
+        return row['uploaded_count'] if row else None
+
+    # ------------------------------------------------------------------
+    # 추출 결과
+    # ------------------------------------------------------------------
+    def load_extraction_results(self) -> Dict[str, List[Dict]]:
+        """smart_extraction_results.json과 같은 구조로 전체 반환"""
+        results: Dict[str, List[Dict]] = {}
+        with self._lock:
+            rows = self.conn.execute(
+                'SELECT folder, data FROM extraction_records ORDER BY folder, position'
+            ).fetchall()
+        for row in rows:
+            results.setdefault(row['folder'], []).append(json.loads(row['data']))
+        return results
+
+    def get_folders(self) -> List[str]:
+        with self._lock:
+            return [row['folder'] for row in
+                    self.conn.execute('SELECT DISTINCT folder FROM extraction_records ORDER BY folder')]
+
+    def get_folder_records(self, folder: str) -> List[Dict]:
+        """특정 폴더의 추출 결과 (인덱스 조회)"""
+        with self._lock:
+            rows = self.conn.execute(
+                'SELECT data FROM extraction_records WHERE folder = ? ORDER BY position', (folder,)
+            ).fetchall()
+        return [json.loads(row['data']) for row in rows]
+
+    def has_folder(self, folder: str) -> bool:
+        with self._lock:
+            return self.conn.execute(
+                'SELECT 1 FROM extraction_records WHERE folder = ? LIMIT 1', (folder,)
+            ).fetchone() is not None
+
+    def high_confidence_count(self, folder: str) -> int:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT COUNT(*) AS n FROM extraction_records WHERE folder = ? AND confidence = 'high'", (folder,)
+            ).fetchone()
+        return row['n']
+
+    def replace_folder(self, folder: str, records: List[Dict]):
+        """폴더 하나의 추출 결과만 교체"""
+        with self._lock, self.conn:
+            self.conn.execute('DELETE FROM extraction_records WHERE folder = ?', (folder,))
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO extraction_records'
+                '(folder, original_filename, artist, title, confidence, position, data) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [(folder, r.get('original_filename', ''), r.get('artist'), r.get('title'), r.get('confidence'),
+                  position, json.dumps(r, ensure_ascii=False)) for position, r in enumerate(records)]
+            )
+
+    def delete_extraction_record(self, folder: str, filename: str) -> bool:
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                'DELETE FROM extraction_records WHERE folder = ? AND original_filename = ?', (folder, filename)
+            )
+        return cursor.rowcount > 0
+
+    # ------------------------------------------------------------------
+    # 업로드 기록
+    # ------------------------------------------------------------------
+    def record_upload(self, email: str, filename: str, info: Dict):
+        """업로드 기록 추가/갱신"""
+        with self._lock, self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO upload_events'
+                '(email, filename, artist, title, upload_date, status, content_hash, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (email, filename, info.get('artist'), info.get('title'),
+                 info.get('upload_date') or datetime.now().isoformat(), info.get('status', 'uploaded'),
+                 info.get('content_hash'), json.dumps(info, ensure_ascii=False))
+            )
+
+    def has_upload(self, email: str, filename: str) -> bool:
+        """업로드(또는 중복으로 건너뜀) 기록이 있는지 확인 - 실패 기록은 제외"""
+        with self._lock:
+            return self.conn.execute(
+                "SELECT 1 FROM upload_events WHERE email = ? AND filename = ? AND status != 'failed'", (email, filename)
+            ).fetchone() is not None
+
+    def has_content(self, email: str, content_hash: str) -> bool:
+        """같은 내용의 파일이 이 계정에서 이미 업로드되었는지 확인"""
+        with self._lock:
+            return self.conn.execute(
+                "SELECT 1 FROM upload_events WHERE email = ? AND content_hash = ? AND status = 'uploaded' LIMIT 1",
+                (email, content_hash)
+            ).fetchone() is not None
+
+    def upload_count(self, email: str) -> int:
+        """실제로 업로드된 개수 (실패/중복 건너뜀 기록 제외)"""
+        with self._lock:
+            return self.conn.execute(
+                "SELECT COUNT(*) AS n FROM upload_events WHERE email = ? AND status = 'uploaded'", (email,)
+            ).fetchone()['n']
+
+    def get_uploads(self, email: str) -> Dict[str, Dict]:
+        with self._lock:
+            rows = self.conn.execute(
+                'SELECT filename, data FROM upload_events WHERE email = ? ORDER BY upload_date', (email,)
+            ).fetchall()
+        return {row['filename']: json.loads(row['data']) for row in rows}
+
+    def load_uploads(self) -> Dict[str, Dict[str, Dict]]:
+        """uploaded_files.json과 같은 구조로 전체 반환"""
+        uploads: Dict[str, Dict[str, Dict]] = {}
+        with self._lock:
+            rows = self.conn.execute('SELECT email, filename, data FROM upload_events ORDER BY upload_date').fetchall()
+        for row in rows:
+            uploads.setdefault(row['email'], {})[row['filename']] = json.loads(row['data'])
+        return uploads
+
+    def remove_upload(self, email: str, filename: str) -> bool:
+        with self._lock, self.conn:
+            cursor = self.conn.execute('DELETE FROM upload_events WHERE email = ? AND filename = ?', (email, filename))
+        return cursor.rowcount > 0
+
+    # ------------------------------------------------------------------
+    # 실패 기록
+    # ------------------------------------------------------------------
+    def record_failure(self, email: str, filename: str, entry: Dict):
+        with self._lock, self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO upload_failures(email, filename, kind, attempts, last_failed, data) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (email, filename, entry.get('kind'), entry.get('attempts', 0), entry.get('last_failed'),
+                 json.dumps(entry, ensure_ascii=False))
+            )
+
+    def get_failure(self, email: str, filename: str) -> Optional[Dict]:
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT data FROM upload_failures WHERE email = ? AND filename = ?', (email, filename)
+            ).fetchone()
+        return json.loads(row['data']) if row else None
+
+    def clear_failure(self, email: str, filename: str) -> bool:
+        with self._lock, self.conn:
+            cursor = self.conn.execute('DELETE FROM upload_failures WHERE email = ? AND filename = ?', (email, filename))
+        return cursor.rowcount > 0
+
+    def load_failures(self) -> Dict[str, Dict[str, Dict]]:
+        failures: Dict[str, Dict[str, Dict]] = {}
+        with self._lock:
+            rows = self.conn.execute('SELECT email, filename, data FROM upload_failures ORDER BY last_failed').fetchall()
+        for row in rows:
+            failures.setdefault(row['email'], {})[row['filename']] = json.loads(row['data'])
+        return failures
+
+    # ------------------------------------------------------------------
+    # JSON 가져오기/내보내기
+    # ------------------------------------------------------------------
+    def import_json(self, accounts: Optional[Dict] = None, uploads: Optional[Dict[str, Dict[str, Dict]]] = None,
+                    extraction_results: Optional[Dict[str, List[Dict]]] = None) -> Dict[str, int]:
+        """기존 JSON 데이터를 한 번에 가져오기"""
+        counts = {'accounts': 0, 'uploads': 0, 'extraction_records': 0}
+        if accounts:
+            self.save_accounts(accounts)
+            counts['accounts'] = len(accounts.get('mappings', []))
+        if extraction_results:
+            for folder, records in extraction_results.items():
+                self.replace_folder(folder, records)
+                counts['extraction_records'] += len(records)
+        if uploads:
+            with self._lock, self.conn:
+                for email, files in uploads.items():
+                    self.conn.executemany(
+                        'INSERT OR REPLACE INTO upload_events'
+                        '(email, filename, artist, title, upload_date, status, content_hash, data) '
+                        'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                        [(email, filename, info.get('artist'), info.get('title'), info.get('upload_date'),
+                          info.get('status', 'uploaded'), info.get('content_hash'), json.dumps(info, ensure_ascii=False))
+                         for filename, info in files.items()]
+                    )
+                    counts['uploads'] += len(files)
+        return counts
+
+
+def open_state_store(config: ConfigManager) -> Optional[StateStore]:
+    """general.state_backend가 'sqlite'이면 StateStore를 열어 반환 (기본값 'json'이면 None)"""
+    if config.get('general', 'state_backend', 'json') != 'sqlite':
+        return None
+    return StateStore(config.get('general', 'state_db_path', 'choom_state.db'))
@@ -0,0 +1,158 @@
+import hashlib
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:
+    fuzz = process = None
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .gazetteer import normalize_term
+from .logger import setup_logger
+
+
+logger = setup_logger('TitleClustering', 'INFO')
+
+_PARENTHESES = re.compile(r"\s*[(\[（【][^)\]）】]*[)\]）】]\s*")
+_NON_WORD = re.compile(r"[^\w]+")
+_DIGITS = re.compile(r"\d+")
+
+# cdist 결과 행렬을 이 행 수 단위로 나눠 계산 (블록이 커도 메모리 사용량 제한)
+CDIST_ROWS = 2000
+
+
+def artist_block(artist: Optional[str], artist_mapping: Optional[Dict[str, str]] = None) -> str:
+    """블로킹 키 - 별칭은 대표 이름으로 바꾼 뒤 대소문자/공백/기호 차이 제거 ("LE SSERAFIM" = "le-sserafim")"""
+    if not artist:
+        return ''
+    if artist_mapping:
+        artist = artist_mapping.get(artist.strip(), artist)
+    return _NON_WORD.sub('', normalize_term(artist))
+
+
+def title_key(title: str) -> str:
+    """비교용 제목 - 괄호 속 부가 표기("Siren(사이렌)", "(1)")를 빼고 소문자/기호 정리 (괄호뿐이면 그대로 사용)"""
+    stripped = _PARENTHESES.sub(' ', title or '').strip() or (title or '')
+    return _NON_WORD.sub(' ', normalize_term(stripped)).strip()
+
+
+def song_id(block: str, key: str) -> str:
+    return 's' + hashlib.sha1(f"{block}\x1f{key}".encode('utf-8')).hexdigest()[:12]
+
+
+def _similar_pairs(keys: List[str], threshold: float, workers: int) -> Iterable[Tuple[int, int]]:
+    """유사도가 threshold 이상인 (i, j) 쌍 (i < j) - numpy가 있으면 process.cdist로 행렬 단위 계산"""
+    if numpy is not None:
+        for start in range(0, len(keys), CDIST_ROWS):
+            scores = process.cdist(keys[start:start + CDIST_ROWS], keys, scorer=fuzz.ratio,
+                                   score_cutoff=threshold, dtype=numpy.uint8, workers=workers)
+            for row, col in zip(*numpy.nonzero(scores)):
+                i = start + int(row)
+                if i < col:
+                    yield i, int(col)
+        return
+    for i, key in enumerate(keys):
+        for _, _, j in process.extract(key, keys[i + 1:], scorer=fuzz.ratio, score_cutoff=threshold, limit=None):
+            yield i, i + 1 + j
+
+
+def _same_numbers(a: str, b: str) -> bool:
+    """"Love 119" / "Love 118"처럼 숫자만 다른 제목은 다른 곡으로 취급"""
+    return _DIGITS.findall(a) == _DIGITS.findall(b)
+
+
+class TitleClusterer:
+    """아티스트별 블록 안에서 철자만 조금 다른 (artist, title)을 묶어 대표 ID(song_id) 부여
+
+    대소문자/괄호 속 별칭/"(1)" 사본 차이는 title_key에서 먼저 합쳐지고, 남은 철자 차이는
+    rapidfuzz ratio가 threshold 이상인 쌍을 union-find로 연결해 같은 곡으로 묶습니다.
+    대표 표기는 묶인 레코드에서 가장 많이 쓰인 아티스트/제목 철자입니다.
+    """
+
+    def __init__(self, threshold: float = 92, artist_mapping: Optional[Dict[str, str]] = None, workers: int = -1):
+        if process is None:
+            raise ImportError("rapidfuzz is required for title clustering (pip install rapidfuzz)")
+        self.threshold = threshold
+        self.artist_mapping = artist_mapping or {}
+        self.workers = workers
+        self.stats = {'records': 0, 'blocks': 0, 'songs': 0, 'merged_keys': 0}
+        # 철자가 여러 개였던 곡 (대표 표기, 합쳐진 철자 목록)
+        self.merges: List[Tuple[str, List[str]]] = []
+
+    def cluster(self, results: Dict[str, List[Dict]]) -> Dict[Tuple[str, str], Dict]:
+        """전체 추출 결과 → {(folder, original_filename): {song_id, canonical_artist, canonical_title}}"""
+        blocks: Dict[str, Dict[str, List[Tuple[str, str, Dict]]]] = {}
+        for folder, items in results.items():
+            for item in items:
+                if not item.get('title'):
+                    continue
+                block = artist_block(item.get('artist'), self.artist_mapping)
+                key = title_key(item['title'])
+                if key:
+                    blocks.setdefault(block, {}).setdefault(key, []).append((folder, item.get('original_filename', ''), item))
+
+        assignments = {}
+        self.stats = {'records': 0, 'blocks': len(blocks), 'songs': 0, 'merged_keys': 0}
+        self.merges = []
+        for block, by_key in blocks.items():
+            keys = sorted(by_key)
+            parent = list(range(len(keys)))
+
+            def find(i):
+                while parent[i] != i:
+                    parent[i] = parent[parent[i]]
+                    i = parent[i]
+                return i
+
+            if len(keys) > 1:
+                for i, j in _similar_pairs(keys, self.threshold, self.workers):
+                    if _same_numbers(keys[i], keys[j]):
+                        parent[find(j)] = find(i)
+
+            groups: Dict[int, List[str]] = {}
+            for index, key in enumerate(keys):
+                groups.setdefault(find(index), []).append(key)
+
+            for members in groups.values():
+                entries = [entry for key in members for entry in by_key[key]]
+                titles = Counter(item['title'].strip() for _, _, item in entries)
+                artists = Counter((item.get('artist') or '').strip() for _, _, item in entries)
+                # 가장 많이 쓰인 철자, 같으면 짧은 쪽
+                canonical_title = min(titles, key=lambda t: (-titles[t], len(t), t))
+                canonical_artist = min(artists, key=lambda a: (-artists[a], len(a), a)) or None
+                fields = {
+                    'song_id': song_id(block, title_key(canonical_title)),
+                    'canonical_artist': canonical_artist,
+                    'canonical_title': canonical_title,
+                }
+                for folder, filename, _ in entries:
+                    assignments[(folder, filename)] = fields
+                self.stats['records'] += len(entries)
+                self.stats['songs'] += 1
+                if len(titles) > 1:
+                    self.stats['merged_keys'] += len(members) - 1
+                    self.merges.append((f"{canonical_artist} - {canonical_title}", sorted(titles)))
+        logger.info(f"Clustered {self.stats['records']} records into {self.stats['songs']} songs "
+                    f"({self.stats['blocks']} artist blocks, {'cdist' if numpy is not None else 'extract'})")
+        return assignments
+
+
+def apply_song_ids(results: Dict[str, List[Dict]], assignments: Dict[Tuple[str, str], Dict]) -> List[str]:
+    """추출 결과에 song_id/canonical_* 필드 기록 → 바뀐 폴더 목록"""
+    changed = []
+    for folder, items in results.items():
+        folder_changed = False
+        for item in items:
+            fields = assignments.get((folder, item.get('original_filename', '')))
+            if fields and any(item.get(name) != value for name, value in fields.items()):
+                item.update(fields)
+                folder_changed = True
+        if folder_changed:
+            changed.append(folder)
+    return changed
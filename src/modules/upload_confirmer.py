@@ -0,0 +1,174 @@
+import queue
+import threading
+import time
+import urllib.error
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from .logger import setup_logger
+
+
+def _is_transient(error: Exception) -> bool:
+    """다시 조회하면 성공할 수 있는 오류인지 (404 등 엔드포인트 자체가 없거나 응답 형식이 다르면 기다려도 소용없음)"""
+    if isinstance(error, urllib.error.HTTPError):
+        return error.code in (408, 429) or error.code >= 500
+    return isinstance(error, (OSError, TimeoutError))
+
+
+class PendingUpload:
+    """확인 대기 중인 업로드 1건"""
+
+    def __init__(self, email: str, file_path: Path, artist: str, title: str, description: str,
+                 fetch_posts: Callable[[], List[Dict]]):
+        self.email = email
+        self.file_path = file_path
+        self.artist = artist
+        self.title = title
+        self.description = description
+        self.fetch_posts = fetch_posts
+        self.submitted_at = time.monotonic()
+        self.fetch_error: Optional[str] = None
+
+
+class UploadConfirmer:
+    """업로드 후 게시물이 실제로 생성되었는지 백그라운드 스레드에서 확인
+
+    Step 8 클릭 직후 upload_video가 True를 반환하면 watch()로 등록만 하고 메인 루프는 다음 파일로 진행합니다.
+    백그라운드 스레드가 계정의 게시물 목록을 주기적으로 조회해 같은 설명의 게시물을 찾으며,
+    결과(확인/실패)는 큐에 쌓였다가 메인 스레드의 apply_results()/drain()에서 업로드 기록과 실패 기록에 반영됩니다.
+    (브라우저 드라이버와 상태 파일은 메인 스레드에서만 사용)
+
+    게시물이 없다는 확실한 근거가 있을 때만 실패로 처리합니다: allow_failed(게시물 목록 출처가 실제 사이트에서
+    검증됨)이고, 마지막 조회가 성공했으며 목록이 비어 있지 않아야 합니다. 그 밖에는 'unknown'으로 남기고 업로드
+    기록은 바꾸지 않습니다. 엔드포인트가 없거나 응답 형식이 다르면 제한 시간까지 기다리지 않고 바로 'unknown'입니다.
+    """
+
+    def __init__(self, tracker, failure_ledger, poll_interval: float = 3.0, timeout: float = 60.0,
+                 allow_failed: bool = False):
+        self.logger = setup_logger(self.__class__.__name__, 'INFO')
+        self.tracker = tracker
+        self.failure_ledger = failure_ledger
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.allow_failed = allow_failed
+
+        self._pending: List[PendingUpload] = []
+        self._claimed_posts: Dict[str, set] = {}
+        self._results: "queue.Queue" = queue.Queue()
+        self._condition = threading.Condition()
+        self._stopped = False
+        self.stats = {'confirmed': 0, 'failed': 0, 'unknown': 0}
+        self._thread = threading.Thread(target=self._run, name='upload-confirmer', daemon=True)
+        self._thread.start()
+
+    def watch(self, email: str, file_path: Path, artist: str, title: str, description: str,
+              fetch_posts: Callable[[], List[Dict]]):
+        """업로드 확인 대상 등록 (바로 반환)"""
+        with self._condition:
+            self._pending.append(PendingUpload(email, file_path, artist, title, description, fetch_posts))
+            self._condition.notify()
+
+    def pending_count(self, email: Optional[str] = None) -> int:
+        with self._condition:
+            return sum(1 for item in self._pending if email is None or item.email == email)
+
+    def apply_results(self) -> int:
+        """백그라운드에서 나온 확인 결과를 업로드 기록에 반영 (메인 스레드에서 호출)"""
+        applied = 0
+        while True:
+            try:
+                outcome, item, post_id = self._results.get_nowait()
+            except queue.Empty:
+                return applied
+            applied += 1
+            self.stats[outcome] += 1
+            filename = item.file_path.name
+            if outcome == 'confirmed':
+                self.tracker.update_upload(item.email, filename, confirmed_at=time.strftime('%Y-%m-%dT%H:%M:%S'),
+                                           post_id=post_id)
+                self.logger.info(f"✅ Post confirmed for {item.email}: {filename} (post {post_id})")
+            elif outcome == 'failed':
+                # 업로드 개수에서 빼고 실패 기록에 남겨 재시도 단계에서 다시 업로드
+                self.tracker.update_upload(item.email, filename, status='failed')
+                self.failure_ledger.record_failure(item.email, item.file_path, item.artist, item.title,
+                                                   reason=f'post not found within {self.timeout:.0f}s after upload',
+                                                   step='confirm', error_type='UploadNotConfirmed')
+            else:
+                self.logger.warning(f"⚠️ Could not confirm post for {item.email}: {filename} ({item.fetch_error})")
+
+    def drain(self, email: Optional[str] = None):
+        """해당 계정(없으면 전체)의 확인이 모두 끝날 때까지 대기 - 로그아웃 전에 호출 (세션이 끊기면 조회 불가)"""
+        with self._condition:
+            self._condition.notify()
+            while any(email is None or item.email == email for item in self._pending):
+                self._condition.wait(self.poll_interval)
+        self.apply_results()
+
+    def close(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        self._thread.join(timeout=self.poll_interval + 1)
+        self.apply_results()
+        if any(self.stats.values()):
+            self.logger.info(f"Upload confirmation: {self.stats}")
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if self._stopped:
+                    return
+                if not self._pending:
+                    self._condition.wait()
+                    continue
+                pending = list(self._pending)
+            self._poll(pending)
+            with self._condition:
+                if self._pending and not self._stopped:
+                    self._condition.wait(self.poll_interval)
+
+    def _poll(self, pending: List[PendingUpload]):
+        """계정별로 게시물 목록을 한 번씩 조회해 대기 중인 업로드와 대조"""
+        by_email: Dict[str, List[PendingUpload]] = {}
+        for item in pending:
+            by_email.setdefault(item.email, []).append(item)
+
+        finished = []
+        for email, items in by_email.items():
+            try:
+                posts = items[-1].fetch_posts()
+            except Exception as e:
+                posts = None
+                for item in items:
+                    item.fetch_error = str(e)
+                if not _is_transient(e):
+                    finished.extend(('unknown', item, None) for item in items)
+                    continue
+
+            claimed = self._claimed_posts.setdefault(email, set())
+            for item in items:
+                post_id = self._find_post(posts or [], item.description, claimed)
+                if post_id is not None:
+                    claimed.add(post_id)
+                    finished.append(('confirmed', item, post_id))
+                elif time.monotonic() - item.submitted_at >= self.timeout:
+                    # 조회 실패, 빈 목록, 검증되지 않은 출처는 게시 여부를 알 수 없으므로 실패로 단정하지 않음
+                    missing_for_sure = self.allow_failed and bool(posts)
+                    if posts is not None and not missing_for_sure:
+                        item.fetch_error = f'post not found within {self.timeout:.0f}s (no positive evidence of failure)'
+                    finished.append(('failed' if missing_for_sure else 'unknown', item, None))
+
+        with self._condition:
+            for outcome in finished:
+                self._pending.remove(outcome[1])
+                self._results.put(outcome)
+            self._condition.notify_all()
+
+    @staticmethod
+    def _find_post(posts: List[Dict], description: str, claimed: set) -> Optional[str]:
+        expected = description.strip()
+        for post in posts:
+            post_id = str(post.get('post_id', post.get('id', '')))
+            if post_id not in claimed and (post.get('description') or '').strip() == expected:
+                return post_id
+        return None
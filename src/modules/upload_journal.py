@@ -0,0 +1,139 @@
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from .file_lock import FileLock
+from .logger import setup_logger
+from .state_codec import load_state, save_state
+
+
+class UploadJournal:
+    """업로드/실패 기록용 스냅샷(JSON) + 추가 전용 저널(JSONL) - {email: {filename: info}} 구조
+
+    - 기록 1건 = 저널에 한 줄 추가 (O(1)), fsync는 일정 건수/시간마다 묶어서 수행
+    - 시작 시 스냅샷을 읽고 저널을 재생하여 메모리 인덱스 재구성
+    - 저널이 커지면 스냅샷으로 압축 (임시 파일 + rename으로 원자적 교체)
+    - 추가/압축은 파일 잠금 안에서 수행하므로 여러 프로세스가 같은 파일을 공유해도 기록이 유실되지 않음
+    """
+
+    def __init__(self, snapshot_file: Path, journal_file: Optional[Path] = None,
+                 fsync_every: int = 20, fsync_interval: float = 5.0, compact_threshold: int = 1000):
+        self.logger = setup_logger(self.__class__.__name__, 'INFO')
+        self.snapshot_file = Path(snapshot_file)
+        self.journal_file = Path(journal_file) if journal_file else self.snapshot_file.with_suffix('.jsonl')
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.compact_threshold = compact_threshold
+        self.lock = FileLock(self.snapshot_file)
+
+        self.journal_entries = 0
+        self._handle = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def load(self) -> Dict[str, Dict[str, Dict]]:
+        """스냅샷 로드 후 저널 재생"""
+        with self.lock:
+            return self._read()
+
+    def _read(self) -> Dict[str, Dict[str, Dict]]:
+        data: Dict[str, Dict[str, Dict]] = {}
+        if self.snapshot_file.exists():
+            try:
+                data = load_state(self.snapshot_file, {})
+            except Exception as e:
+                self.logger.error(f"Failed to load snapshot {self.snapshot_file}: {str(e)}")
+
+        self.journal_entries = 0
+        if self.journal_file.exists():
+            with self.journal_file.open('r', encoding='utf-8') as f:
+                for line_no, line in enumerate(f, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # 기록 도중 중단되어 잘린 마지막 줄은 무시
+                        self.logger.warning(f"Skipping corrupt journal line {line_no} in {self.journal_file}")
+                        continue
+                    self.apply(data, record)
+                    self.journal_entries += 1
+            if self.journal_entries:
+                self.logger.info(f"Replayed {self.journal_entries} journal entries from {self.journal_file}")
+        return data
+
+    @staticmethod
+    def apply(data: Dict[str, Dict[str, Dict]], record: Dict):
+        """저널 레코드 1건을 메모리 데이터에 반영"""
+        op = record.get('op', 'upload')
+        email = record.get('email')
+        filename = record.get('filename')
+        if not email or not filename:
+            return
+        if op in ('upload', 'set'):
+            data.setdefault(email, {})[filename] = record.get('info', {})
+        elif op == 'remove':
+            data.get(email, {}).pop(filename, None)
+
+    def append(self, record: Dict):
+        """저널에 레코드 1건 추가"""
+        line = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+        with self.lock:
+            if self._handle is None:
+                self.journal_file.parent.mkdir(parents=True, exist_ok=True)
+                # 추가 모드: 다른 프로세스가 저널을 비워도 항상 현재 파일 끝에 기록
+                self._handle = self.journal_file.open('a+b')
+            self._handle.seek(0, os.SEEK_END)
+            if self._handle.tell():
+                self._handle.seek(-1, os.SEEK_END)
+                if self._handle.read(1) != b'\n':
+                    # 잘린 마지막 줄 뒤에 이어 쓰지 않도록 줄바꿈 보정
+                    line = b'\n' + line
+            self._handle.write(line)
+            self._handle.flush()
+        self.journal_entries += 1
+        self._unsynced += 1
+
+        if self._unsynced >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.sync()
+
+    def sync(self):
+        """버퍼링된 저널 기록을 디스크에 fsync"""
+        if self._handle is not None and self._unsynced:
+            os.fsync(self._handle.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def should_compact(self) -> bool:
+        return self.journal_entries >= self.compact_threshold
+
+    def compact(self) -> Dict[str, Dict[str, Dict]]:
+        """디스크의 스냅샷 + 저널을 다시 읽어 스냅샷으로 원자적으로 저장하고 저널 비우기
+
+        모든 변경은 저널에 먼저 기록되므로 디스크 내용이 기준이며, 다른 프로세스의 기록도 함께 병합됨.
+        병합된 전체 데이터를 반환.
+        """
+        with self.lock:
+            self.sync()
+            data = self._read()
+            save_state(self.snapshot_file, data, fsync=True)
+
+            # 스냅샷이 안전하게 기록된 뒤에만 저널 비우기 (다른 프로세스가 열어둔 핸들이 있으므로 삭제 대신 truncate)
+            if self.journal_file.exists():
+                os.truncate(self.journal_file, 0)
+        self.journal_entries = 0
+        self._unsynced = 0
+        self.logger.info(f"Compacted upload journal into {self.snapshot_file}")
+        return data
+
+    def close(self, compact: bool = True):
+        """남은 기록 fsync 후 (이 프로세스가 기록한 내용이 있으면) 스냅샷으로 압축"""
+        self.sync()
+        if compact and self.journal_entries:
+            self.compact()
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
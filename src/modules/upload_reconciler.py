@@ -0,0 +1,152 @@
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from .logger import setup_logger
+
+
+# 게시물 설명은 "{artist} - {title} dance cover #tag #tag #tag" 형식 (main.generate_dynamic_description)
+DESCRIPTION_PATTERN = re.compile(r'^(.*?)\s+dance cover\b', re.IGNORECASE | re.DOTALL)
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+def _normalize(text: str) -> str:
+    return WHITESPACE_PATTERN.sub(' ', text).strip().casefold()
+
+
+def post_key(artist: Optional[str], title: Optional[str]) -> str:
+    """업로드 기록(artist, title)을 게시물 설명과 비교할 수 있는 키로 변환 (업로드 시 설명 생성 규칙과 동일)"""
+    title = title or ''
+    display_artist = artist if artist and artist.lower() != 'null' else title
+    return _normalize(f"{display_artist} - {title}")
+
+
+def description_key(description: str) -> Optional[str]:
+    """게시물 설명에서 "artist - title" 부분을 키로 추출 (형식이 다르면 None)"""
+    match = DESCRIPTION_PATTERN.match(description or '')
+    return _normalize(match.group(1)) if match else None
+
+
+class UploadReconciler:
+    """계정에 실제로 게시된 영상 목록과 업로드 기록(uploaded_files.json / uploaded_count)을 대조
+
+    - 기록에는 있지만 사이트에 없는 업로드: 기록에서 삭제해 다음 실행에서 다시 업로드
+    - 사이트에는 있지만 기록에 없는 게시물: 같은 곡의 폴더 파일을 업로드된 것으로 기록
+    apply=False이면 차이만 보고하고 아무것도 바꾸지 않음
+
+    게시물 목록을 잘못 읽으면 (선택자/API 불일치 등) 모든 기록이 누락으로 보이므로, 목록이 비어 있거나
+    기록의 max_remove_ratio를 넘게 삭제하게 되면 force=True가 아닌 한 적용하지 않음
+    """
+
+    def __init__(self, tracker, account_manager, smart_file_manager, failure_ledger=None):
+        self.logger = setup_logger(self.__class__.__name__, 'INFO')
+        self.tracker = tracker
+        self.account_manager = account_manager
+        self.smart_file_manager = smart_file_manager
+        self.failure_ledger = failure_ledger
+
+    def reconcile(self, email: str, folder: str, posts: List[Dict], apply: bool = False,
+                  force: bool = False, max_remove_ratio: float = 0.2) -> Dict:
+        """
+        계정 하나 대조
+        Returns: {'posted', 'tracked', 'missing_on_site', 'untracked_posts', 'recovered', 'unmatched_posts',
+                  'applied', 'refused'} - refused: 적용을 거부한 이유 (없으면 None)
+        """
+        posted_keys: Dict[str, List[Dict]] = defaultdict(list)
+        unparsed = []
+        for post in posts:
+            key = description_key(post.get('description', ''))
+            if key is None:
+                unparsed.append(post)
+            else:
+                posted_keys[key].append(post)
+
+        tracked_keys: Dict[str, List[str]] = defaultdict(list)
+        tracked = {
+            filename: info for filename, info in self.tracker.get_uploaded_files(email).items()
+            if info.get('status', 'uploaded') == 'uploaded'
+        }
+        # 오래된 기록부터 게시물과 짝지어 남는 (가장 최근) 기록을 누락으로 판단
+        for filename, info in sorted(tracked.items(), key=lambda item: item[1].get('upload_date', '')):
+            tracked_keys[post_key(info.get('artist'), info.get('title'))].append(filename)
+
+        missing_on_site = []
+        untracked: Dict[str, int] = {}
+        for key in set(posted_keys) | set(tracked_keys):
+            difference = len(tracked_keys.get(key, [])) - len(posted_keys.get(key, []))
+            if difference > 0:
+                missing_on_site.extend(tracked_keys[key][-difference:])
+            elif difference < 0:
+                untracked[key] = -difference
+
+        recovered = self._match_untracked(email, folder, untracked, set(tracked))
+        unmatched_posts = sum(untracked.values()) - len(recovered) + len(unparsed)
+
+        report = {
+            'email': email,
+            'posted': len(posts),
+            'tracked': len(tracked),
+            'missing_on_site': sorted(missing_on_site),
+            'untracked_posts': sum(untracked.values()) + len(unparsed),
+            'recovered': [filename for filename, _, _ in recovered],
+            'unmatched_posts': unmatched_posts,
+            'applied': False,
+            'refused': None,
+        }
+
+        if not missing_on_site and not recovered:
+            self.logger.info(f"✅ {email}: {len(posts)} posts match {len(tracked)} tracked uploads")
+            return report
+
+        self.logger.warning(f"⚠️ {email}: {len(missing_on_site)} tracked uploads missing on site, "
+                            f"{report['untracked_posts']} untracked posts ({len(recovered)} matched to files)")
+        if apply:
+            report['refused'] = self._refusal(posts, tracked, missing_on_site, force, max_remove_ratio)
+            if report['refused']:
+                self.logger.error(f"🛑 {email}: not applying - {report['refused']}")
+            else:
+                self._apply(email, missing_on_site, recovered)
+                report['applied'] = True
+        return report
+
+    @staticmethod
+    def _refusal(posts: List[Dict], tracked: Dict, missing_on_site: List[str],
+                 force: bool, max_remove_ratio: float) -> Optional[str]:
+        """기록을 지우기에 근거가 부족하면 그 이유 (빈 목록은 force로도 적용하지 않음)"""
+        if not posts and tracked:
+            return "post list is empty, cannot tell missing posts from a failed fetch"
+        allowed = max(1, int(len(tracked) * max_remove_ratio))
+        if len(missing_on_site) > allowed and not force:
+            return (f"would remove {len(missing_on_site)} of {len(tracked)} records "
+                    f"(limit {allowed}, use --force to override)")
+        return None
+
+    def _match_untracked(self, email: str, folder: str, untracked: Dict[str, int], tracked_files: set) -> List:
+        """기록에 없는 게시물을 폴더의 (아직 기록되지 않은) 파일과 짝지음"""
+        if not untracked:
+            return []
+        remaining = dict(untracked)
+        matched = []
+        for file_path, artist, title, _ in self.smart_file_manager.get_folder_videos(folder):
+            if file_path.name in tracked_files:
+                continue
+            upload_artist = artist if artist and artist.lower() != 'null' else ''
+            key = post_key(upload_artist, title)
+            if remaining.get(key, 0) > 0:
+                remaining[key] -= 1
+                matched.append((file_path.name, upload_artist, title))
+        return matched
+
+    def _apply(self, email: str, missing_on_site: List[str], recovered: List):
+        for filename in missing_on_site:
+            self.tracker.remove_upload(email, filename)
+        for filename, artist, title in recovered:
+            self.tracker.mark_as_uploaded(email, filename, artist, title)
+            if self.failure_ledger:
+                self.failure_ledger.clear(email, filename)
+
+        count = self.tracker.get_uploaded_count(email)
+        self.account_manager.update_uploaded_count(email, count)
+        self.account_manager.flush()
+        self.logger.info(f"🔧 {email}: removed {len(missing_on_site)} records, "
+                         f"recovered {len(recovered)} records, uploaded_count → {count}")
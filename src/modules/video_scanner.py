@@ -0,0 +1,122 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .file_lock import FileLock
+from .logger import setup_logger
+from .state_codec import load_state, save_state
+
+
+VIDEO_EXTENSIONS = frozenset({'.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv'})
+
+# mtime이 이 시간 안쪽인 폴더는 캐시에 저장하지 않음 (mtime 단위가 큰 NAS에서 같은 초 안의 변경을 놓치지 않도록)
+RACY_WINDOW_NS = 2_000_000_000
+
+
+def is_video_file(name: str) -> bool:
+    """확장자 대소문자 구분 없이 비디오 파일인지 ("a.MP4", "b.Mkv" 포함)"""
+    return os.path.splitext(name)[1].lower() in VIDEO_EXTENSIONS
+
+
+def list_video_files(folder_path: Path) -> List[str]:
+    """폴더의 비디오 파일 이름 (os.scandir 한 번, 이름순)"""
+    with os.scandir(folder_path) as entries:
+        return sorted(entry.name for entry in entries if is_video_file(entry.name) and entry.is_file())
+
+
+class VideoScanner:
+    """choom 폴더의 하위 폴더별 비디오 파일 목록 - (폴더 → mtime, 파일 목록) 캐시로 바뀌지 않은 폴더는 다시 나열하지 않음
+
+    폴더 안에서 파일이 추가/삭제/이름 변경되면 폴더 mtime이 바뀌므로 mtime만 비교합니다.
+    폴더 stat/나열은 NAS 왕복 지연을 겹치도록 스레드 풀에서 실행합니다.
+    """
+
+    def __init__(self, cache_file: Optional[str] = 'logs/video_scan_cache.json', workers: int = 8):
+        self.logger = setup_logger(self.__class__.__name__, 'INFO')
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.workers = max(1, workers)
+        self.entries: Dict[str, Dict] = self._load()
+        self.stats = {'folders': 0, 'listed': 0, 'cached': 0}
+        self._dirty = False
+        self._removed: List[str] = []
+
+    def _load(self) -> Dict[str, Dict]:
+        if not self.cache_file:
+            return {}
+        try:
+            return load_state(self.cache_file, {})
+        except Exception as e:
+            self.logger.warning(f"Failed to load video scan cache, starting fresh: {str(e)}")
+            return {}
+
+    def scan(self, base_path: Path) -> List[Tuple[str, List[str]]]:
+        """하위 폴더별 (폴더명, 비디오 파일 목록) - 폴더명 순"""
+        base_path = Path(base_path).absolute()
+        with os.scandir(base_path) as entries:
+            folders = sorted(Path(entry.path) for entry in entries if entry.is_dir())
+        started_ns = time.time_ns()
+        with ThreadPoolExecutor(max_workers=min(self.workers, max(1, len(folders)))) as pool:
+            scanned = list(pool.map(lambda folder: self._scan_folder(folder, started_ns), folders))
+
+        self.stats = {'folders': len(folders), 'listed': 0, 'cached': 0}
+        seen = set()
+        results = []
+        for folder, (files, entry) in zip(folders, scanned):
+            key = str(folder)
+            seen.add(key)
+            if entry is None:
+                self.stats['cached'] += 1
+            else:
+                self.stats['listed'] += 1
+                if entry is not False:
+                    self.entries[key] = entry
+                    self._dirty = True
+                elif self.entries.pop(key, None) is not None:
+                    self._removed.append(key)
+                    self._dirty = True
+            results.append((folder.name, files))
+
+        # 사라진 하위 폴더의 캐시 항목 정리
+        for key in [key for key in self.entries if Path(key).parent == base_path and key not in seen]:
+            del self.entries[key]
+            self._removed.append(key)
+            self._dirty = True
+
+        self.logger.info(f"Scanned {self.stats['folders']} folders under {base_path} "
+                         f"({self.stats['listed']} listed, {self.stats['cached']} unchanged)")
+        self.save()
+        return results
+
+    def _scan_folder(self, folder: Path, started_ns: int):
+        """(파일 목록, 새 캐시 항목) - 캐시를 그대로 쓰면 항목 None, 캐시에 저장하면 안 되는 결과면 False"""
+        try:
+            mtime_ns = folder.stat().st_mtime_ns
+            cached = self.entries.get(str(folder))
+            if cached and cached.get('mtime_ns') == mtime_ns:
+                return cached['files'], None
+            files = list_video_files(folder)
+        except OSError as e:
+            self.logger.warning(f"Failed to scan {folder}: {str(e)}")
+            return [], False
+        if started_ns - mtime_ns < RACY_WINDOW_NS:
+            return files, False
+        return files, {'mtime_ns': mtime_ns, 'files': files}
+
+    def save(self):
+        """변경 사항이 있으면 캐시 저장 (다른 프로세스가 추가한 항목과 병합)"""
+        if not self._dirty or not self.cache_file:
+            return
+        try:
+            with FileLock(self.cache_file):
+                merged = load_state(self.cache_file, {})
+                merged.update(self.entries)
+                for key in self._removed:
+                    merged.pop(key, None)
+                save_state(self.cache_file, merged)
+                self.entries = merged
+            self._dirty = False
+            self._removed = []
+        except Exception as e:
+            self.logger.error(f"Failed to save video scan cache: {str(e)}")
@@ -5,17 +5,61 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from time import sleep
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, List, Optional
+import json
 import time
+import urllib.request
 
 from .config_manager import ConfigManager
+from .driver_recorder import DriverFlightRecorder
+from .failure_capture import FailureCapture
 from .logger import setup_logger
 
 
+# 프로필 페이지의 게시물 목록을 한 번의 왕복으로 수집
+POSTS_SCRIPT = """
+const itemSelector = arguments[0];
+const descriptionSelector = arguments[1];
+return Array.from(document.querySelectorAll(itemSelector)).map(function (item) {
+    const description = item.querySelector(descriptionSelector);
+    return {
+        post_id: item.getAttribute('data-post-id'),
+        description: (description || item).textContent.trim()
+    };
+});
+"""
+
+# 로그인된 페이지 컨텍스트에서 게시물 API 호출 (세션 쿠키 그대로 사용)
+POSTS_API_SCRIPT = """
+const done = arguments[arguments.length - 1];
+fetch(arguments[0], {credentials: 'same-origin'})
+    .then(function (response) { return response.json(); })
+    .then(function (data) { done({posts: data.posts || data}); })
+    .catch(function (error) { done({error: String(error)}); });
+"""
+
+
+def _normalize_posts(posts: List[Dict]) -> List[Dict]:
+    return [{'post_id': str(p.get('post_id', p.get('id', ''))), 'description': p.get('description', '')} for p in posts]
+
+
+def _posts_from_payload(data) -> List[Dict]:
+    """게시물 API 응답에서 게시물 목록 추출 - posts 목록이 없는 응답은 '게시물 0개'가 아니라 알 수 없음이므로 예외"""
+    posts = data.get('posts') if isinstance(data, dict) else data
+    if not isinstance(posts, list) or not all(isinstance(p, dict) for p in posts):
+        raise ValueError(f"Unexpected post list payload: {str(data)[:200]}")
+    return _normalize_posts(posts)
+
+
 class WebAutomator:
     def __init__(self, config: ConfigManager):
         self.config = config
         self.logger = setup_logger(self.__class__.__name__, config.get('general', 'log_level', 'INFO'))
+        # 업로드 사이트 주소 (오프라인 벤치마크 시 mock 사이트로 교체 가능)
+        self.base_url = config.get('web_automation', 'base_url', 'https://app.hanlim.world').rstrip('/')
+        # 요소 탐색 기본 타임아웃/재시도 횟수 (장애 주입 스윕으로 조정)
+        self.element_timeout = config.get('web_automation', 'element_timeout', 10)
+        self.element_retries = max(1, config.get('web_automation', 'element_retries', 3))
         
         # ✅ Chrome 옵션 설정 (WebGL & GPU 최적화)
         options = Options()
@@ -65,18 +109,42 @@ class WebAutomator:
         }
         options.add_experimental_option("mobileEmulation", mobile_emulation)
 
+        # ✅ 실패 캡처 시 브라우저 콘솔 로그 수집
+        capture_failures = config.get('web_automation', 'failure_capture', True)
+        if capture_failures:
+            options.set_capability('goog:loggingPrefs', {'browser': 'ALL'})
+
         # ✅ Chrome 드라이버 초기화
         self.driver = webdriver.Chrome(options=options)
         self.driver.set_window_size(1920, 1080)  # 렌더링 공간 확보
         self.driver.implicitly_wait(config.get('web_automation', 'implicit_wait', 10))
 
+        # ✅ WebDriver 명령 플라이트 레코더 (선택)
+        self.recorder = None
+        if config.get('web_automation', 'flight_recorder', False):
+            self.recorder = DriverFlightRecorder(
+                self.driver, capacity=config.get('web_automation', 'flight_recorder_size', 2000)
+            )
+            self.logger.info("🛩️ WebDriver flight recorder enabled")
+
+        # ✅ 실패 캡처 (스크린샷 + DOM + 콘솔 + 네트워크, 비동기 저장)
+        self.failure_capture = None
+        if capture_failures:
+            self.failure_capture = FailureCapture(
+                self.driver, max_entries=config.get('web_automation', 'failure_capture_max_entries', 50)
+            )
+
+        # 마지막 업로드의 진행 단계와 실패 정보 (실패 기록/재시도 판단용)
+        self.current_step: Optional[str] = None
+        self.last_failure: Optional[Dict] = None
+
         self.logger.info("✅ Chrome initialized with WebGL & GPU enabled")
     
 
     def login_with_account(self, email: str, password: str):
         """특정 계정으로 로그인"""
         self.logger.info(f'Starting login process for: {email}')
-        self.driver.get('https://app.hanlim.world/signin')
+        self.driver.get(f'{self.base_url}/signin')
         
         # 먼저 모달 닫기
         try:
@@ -212,7 +280,7 @@ class WebAutomator:
             self.logger.error(f'❌ Logout failed: {str(e)}')
             # 최후의 수단: 로그인 페이지로 강제 이동
             self.logger.info('🔄 Force logout by navigating to signin page')
-            self.driver.get('https://app.hanlim.world/signin')
+            self.driver.get(f'{self.base_url}/signin')
         
         self.logger.info('🏁 Logout process completed')
         
@@ -321,8 +389,11 @@ class WebAutomator:
             self.logger.debug(f'Upload completion check error: {str(e)}')
             # 에러가 발생해도 계속 진행 (최대 3초만 소요)
 
-    def _find_element_safely(self, selector: str, timeout: int = 10, description: str = "", fast_mode: bool = False):
+    def _find_element_safely(self, selector: str, timeout: Optional[int] = None, description: str = "", fast_mode: bool = False):
         """Safely find element with retry logic to avoid stale element issues"""
+        if timeout is None:
+            timeout = self.element_timeout
+        
         if fast_mode:
             # 빠른 모드: 요소가 존재하기만 하면 바로 반환 (클릭 가능 여부 무시)
             try:
@@ -336,7 +407,7 @@ class WebAutomator:
                 raise e
         
         # 일반 모드: 기존 로직
-        for attempt in range(3):
+        for attempt in range(self.element_retries):
             try:
                 element = WebDriverWait(self.driver, timeout).until(
                     EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
@@ -344,11 +415,11 @@ class WebAutomator:
                 self.logger.info(f'Element found{f" ({description})" if description else ""}: {selector}')
                 return element
             except Exception as e:
-                if attempt < 2:
+                if attempt < self.element_retries - 1:
                     self.logger.warning(f'Attempt {attempt + 1} failed for {selector}: {str(e)}, retrying...')
                     sleep(1)
                 else:
-                    self.logger.error(f'Failed to find element after 3 attempts: {selector}')
+                    self.logger.error(f'Failed to find element after {self.element_retries} attempts: {selector}')
                     raise e
 
     def _click_element_safely(self, element, description: str = ""):
@@ -361,6 +432,15 @@ class WebAutomator:
             self.driver.execute_script("arguments[0].click();", element)
             self.logger.info(f'JavaScript click successful{f" for {description}" if description else ""}')
 
+    def _capture_failure(self, label: str, error: Exception):
+        """실패 상태 캡처 (같은 예외는 한 번만 캡처)"""
+        if not self.failure_capture or getattr(error, '_failure_captured', False):
+            return
+        try:
+            self.failure_capture.capture(label, error)
+            error._failure_captured = True
+        except Exception as capture_error:
+            self.logger.debug(f'Failure capture skipped: {str(capture_error)}')
     
     def search_song(self, query: str) -> None:
         try:
@@ -496,18 +576,102 @@ class WebAutomator:
             
         except Exception as e:
             self.logger.error(f'Error during song search: {str(e)}')
-            # JavaScript로 페이지 내용 확인
-            page_content = self.driver.execute_script("""
-            return {
-                body: document.body.innerHTML.substring(0, 1000),
-                searchBox: document.querySelector('.upload-step-1-search-container input') ? 'found' : 'not found',
-                searchValue: document.querySelector('.upload-step-1-search-container input')?.value || 'no value'
-            };
-            """)
-            self.logger.info(f'Page debug info: {page_content}')
+            # 스크린샷/DOM/콘솔/네트워크를 비동기로 저장
+            self._capture_failure(f'search_song {query}', e)
             raise
 
+    def dump_flight_recorder(self, reason: str = 'manual') -> Optional[Path]:
+        """플라이트 레코더 버퍼를 파일로 저장 (레코더 비활성 시 None)"""
+        if not self.recorder:
+            return None
+        return self.recorder.dump(reason)
+
+    def list_posted_videos(self, source: str = 'profile', max_scrolls: int = 50) -> List[Dict]:
+        """
+        현재 로그인된 계정이 게시한 영상 목록을 한 번에 수집
+        source='profile': 프로필 페이지를 끝까지 스크롤한 뒤 DOM에서 추출
+        source='api': 페이지 컨텍스트에서 게시물 API를 직접 호출
+        Returns: [{'post_id', 'description'}, ...]
+        """
+        if source == 'api':
+            api_path = self.config.get('web_automation', 'posts_api_path', '/api/posts')
+            result = self.driver.execute_async_script(POSTS_API_SCRIPT, api_path) or {}
+            if result.get('error'):
+                raise RuntimeError(f"Post list API failed: {result['error']}")
+            posts = _posts_from_payload(result)
+            self.logger.info(f'Fetched {len(posts)} posts from {api_path}')
+            return posts
+        
+        profile_path = self.config.get('web_automation', 'profile_path', '/profile')
+        item_selector = self.config.get('web_automation', 'post_item_selector', '.post-item')
+        description_selector = self.config.get('web_automation', 'post_description_selector', '.post-description')
+        
+        self.driver.get(f'{self.base_url}{profile_path}')
+        WebDriverWait(self.driver, self.element_timeout).until(
+            EC.presence_of_element_located((By.TAG_NAME, 'body'))
+        )
+        # 무한 스크롤 목록: 개수가 더 늘지 않을 때까지 스크롤
+        previous_count = -1
+        for _ in range(max_scrolls):
+            count = self.driver.execute_script('return document.querySelectorAll(arguments[0]).length;', item_selector)
+            if count == previous_count:
+                break
+            previous_count = count
+            self.driver.execute_script('window.scrollTo(0, document.body.scrollHeight);')
+            sleep(0.5)
+        
+        posts = self.driver.execute_script(POSTS_SCRIPT, item_selector, description_selector) or []
+        self.logger.info(f'Collected {len(posts)} posts from {profile_path}')
+        return posts
+
+    def post_list_fetcher(self) -> Callable[[], List[Dict]]:
+        """
+        다른 스레드에서 게시물 목록을 조회하는 함수 반환 (로그인 직후 호출)
+        WebDriver는 스레드 안전하지 않으므로 드라이버 대신 현재 브라우저 세션 쿠키로 게시물 API에 직접 요청
+        """
+        api_url = f"{self.base_url}{self.config.get('web_automation', 'posts_api_path', '/api/posts')}"
+        cookie_header = '; '.join(f"{c['name']}={c['value']}" for c in self.driver.get_cookies())
+        timeout = self.element_timeout
+        
+        def fetch_posts() -> List[Dict]:
+            request = urllib.request.Request(api_url, headers={'Cookie': cookie_header, 'Accept': 'application/json'})
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                data = json.loads(response.read())
+            return _posts_from_payload(data)
+        
+        return fetch_posts
+
+    def _record_failure(self, error: Exception):
+        """실패 단계/원인을 last_failure에 기록 (호출 측의 실패 기록/재시도 판단용)"""
+        self.last_failure = {
+            'step': self.current_step,
+            'reason': str(error).strip().split('\n')[0][:500],
+            'error_type': type(error).__name__,
+        }
+
     def upload_video(self, file_path: Path, artist: str, title: str, description: str, tracker=None) -> bool:
+        self.current_step = None
+        self.last_failure = None
+        if not self.recorder:
+            return self._upload_video(file_path, artist, title, description, tracker)
+        
+        # 업로드별 WebDriver 명령 수/소요 시간 집계
+        self.recorder.start_span(file_path.name)
+        success = False
+        try:
+            success = self._upload_video(file_path, artist, title, description, tracker)
+            return success
+        finally:
+            summary = self.recorder.end_span()
+            self.logger.info(
+                f"🛩️ Driver summary for {file_path.name}: {summary['commands']} commands, "
+                f"{summary['driver_seconds']}s in driver, {summary['other_seconds']}s waiting/other "
+                f"(top: {summary['top_commands']})"
+            )
+            if not success:
+                self.recorder.dump('upload_failed')
+
+    def _upload_video(self, file_path: Path, artist: str, title: str, description: str, tracker=None) -> bool:
         try:
             # 검색 쿼리 생성 (artist가 빈 문자열이면 title만 사용)
             if artist and artist.strip():
@@ -527,9 +691,11 @@ class WebAutomator:
             # self.open_upload_page()
             
             # Step 2: Search for song
+            self.current_step = '1'
             self.search_song(search_query)
             
             # Step 3: Scroll down to reveal next button and click
+            self.current_step = '3'
             self.logger.info('Step 3: Scrolling down to reveal next button')
             
             # 페이지 끝까지 스크롤
@@ -550,6 +716,7 @@ class WebAutomator:
             self._click_element_safely(next_btn, "next button")
             
             # Step 4: Click import/gallery button
+            self.current_step = '4'
             self.logger.info('Step 4: Finding gallery/import button')
             import_btn = self._find_element_safely(
                 '.gallery-banner, button.import, button[class*="import"], button[class*="gallery"]',
@@ -559,6 +726,7 @@ class WebAutomator:
             self.logger.info('Step 4: File dialog opened')
             
             # Step 5: Upload file
+            self.current_step = '5'
             self.logger.info('Step 5: Finding file input element')
             file_input = WebDriverWait(self.driver, 10).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, 'input[type="file"]'))
@@ -573,6 +741,7 @@ class WebAutomator:
             self._wait_for_file_upload_completion()
             
             # Step 6: Click next to proceed to description
+            self.current_step = '6'
             self.logger.info('Step 6: Finding next button after file upload')
             next_btn = self._find_element_safely(
                 '.next-step-button, button.next, button[class*="next"]',
@@ -582,6 +751,7 @@ class WebAutomator:
             self.logger.info('Step 6: Moved to description step')
             
             # Step 7: Enter description
+            self.current_step = '7'
             self.logger.info('Step 7: Finding description textarea')
             desc_area = self._find_element_safely(
                 'textarea.description, textarea[class*="description"], textarea',
@@ -592,6 +762,7 @@ class WebAutomator:
             self.logger.info('Step 7: Description entered')
             
             # Step 8: Final upload
+            self.current_step = '8'
             self.logger.info('Step 8: Finding final upload button')
             upload_btn = self._find_element_safely(
                 '.next-step-button, button.submit, button[class*="submit"], button[class*="upload"]',
@@ -609,6 +780,8 @@ class WebAutomator:
         
         except Exception as e:
             self.logger.error(f'Upload failed for {file_path.name}: {str(e)}')
+            self._capture_failure(f'upload {file_path.name}', e)
+            self._record_failure(e)
             
             # 업로드 실패 시 복구 시도
             try:
@@ -634,6 +807,7 @@ class WebAutomator:
                     
             except Exception as recovery_error:
                 self.logger.error(f'🔄 Recovery attempt failed: {str(recovery_error)}')
+                self._record_failure(recovery_error)
             
             return False
 
@@ -641,6 +815,7 @@ class WebAutomator:
         """복구 후 업로드 재시도"""
         try:
             # Step 3: Scroll down to reveal next button and click
+            self.current_step = 'recovery 3'
             self.logger.info('Recovery Step 3: Scrolling down to reveal next button')
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
             sleep(1)
@@ -654,6 +829,7 @@ class WebAutomator:
             self._click_element_safely(next_btn, "next button")
             
             # Step 4: Click import/gallery button
+            self.current_step = 'recovery 4'
             self.logger.info('Recovery Step 4: Finding gallery/import button')
             import_btn = self._find_element_safely(
                 '.gallery-banner, button.import, button[class*="import"], button[class*="gallery"]',
@@ -662,6 +838,7 @@ class WebAutomator:
             self._click_element_safely(import_btn, "gallery button")
             
             # Step 5: Upload file
+            self.current_step = 'recovery 5'
             self.logger.info('Recovery Step 5: Finding file input element')
             file_input = WebDriverWait(self.driver, 10).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, 'input[type="file"]'))
@@ -673,6 +850,7 @@ class WebAutomator:
             self._wait_for_file_upload_completion()
             
             # Step 6: Click next to proceed to description
+            self.current_step = 'recovery 6'
             self.logger.info('Recovery Step 6: Finding next button after file upload')
             next_btn = self._find_element_safely(
                 '.next-step-button, button.next, button[class*="next"]',
@@ -681,6 +859,7 @@ class WebAutomator:
             self._click_element_safely(next_btn, "next button after upload")
             
             # Step 7: Enter description
+            self.current_step = 'recovery 7'
             self.logger.info('Recovery Step 7: Finding description textarea')
             desc_area = self._find_element_safely(
                 'textarea.description, textarea[class*="description"], textarea',
@@ -689,6 +868,7 @@ class WebAutomator:
             desc_area.send_keys(description)
             
             # Step 8: Final upload
+            self.current_step = 'recovery 8'
             self.logger.info('Recovery Step 8: Finding final upload button')
             upload_btn = self._find_element_safely(
                 '.next-step-button, button.submit, button[class*="submit"], button[class*="upload"]',
@@ -706,9 +886,13 @@ class WebAutomator:
             
         except Exception as e:
             self.logger.error(f'Recovery upload failed for {file_path.name}: {str(e)}')
+            self._capture_failure(f'recovery {file_path.name}', e)
+            self._record_failure(e)
             return False
 
     def close(self):
         self.logger.info('Closing browser and cleaning up resources')
+        if self.failure_capture:
+            self.failure_capture.close()
         self.driver.quit()
         self.logger.info('Browser closed successfully')
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+타임아웃/재시도 설정 스윕
+장애 주입된 모의 사이트를 대상으로 implicit_wait, element_timeout, element_retries 조합별
+처리량과 복구 비용을 비교합니다.
+
+사용법:
+    python sweep_timeouts.py --faults faults.json --uploads 10 \\
+        --implicit-wait 4,8 --element-timeout 5,10 --element-retries 1,3
+"""
+
+import itertools
+import json
+from typing import Dict, List
+
+from benchmark_uploads import run_benchmark
+from mock_hanlim_site import load_fault_spec
+
+
+def parse_int_list(value: str) -> List[int]:
+    """'4,8,10' 형태의 문자열을 정수 목록으로 변환"""
+    return [int(v.strip()) for v in value.split(',') if v.strip()]
+
+
+def run_sweep(grid: Dict[str, List[int]], uploads: int, accounts: int, faults: Dict,
+              config_path: str = 'config/config.json') -> List[Dict]:
+    """설정 조합마다 벤치마크를 실행하고 결과 목록 반환"""
+    keys = list(grid.keys())
+    results = []
+
+    for values in itertools.product(*(grid[k] for k in keys)):
+        settings = dict(zip(keys, values))
+        print(f"\n🔬 Running with {settings}")
+        report = run_benchmark(uploads, accounts, config_path,
+                               overrides={'web_automation': settings}, faults=faults)
+        results.append({
+            'settings': settings,
+            'uploads_per_minute': report['uploads_per_minute'],
+            'success_rate': round(report['uploads_succeeded'] / max(1, report['uploads_attempted']), 3),
+            'recovery_attempts': report['recovery_attempts'],
+            'relogins': report['relogins'],
+            'seconds_lost_to_failures': report['seconds_lost_to_failures'],
+            'upload_p95': report['upload'].get('p95'),
+        })
+
+    return sorted(results, key=lambda r: r['uploads_per_minute'], reverse=True)
+
+
+def print_table(results: List[Dict]):
+    """스윕 결과 표 출력"""
+    print("\n📊 TIMEOUT / RETRY SWEEP (best throughput first)")
+    print("=" * 100)
+    print(f"{'settings':<55} {'up/min':>8} {'success':>8} {'recov':>6} {'relog':>6} {'lost(s)':>8} {'p95(s)':>7}")
+    print("-" * 100)
+    for r in results:
+        settings = ', '.join(f"{k}={v}" for k, v in r['settings'].items())
+        print(f"{settings:<55} {r['uploads_per_minute']:>8} {r['success_rate']:>8} "
+              f"{r['recovery_attempts']:>6} {r['relogins']:>6} {r['seconds_lost_to_failures']:>8} "
+              f"{r['upload_p95'] if r['upload_p95'] is not None else '-':>7}")
+
+
+def main():
+    """메인 함수"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Sweep WebAutomator timeouts/retries against a faulty mock site')
+    parser.add_argument('--faults', help='Fault injection spec (JSON file)')
+    parser.add_argument('--uploads', type=int, default=10, help='Uploads per configuration (default: 10)')
+    parser.add_argument('--accounts', type=int, default=1, help='Accounts per configuration (default: 1)')
+    parser.add_argument('--config', default='config/config.json', help='Base config file')
+    parser.add_argument('--implicit-wait', default='8', help='Comma separated values (default: 8)')
+    parser.add_argument('--element-timeout', default='5,10', help='Comma separated values (default: 5,10)')
+    parser.add_argument('--element-retries', default='1,3', help='Comma separated values (default: 1,3)')
+    parser.add_argument('--output', help='Write the results as JSON to this path')
+    args = parser.parse_args()
+
+    grid = {
+        'implicit_wait': parse_int_list(args.implicit_wait),
+        'element_timeout': parse_int_list(args.element_timeout),
+        'element_retries': parse_int_list(args.element_retries),
+    }
+    faults = load_fault_spec(args.faults) if args.faults else {}
+
+    results = run_sweep(grid, args.uploads, args.accounts, faults, args.config)
+    print_table(results)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Results saved: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
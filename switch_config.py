@@ -65,21 +65,58 @@ def switch_config_mode():
                     "max_concurrent_uploads": 1,
                     "upload_description_template": "Uploaded video",
                     "upload_delay_seconds": 2,
-                    "supported_formats": [".mp4", ".avi", ".mov"]
+                    "supported_formats": [".mp4", ".avi", ".mov"],
+                    "state_backend": "json",
+                    "state_db_path": "choom_state.db",
+                    "content_dedup": True,
+                    "max_upload_attempts": 3,
+                    "retry_failed_at_end": True,
+                    "confirm_uploads": False,
+                    "confirm_poll_seconds": 3,
+                    "confirm_timeout_seconds": 60,
+                    "reconcile_max_remove_ratio": 0.2,
+                    "extraction_storage": "sharded"
                 },
                 "web_automation": {
                     "browser": "chrome",
+                    "base_url": "https://app.hanlim.world",
                     "headless": False,
                     "implicit_wait": 8,
-                    "upload_timeout": 300
+                    "upload_timeout": 300,
+                    "posts_source_verified": False
                 },
                 "title_extraction": {
                     "similarity_threshold": 0.8,
-                    "remove_keywords": ["Official", "MV", "가사", "lyrics", "커버", "댄스", "cover", "MIRRORED", "dance"],
+                    "remove_keywords": ["Official", "MV", "가사", "lyrics", "커버", "댄스", "cover", "MIRRORED", "dance", "feat", "featuring", "music video", "choreography", "choreo"],
                     "remove_patterns": [
                         "\\[.*?\\]",
                         "\\(.*?\\)"
-                    ]
+                    ],
+                    "llm_cache": True,
+                    "llm_cache_path": "logs/llm_cache.db",
+                    "llm_cache_ttl_days": 90,
+                    "llm_cache_max_entries": 200000,
+                    "async_concurrency": 8,
+                    "max_retries": 5,
+                    "retry_base_delay": 1.0,
+                    "retry_max_delay": 60.0,
+                    "chunk_input_tokens": 3000,
+                    "chunk_output_tokens": 3000,
+                    "max_files_per_request": 40,
+                    "rule_extraction": True,
+                    "rule_patterns_path": "config/title_patterns.json",
+                    "rule_min_confidence": "high",
+                    "gazetteer": True,
+                    "artist_mapping_path": "config/artist_mapping.json",
+                    "gazetteer_min_confidence": "high",
+                    "cluster_threshold": 92,
+                    "unicode_nfkc": False,
+                    "split_hangul": False,
+                    "scan_cache": True,
+                    "scan_cache_path": "logs/video_scan_cache.json",
+                    "scan_workers": 8,
+                    "batch_dir": "logs/batch",
+                    "batch_poll_seconds": 60
                 }
             }
             
@@ -104,21 +141,58 @@ def switch_config_mode():
                     "max_concurrent_uploads": 1,
                     "upload_description_template": "Uploaded video",
                     "upload_delay_seconds": 3,
-                    "supported_formats": [".mp4", ".avi", ".mov"]
+                    "supported_formats": [".mp4", ".avi", ".mov"],
+                    "state_backend": "json",
+                    "state_db_path": "choom_state.db",
+                    "content_dedup": True,
+                    "max_upload_attempts": 3,
+                    "retry_failed_at_end": True,
+                    "confirm_uploads": False,
+                    "confirm_poll_seconds": 3,
+                    "confirm_timeout_seconds": 60,
+                    "reconcile_max_remove_ratio": 0.2,
+                    "extraction_storage": "sharded"
                 },
                 "web_automation": {
                     "browser": "chrome",
+                    "base_url": "https://app.hanlim.world",
                     "headless": False,
                     "implicit_wait": 10,
-                    "upload_timeout": 360
+                    "upload_timeout": 360,
+                    "posts_source_verified": False
                 },
                 "title_extraction": {
                     "similarity_threshold": 0.8,
-                    "remove_keywords": ["Official", "MV", "가사", "lyrics", "커버", "댄스", "cover", "MIRRORED", "dance"],
+                    "remove_keywords": ["Official", "MV", "가사", "lyrics", "커버", "댄스", "cover", "MIRRORED", "dance", "feat", "featuring", "music video", "choreography", "choreo"],
                     "remove_patterns": [
                         "\\[.*?\\]",
                         "\\(.*?\\)"
-                    ]
+                    ],
+                    "llm_cache": True,
+                    "llm_cache_path": "logs/llm_cache.db",
+                    "llm_cache_ttl_days": 90,
+                    "llm_cache_max_entries": 200000,
+                    "async_concurrency": 8,
+                    "max_retries": 5,
+                    "retry_base_delay": 1.0,
+                    "retry_max_delay": 60.0,
+                    "chunk_input_tokens": 3000,
+                    "chunk_output_tokens": 3000,
+                    "max_files_per_request": 40,
+                    "rule_extraction": True,
+                    "rule_patterns_path": "config/title_patterns.json",
+                    "rule_min_confidence": "high",
+                    "gazetteer": True,
+                    "artist_mapping_path": "config/artist_mapping.json",
+                    "gazetteer_min_confidence": "high",
+                    "cluster_threshold": 92,
+                    "unicode_nfkc": False,
+                    "split_hangul": False,
+                    "scan_cache": True,
+                    "scan_cache_path": "logs/video_scan_cache.json",
+                    "scan_workers": 8,
+                    "batch_dir": "logs/batch",
+                    "batch_poll_seconds": 60
                 }
             }
             
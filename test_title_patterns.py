@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+config/title_patterns.json 규칙 추출 테스트 스크립트
+확실한 파일명만 규칙으로 처리되고, " - "가 여러 번 들어간 애매한 파일명은 LLM으로 넘어가는지 확인합니다.
+
+사용법:
+    python test_title_patterns.py
+    python -m pytest -q test_title_patterns.py
+"""
+
+import sys
+from pathlib import Path
+
+# src 모듈을 import하기 위해 경로 추가
+sys.path.append(str(Path(__file__).parent / "src"))
+
+from modules.rule_extractor import load_rule_extractor
+
+PATTERNS_FILE = Path(__file__).parent / "config" / "title_patterns.json"
+
+# (파일명, 기대 결과 (artist, title) - None이면 규칙으로 처리하지 않고 LLM으로 넘김)
+CASES = [
+    ("[MIRRORED] NewJeans - Super Shy dance cover.mp4", ("NewJeans", "Super Shy")),
+    ("[MIRRORED] LE SSERAFIM(르세라핌) - Song 195 dance cover 00004.mp4", ("LE SSERAFIM", "Song 195")),
+    ("[MIRRORED] RIIZE(라이즈) - Song 421 dance cover (1) 00000.mp4", ("RIIZE", "Song 421")),
+    ("[MIRRORED] NewJeans - Super Shy dance cover (1).mp4", ("NewJeans", "Super Shy")),
+    ("[MIRRORED] NewJeans - Super Shy - Remix dance cover.mp4", None),
+    ("[MIRRORED] NewJeans - Super Shy - Remix dance cover (1) 00003.mp4", None),
+    ("NewJeans - Super Shy dance cover.mp4", None),
+]
+
+
+def test_title_patterns():
+    """파일명별 규칙 추출 결과 확인 (기본 기준: high만 사용)"""
+    extractor = load_rule_extractor(PATTERNS_FILE)
+    assert extractor is not None, f"failed to load {PATTERNS_FILE}"
+    for filename, expected in CASES:
+        result = extractor.match(filename)
+        actual = (result['artist'], result['title']) if result else None
+        assert actual == expected, f"{filename}: expected {expected}, got {actual}"
+
+
+if __name__ == '__main__':
+    test_title_patterns()
+    print(f"✅ {len(CASES)} title pattern cases passed")